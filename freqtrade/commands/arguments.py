@@ -20,19 +20,24 @@ ARGS_COMMON_OPTIMIZE = ["timeframe", "timerange", "dataformat_ohlcv",
                         "max_open_trades", "stake_amount", "fee", "pairs"]
 
 ARGS_BACKTEST = ARGS_COMMON_OPTIMIZE + ["position_stacking", "use_max_market_positions",
-                                        "enable_protections", "dry_run_wallet",
-                                        "strategy_list", "export", "exportfilename"]
+                                        "enable_protections", "backtest_engine", "dry_run_wallet",
+                                        "strategy_list", "backtest_workers", "backtest_shards",
+                                        "export", "exportfilename", "profile"]
 
 ARGS_HYPEROPT = ARGS_COMMON_OPTIMIZE + ["hyperopt", "hyperopt_path",
                                         "position_stacking", "use_max_market_positions",
-                                        "enable_protections", "dry_run_wallet",
+                                        "enable_protections", "backtest_engine", "dry_run_wallet",
                                         "epochs", "spaces", "print_all",
                                         "print_colorized", "print_json", "hyperopt_jobs",
                                         "hyperopt_random_state", "hyperopt_min_trades",
-                                        "hyperopt_loss"]
+                                        "hyperopt_loss", "profile"]
 
 ARGS_EDGE = ARGS_COMMON_OPTIMIZE + ["stoploss_range"]
 
+ARGS_BENCHMARK = ["benchmark_pairs", "benchmark_candles", "timeframe", "benchmark_epochs",
+                  "backtest_engine", "dataformat_ohlcv", "hyperopt_random_state",
+                  "benchmark_exportfilename", "benchmark_baseline"]
+
 ARGS_LIST_STRATEGIES = ["strategy_path", "print_one_column", "print_colorized"]
 
 ARGS_LIST_HYPEROPTS = ["hyperopt_path", "print_one_column", "print_colorized"]
@@ -62,7 +67,7 @@ ARGS_LIST_DATA = ["exchange", "dataformat_ohlcv", "pairs"]
 
 ARGS_DOWNLOAD_DATA = ["pairs", "pairs_file", "days", "new_pairs_days", "timerange",
                       "download_trades", "exchange", "timeframes", "erase", "dataformat_ohlcv",
-                      "dataformat_trades"]
+                      "dataformat_trades", "download_concurrency"]
 
 ARGS_PLOT_DATAFRAME = ["pairs", "indicators1", "indicators2", "plot_limit",
                        "db_url", "trade_source", "export", "exportfilename",
@@ -92,7 +97,8 @@ NO_CONF_REQURIED = ["convert-data", "convert-trade-data", "download-data", "list
                     "list-hyperopts", "hyperopt-list", "hyperopt-show",
                     "plot-dataframe", "plot-profit", "show-trades"]
 
-NO_CONF_ALLOWED = ["create-userdir", "list-exchanges", "new-hyperopt", "new-strategy"]
+NO_CONF_ALLOWED = ["benchmark", "create-userdir", "list-exchanges", "new-hyperopt",
+                   "new-strategy"]
 
 
 class Arguments:
@@ -168,14 +174,15 @@ class Arguments:
         self.parser = argparse.ArgumentParser(description='Free, open source crypto trading bot')
         self._build_args(optionlist=['version'], parser=self.parser)
 
-        from freqtrade.commands import (start_backtesting, start_convert_data, start_create_userdir,
-                                        start_download_data, start_edge, start_hyperopt,
-                                        start_hyperopt_list, start_hyperopt_show, start_install_ui,
-                                        start_list_data, start_list_exchanges, start_list_hyperopts,
-                                        start_list_markets, start_list_strategies,
-                                        start_list_timeframes, start_new_config, start_new_hyperopt,
-                                        start_new_strategy, start_plot_dataframe, start_plot_profit,
-                                        start_show_trades, start_test_pairlist, start_trading)
+        from freqtrade.commands import (start_backtesting, start_benchmark, start_convert_data,
+                                        start_create_userdir, start_download_data, start_edge,
+                                        start_hyperopt, start_hyperopt_list, start_hyperopt_show,
+                                        start_install_ui, start_list_data, start_list_exchanges,
+                                        start_list_hyperopts, start_list_markets,
+                                        start_list_strategies, start_list_timeframes,
+                                        start_new_config, start_new_hyperopt, start_new_strategy,
+                                        start_plot_dataframe, start_plot_profit, start_show_trades,
+                                        start_test_pairlist, start_trading)
 
         subparsers = self.parser.add_subparsers(dest='command',
                                                 # Use custom message when no subhandler is added
@@ -269,6 +276,14 @@ class Arguments:
         hyperopt_cmd.set_defaults(func=start_hyperopt)
         self._build_args(optionlist=ARGS_HYPEROPT, parser=hyperopt_cmd)
 
+        # Add benchmark subcommand
+        benchmark_cmd = subparsers.add_parser(
+            'benchmark',
+            help='Benchmark backtesting and hyperopt on synthetic data.',
+        )
+        benchmark_cmd.set_defaults(func=start_benchmark)
+        self._build_args(optionlist=ARGS_BENCHMARK, parser=benchmark_cmd)
+
         # Add hyperopt-list subcommand
         hyperopt_list_cmd = subparsers.add_parser(
             'hyperopt-list',
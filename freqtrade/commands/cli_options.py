@@ -156,6 +156,35 @@ AVAILABLE_CLI_OPTIONS = {
         action='store_true',
         default=False,
     ),
+    "backtest_engine": Arg(
+        '--backtest-engine',
+        help='Backtesting engine to use. `vectorized` skips candles without possible '
+        'buy or sell, falling back to `loop` where this is not possible (default: `loop`).',
+        choices=constants.BACKTEST_ENGINES,
+    ),
+    "profile": Arg(
+        '--profile',
+        help='Record timings per phase and pair, and print them after the run. '
+        '`cprofile` additionally stores cProfile statistics to the results directory '
+        '(default: `%(const)s`).',
+        nargs='?',
+        const='timers',
+        choices=constants.PROFILE_MODES,
+    ),
+    "backtest_workers": Arg(
+        '--backtest-workers',
+        help='Number of processes used to backtest the strategies of `--strategy-list` '
+        'in parallel (default: 1).',
+        type=check_int_positive,
+        metavar='INT',
+    ),
+    "backtest_shards": Arg(
+        '--backtest-shards',
+        help='Split the timerange into INT windows, which are backtested in parallel '
+        'worker processes (default: 1).',
+        type=check_int_positive,
+        metavar='INT',
+    ),
     "strategy_list": Arg(
         '--strategy-list',
         help='Provide a space-separated list of strategies to backtest. '
@@ -280,6 +309,37 @@ AVAILABLE_CLI_OPTIONS = {
         'Example: `--hyperopt-filename=hyperopt_results_2020-09-27_16-20-48.pickle`',
         metavar='FILENAME',
     ),
+    # Benchmark
+    "benchmark_pairs": Arg(
+        '--pairs',
+        help='Number of synthetic pairs to generate (default: 10).',
+        type=check_int_positive,
+        metavar='INT',
+    ),
+    "benchmark_candles": Arg(
+        '--candles',
+        help='Number of candles to generate per pair (default: 10000).',
+        type=check_int_positive,
+        metavar='INT',
+    ),
+    "benchmark_epochs": Arg(
+        '-e', '--epochs',
+        help='Number of hyperopt epochs to run, 0 to skip hyperopt (default: %(default)d).',
+        type=int,
+        metavar='INT',
+        default=10,
+    ),
+    "benchmark_exportfilename": Arg(
+        '--export-filename',
+        help='Save the benchmark report (JSON) to this file.',
+        metavar='PATH',
+    ),
+    "benchmark_baseline": Arg(
+        '--baseline',
+        help='Compare the results with this benchmark report (JSON). '
+        'Fails if the benchmark is more than 20%% slower.',
+        metavar='PATH',
+    ),
     # List exchanges
     "print_one_column": Arg(
         '-1', '--one-column',
@@ -351,6 +411,13 @@ AVAILABLE_CLI_OPTIONS = {
         type=check_int_positive,
         metavar='INT',
     ),
+    "download_concurrency": Arg(
+        '--dl-concurrency',
+        help='Number of pairs (and timeframes) downloaded at the same time. '
+             f'Default: `{constants.DEFAULT_DOWNLOAD_CONCURRENCY}`.',
+        type=check_int_positive,
+        metavar='INT',
+    ),
     "download_trades": Arg(
         '--dl-trades',
         help='Download trades instead of OHLCV data. The bot will resample trades to the '
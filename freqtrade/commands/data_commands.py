@@ -63,7 +63,8 @@ def start_download_data(args: Dict[str, Any]) -> None:
             pairs_not_available = refresh_backtest_trades_data(
                 exchange, pairs=expanded_pairs, datadir=config['datadir'],
                 timerange=timerange, new_pairs_days=config['new_pairs_days'],
-                erase=bool(config.get('erase')), data_format=config['dataformat_trades'])
+                erase=bool(config.get('erase')), data_format=config['dataformat_trades'],
+                concurrency=config['download_concurrency'])
 
             # Convert downloaded trade data to different timeframes
             convert_trades_to_ohlcv(
@@ -77,7 +78,8 @@ def start_download_data(args: Dict[str, Any]) -> None:
                 exchange, pairs=expanded_pairs, timeframes=config['timeframes'],
                 datadir=config['datadir'], timerange=timerange,
                 new_pairs_days=config['new_pairs_days'],
-                erase=bool(config.get('erase')), data_format=config['dataformat_ohlcv'])
+                erase=bool(config.get('erase')), data_format=config['dataformat_ohlcv'],
+                concurrency=config['download_concurrency'])
 
     except KeyboardInterrupt:
         sys.exit("SIGINT received, aborting ...")
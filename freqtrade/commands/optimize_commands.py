@@ -111,3 +111,19 @@ def start_edge(args: Dict[str, Any]) -> None:
     # Initialize Edge object
     edge_cli = EdgeCli(config)
     edge_cli.start()
+
+
+def start_benchmark(args: Dict[str, Any]) -> None:
+    """
+    Start benchmark script
+    :param args: Cli args from Arguments()
+    :return: None
+    """
+    # Import here to avoid loading backtesting module when it's not used
+    from freqtrade.optimize.benchmark import Benchmark, get_benchmark_config
+
+    config = get_benchmark_config(args)
+    logger.info('Starting freqtrade in Benchmark mode')
+
+    benchmark = Benchmark(config)
+    benchmark.start()
@@ -215,6 +215,20 @@ class Configuration:
             config, argname='enable_protections',
             logstring='Parameter --enable-protections detected, enabling Protections. ...')
 
+        self._args_to_config(config, argname='backtest_engine',
+                             logstring='Using backtest engine: {} ...')
+
+        self._args_to_config(config, argname='backtest_workers',
+                             logstring='Parameter --backtest-workers detected, using {} '
+                                       'worker processes ...')
+
+        self._args_to_config(config, argname='backtest_shards',
+                             logstring='Parameter --backtest-shards detected, splitting the '
+                                       'timerange into {} windows ...')
+
+        self._args_to_config(config, argname='profile',
+                             logstring='Parameter --profile detected, recording timings ({}) ...')
+
         if 'use_max_market_positions' in self.args and not self.args["use_max_market_positions"]:
             config.update({'use_max_market_positions': False})
             logger.info('Parameter --disable-max-market-positions detected ...')
@@ -393,6 +407,9 @@ class Configuration:
         self._args_to_config(config, argname='download_trades',
                              logstring='Detected --dl-trades: {}')
 
+        self._args_to_config(config, argname='download_concurrency',
+                             logstring='Detected --dl-concurrency: {}')
+
         self._args_to_config(config, argname='dataformat_ohlcv',
                              logstring='Using "{}" to store OHLCV data.')
 
@@ -11,6 +11,7 @@ DEFAULT_EXCHANGE = 'bittrex'
 PROCESS_THROTTLE_SECS = 5  # sec
 HYPEROPT_EPOCH = 100  # epochs
 RETRY_TIMEOUT = 30  # sec
+DEFAULT_DOWNLOAD_CONCURRENCY = 4  # Number of pairs downloaded at the same time
 DEFAULT_DB_PROD_URL = 'sqlite:///tradesv3.sqlite'
 DEFAULT_DB_DRYRUN_URL = 'sqlite:///tradesv3.dryrun.sqlite'
 UNLIMITED_STAKE_AMOUNT = 'unlimited'
@@ -28,7 +29,9 @@ AVAILABLE_PAIRLISTS = ['StaticPairList', 'VolumePairList',
                        'PriceFilter', 'RangeStabilityFilter', 'ShuffleFilter',
                        'SpreadFilter', 'VolatilityFilter']
 AVAILABLE_PROTECTIONS = ['CooldownPeriod', 'LowProfitPairs', 'MaxDrawdown', 'StoplossGuard']
-AVAILABLE_DATAHANDLERS = ['json', 'jsongz', 'hdf5']
+AVAILABLE_DATAHANDLERS = ['json', 'jsongz', 'hdf5', 'npy']
+BACKTEST_ENGINES = ['loop', 'vectorized']
+PROFILE_MODES = ['timers', 'cprofile']
 DRY_RUN_WALLET = 1000
 DATETIME_PRINT_FORMAT = '%Y-%m-%d %H:%M:%S'
 MATH_CLOSE_PREC = 1e-14  # Precision used for float comparisons
@@ -97,6 +100,8 @@ CONF_SCHEMA = {
     'properties': {
         'max_open_trades': {'type': ['integer', 'number'], 'minimum': -1},
         'new_pairs_days': {'type': 'integer', 'default': 30},
+        'download_concurrency': {'type': 'integer', 'minimum': 1,
+                                 'default': DEFAULT_DOWNLOAD_CONCURRENCY},
         'timeframe': {'type': 'string'},
         'stake_currency': {'type': 'string'},
         'stake_amount': {
@@ -308,6 +313,7 @@ CONF_SCHEMA = {
             'default': {},
             'properties': {
                 'process_throttle_secs': {'type': 'integer'},
+                'analysis_workers': {'type': 'integer', 'minimum': 1},
                 'interval': {'type': 'integer'},
                 'sd_notify': {'type': 'boolean'},
             }
@@ -321,7 +327,12 @@ CONF_SCHEMA = {
             'type': 'string',
                     'enum': AVAILABLE_DATAHANDLERS,
                     'default': 'jsongz'
-        }
+        },
+        'backtest_engine': {'type': 'string', 'enum': BACKTEST_ENGINES, 'default': 'loop'},
+        'dataload_workers': {'type': 'integer', 'minimum': 1},
+        'backtest_workers': {'type': 'integer', 'minimum': 1},
+        'backtest_shards': {'type': 'integer', 'minimum': 1},
+        'profile': {'type': 'string', 'enum': PROFILE_MODES},
     },
     'definitions': {
         'exchange': {
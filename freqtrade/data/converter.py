@@ -5,8 +5,9 @@ import itertools
 import logging
 from datetime import datetime, timezone
 from operator import itemgetter
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame, to_datetime
 
@@ -61,14 +62,18 @@ def clean_ohlcv_dataframe(data: DataFrame, timeframe: str, pair: str, *,
     :param drop_incomplete: Drop the last candle of the dataframe, assuming it's incomplete
     :return: DataFrame
     """
-    # group by index and aggregate results to eliminate duplicate ticks
-    data = data.groupby(by='date', as_index=False, sort=True).agg({
-        'open': 'first',
-        'high': 'max',
-        'low': 'min',
-        'close': 'last',
-        'volume': 'max',
-    })
+    if data['date'].is_monotonic_increasing and data['date'].is_unique:
+        # Nothing to aggregate - avoid the (slow) groupby
+        data = data.loc[:, DEFAULT_DATAFRAME_COLUMNS].reset_index(drop=True)
+    else:
+        # group by index and aggregate results to eliminate duplicate ticks
+        data = data.groupby(by='date', as_index=False, sort=True).agg({
+            'open': 'first',
+            'high': 'max',
+            'low': 'min',
+            'close': 'last',
+            'volume': 'max',
+        })
     # eliminate partial candle
     if drop_incomplete:
         data.drop(data.tail(1).index, inplace=True)
@@ -80,13 +85,29 @@ def clean_ohlcv_dataframe(data: DataFrame, timeframe: str, pair: str, *,
         return data
 
 
+def _ohlcv_is_complete(dataframe: DataFrame, timeframe_seconds: int) -> bool:
+    """
+    Check if resampling would not change the dataframe:
+    candles are aligned to the timeframe, without gaps and without missing values.
+    """
+    if dataframe.empty or 86400 % timeframe_seconds != 0:
+        return False
+    dates = dataframe['date'].values.astype('int64') // 10 ** 9
+    return bool(dates[0] % timeframe_seconds == 0
+                and (dates[1:] - dates[:-1] == timeframe_seconds).all()
+                and not dataframe[['open', 'high', 'low', 'close', 'volume']].isna().values.any())
+
+
 def ohlcv_fill_up_missing_data(dataframe: DataFrame, timeframe: str, pair: str) -> DataFrame:
     """
     Fills up missing data with 0 volume rows,
     using the previous close as price for "open", "high" "low" and "close", volume is set to 0
 
     """
-    from freqtrade.exchange import timeframe_to_minutes
+    from freqtrade.exchange import timeframe_to_minutes, timeframe_to_seconds
+
+    if _ohlcv_is_complete(dataframe, timeframe_to_seconds(timeframe)):
+        return dataframe.reset_index(drop=True)
 
     ohlcv_dict = {
         'open': 'first',
@@ -190,29 +211,90 @@ def trades_dict_to_list(trades: List[Dict]) -> TradeList:
     return [[t[col] for col in DEFAULT_TRADES_COLUMNS] for t in trades]
 
 
-def trades_to_ohlcv(trades: TradeList, timeframe: str) -> DataFrame:
+def trades_to_ohlcv(trades: Union[TradeList, np.ndarray], timeframe: str) -> DataFrame:
     """
     Converts trades list to OHLCV list
-    :param trades: List of trades, as returned by ccxt.fetch_trades.
+    :param trades: List of trades, as returned by ccxt.fetch_trades - or structured array
+        with timestamp, price and amount fields (e.g. from NpyDataHandler.trades_load_array()).
     :param timeframe: Timeframe to resample data to
     :return: OHLCV Dataframe.
     :raises: ValueError if no trades are provided
     """
-    from freqtrade.exchange import timeframe_to_minutes
-    timeframe_minutes = timeframe_to_minutes(timeframe)
-    if not trades:
-        raise ValueError('Trade-list empty.')
-    df = pd.DataFrame(trades, columns=DEFAULT_TRADES_COLUMNS)
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms',
-                                     utc=True,)
-    df = df.set_index('timestamp')
-
-    df_new = df['price'].resample(f'{timeframe_minutes}min').ohlc()
-    df_new['volume'] = df['amount'].resample(f'{timeframe_minutes}min').sum()
-    df_new['date'] = df_new.index
-    # Drop 0 volume rows
-    df_new = df_new.dropna()
-    return df_new.loc[:, DEFAULT_DATAFRAME_COLUMNS]
+    aggregator = TradesOhlcvAggregator([timeframe])
+    aggregator.add_trades(trades)
+    return aggregator.get_ohlcv(timeframe)
+
+
+class TradesOhlcvAggregator:
+    """
+    Converts trades to OHLCV data of multiple timeframes in one pass.
+    Trades are added in time-ordered chunks. The last candle of a chunk may continue in the
+    next chunk, so it's kept as partial candle and combined with the first candle of the next
+    chunk - so only one chunk of trades is kept in memory.
+    """
+
+    def __init__(self, timeframes: List[str]) -> None:
+        from freqtrade.exchange import timeframe_to_minutes
+        self._rules = {timeframe: f'{timeframe_to_minutes(timeframe)}min'
+                       for timeframe in timeframes}
+        self._candles: Dict[str, List[DataFrame]] = {timeframe: [] for timeframe in timeframes}
+        self._partial: Dict[str, Optional[DataFrame]] = dict.fromkeys(timeframes)
+
+    def add_trades(self, trades: Union[TradeList, np.ndarray]) -> None:
+        """
+        Add the next chunk of trades - which must not be older than previously added trades.
+        :param trades: List of trades, as returned by ccxt.fetch_trades - or structured array
+            with timestamp, price and amount fields.
+        """
+        if len(trades) == 0:
+            return
+        if isinstance(trades, np.ndarray):
+            df = pd.DataFrame({'price': trades['price'], 'amount': trades['amount']},
+                              index=pd.to_datetime(trades['timestamp'].astype('int64'),
+                                                   unit='ms', utc=True))
+            df.index.name = 'timestamp'
+        else:
+            df = pd.DataFrame(trades, columns=DEFAULT_TRADES_COLUMNS)
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+            df = df.set_index('timestamp')
+
+        for timeframe, rule in self._rules.items():
+            # Bins are anchored at epoch (like exchange candles) - not at the first day of
+            # the chunk, which would shift candles longer than a day between chunks.
+            candles = df['price'].resample(rule, origin='epoch').ohlc()
+            candles['volume'] = df['amount'].resample(rule, origin='epoch').sum()
+            # Drop 0 volume rows
+            candles = candles.dropna()
+            if candles.empty:
+                continue
+            partial = self._partial[timeframe]
+            if partial is not None:
+                if partial.index[0] == candles.index[0]:
+                    first = candles.index[0]
+                    candles.loc[first, 'open'] = partial['open'].iat[0]
+                    candles.loc[first, 'high'] = max(partial['high'].iat[0],
+                                                     candles.loc[first, 'high'])
+                    candles.loc[first, 'low'] = min(partial['low'].iat[0],
+                                                    candles.loc[first, 'low'])
+                    candles.loc[first, 'volume'] += partial['volume'].iat[0]
+                else:
+                    self._candles[timeframe].append(partial)
+            self._candles[timeframe].append(candles.iloc[:-1])
+            self._partial[timeframe] = candles.iloc[-1:]
+
+    def get_ohlcv(self, timeframe: str) -> DataFrame:
+        """
+        OHLCV data of all trades added so far
+        :param timeframe: Timeframe to return - must be one of the timeframes of the aggregator
+        :return: OHLCV Dataframe.
+        :raises: ValueError if no trades were added
+        """
+        partial = self._partial[timeframe]
+        if partial is None:
+            raise ValueError('Trade-list empty.')
+        df_new = pd.concat(self._candles[timeframe] + [partial])
+        df_new['date'] = df_new.index
+        return df_new.loc[:, DEFAULT_DATAFRAME_COLUMNS]
 
 
 def convert_trades_format(config: Dict[str, Any], convert_from: str, convert_to: str, erase: bool):
@@ -0,0 +1,118 @@
+"""
+Concurrent download of history data
+"""
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from freqtrade.constants import DEFAULT_DOWNLOAD_CONCURRENCY
+from freqtrade.exchange import Exchange
+from freqtrade.exchange.rate_limiter import TokenBucket
+from freqtrade.misc import file_dump_json, file_load_json
+
+
+logger = logging.getLogger(__name__)
+
+# Completed downloads of an interrupted download-data run (stored in the data directory)
+DOWNLOAD_STATE_FN = '.download_state.json'
+
+DownloadJob = Callable[[], Awaitable[bool]]
+
+
+class DownloadScheduler:
+    """
+    Runs download jobs (e.g. one per pair and timeframe) concurrently on one event loop.
+    All requests of all jobs share one token bucket rate limiter, derived from the
+    exchange rate limit.
+    Completed jobs are recorded in a state file - when an interrupted download is started
+    again with the same parameters, completed jobs are skipped.
+    """
+
+    def __init__(self, exchange: Exchange, state_file: Optional[Path] = None,
+                 concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY,
+                 parameters: Any = None) -> None:
+        """
+        :param state_file: File to record completed jobs in. None disables resuming.
+        :param concurrency: Maximum number of jobs running at the same time
+        :param parameters: Download parameters (e.g. the timerange) - completed jobs
+            are only skipped if the parameters of the interrupted run were identical.
+        """
+        self._exchange = exchange
+        self._state_file = state_file
+        self._concurrency = max(concurrency, 1)
+        self._parameters = parameters
+        self._jobs: Dict[str, DownloadJob] = {}
+        self._completed: Set[str] = set()
+
+    def add_job(self, name: str, job: DownloadJob) -> None:
+        """
+        :param name: Unique name of the job, used for progress and the state file
+        :param job: Coroutine function doing the download, returning the success state
+        """
+        self._jobs[name] = job
+
+    def _state(self) -> Dict[str, Any]:
+        return {'jobs': sorted(self._jobs), 'parameters': self._parameters,
+                'completed': sorted(self._completed)}
+
+    def _load_state(self) -> None:
+        if not self._state_file or not self._state_file.is_file():
+            return
+        state = file_load_json(self._state_file) or {}
+        current = self._state()
+        if (state.get('jobs') == current['jobs']
+                and state.get('parameters') == current['parameters']):
+            self._completed = set(state.get('completed', [])) & set(self._jobs)
+            logger.info(f"Resuming interrupted download - skipping {len(self._completed)} "
+                        "completed downloads.")
+
+    def _store_state(self) -> None:
+        if self._state_file:
+            file_dump_json(self._state_file, self._state(), log=False)
+
+    async def _run_job(self, name: str, semaphore: asyncio.Semaphore,
+                       progress: Dict[str, Any]) -> bool:
+        async with semaphore:
+            success = await self._jobs[name]()
+        if success:
+            self._completed.add(name)
+            self._store_state()
+
+        progress['done'] += 1
+        done, total = progress['done'], progress['total']
+        elapsed = time.monotonic() - progress['start']
+        eta = timedelta(seconds=round(elapsed / done * (total - done)))
+        logger.info(f'Download progress: {done}/{total} ({round(done / total * 100, 1)} %), '
+                    f'ETA: {eta}')
+        return success
+
+    async def _run(self, pending: List[str]) -> List[bool]:
+        semaphore = asyncio.Semaphore(self._concurrency)
+        progress = {'done': 0, 'total': len(pending), 'start': time.monotonic()}
+        return await asyncio.gather(*(self._run_job(name, semaphore, progress)
+                                      for name in pending))
+
+    def run(self) -> List[str]:
+        """
+        Run all jobs not completed by an interrupted run.
+        :return: Names of failed jobs
+        """
+        self._load_state()
+        pending = [name for name in self._jobs if name not in self._completed]
+        logger.info(f'Total number of downloads: {len(pending)}')
+
+        rate_limiter = TokenBucket.from_rate_limit(self._exchange.rate_limit)
+        self._exchange.set_rate_limiter(rate_limiter)
+        try:
+            results = asyncio.get_event_loop().run_until_complete(self._run(pending))
+        finally:
+            self._exchange.set_rate_limiter(None)
+
+        failed = [name for name, success in zip(pending, results) if not success]
+        if not failed and self._state_file and self._state_file.is_file():
+            # Nothing to resume
+            self._state_file.unlink()
+        return failed
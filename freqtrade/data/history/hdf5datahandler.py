@@ -1,7 +1,8 @@
 import logging
 import re
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -20,6 +21,8 @@ logger = logging.getLogger(__name__)
 class HDF5DataHandler(IDataHandler):
 
     _columns = DEFAULT_DATAFRAME_COLUMNS
+    # Reserved size of string columns, so trades with longer values can be appended
+    _trades_itemsize = {'id': 32, 'type': 16, 'side': 8}
 
     @classmethod
     def ohlcv_get_available_data(cls, datadir: Path) -> ListPairsWithTimeframes:
@@ -114,12 +117,47 @@ class HDF5DataHandler(IDataHandler):
 
     def ohlcv_append(self, pair: str, timeframe: str, data: pd.DataFrame) -> None:
         """
-        Append data to existing data structures
+        Append data to existing data structures.
+        Rows are appended to the existing table - candles up to the last stored
+        candle are skipped.
         :param pair: Pair
         :param timeframe: Timeframe this ohlcv data is for
         :param data: Data to append.
         """
-        raise NotImplementedError()
+        key = self._pair_ohlcv_key(pair, timeframe)
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+
+        with pd.HDFStore(filename, mode='a', complevel=9, complib='blosc') as ds:
+            if key in ds:
+                rows = ds.get_storer(key).nrows
+                if rows:
+                    last_date = ds.select_column(key, 'date', start=rows - 1).iloc[-1]
+                    data = data.loc[data['date'] > last_date]
+            if not data.empty:
+                ds.append(key, data.loc[:, self._columns], format='table',
+                          data_columns=['date'])
+
+    def ohlcv_data_min_max(self, pair: str,
+                           timeframe: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Returns the dates of the first and the last stored candle.
+        Only these 2 rows of the date column are read.
+        :param pair: Pair
+        :param timeframe: Timeframe (e.g. "5m")
+        :return: Tuple of (first date, last date), or None if no data is stored
+        """
+        key = self._pair_ohlcv_key(pair, timeframe)
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        if not filename.exists():
+            return None
+        with pd.HDFStore(filename, mode='r') as ds:
+            if key not in ds:
+                return None
+            rows = ds.get_storer(key).nrows
+            if not rows:
+                return None
+            return (ds.select_column(key, 'date', stop=1).iloc[0],
+                    ds.select_column(key, 'date', start=rows - 1).iloc[-1])
 
     @classmethod
     def trades_get_pairs(cls, datadir: Path) -> List[str]:
@@ -145,7 +183,7 @@ class HDF5DataHandler(IDataHandler):
         ds = pd.HDFStore(self._pair_trades_filename(self._datadir, pair),
                          mode='a', complevel=9, complib='blosc')
         ds.put(key, pd.DataFrame(data, columns=DEFAULT_TRADES_COLUMNS),
-               format='table', data_columns=['timestamp'])
+               format='table', data_columns=['timestamp'], min_itemsize=self._trades_itemsize)
         ds.close()
 
     def trades_append(self, pair: str, data: TradeList):
@@ -155,7 +193,21 @@ class HDF5DataHandler(IDataHandler):
         :param data: List of Lists containing trade data,
                      column sequence as in DEFAULT_TRADES_COLUMNS
         """
-        raise NotImplementedError()
+        key = self._pair_trades_key(pair)
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.exists():
+            self.trades_store(pair, data)
+            return
+        with pd.HDFStore(filename, mode='a', complevel=9, complib='blosc') as ds:
+            try:
+                ds.append(key, pd.DataFrame(data, columns=DEFAULT_TRADES_COLUMNS),
+                          format='table', data_columns=['timestamp'],
+                          min_itemsize=self._trades_itemsize)
+                return
+            except ValueError:
+                # Files stored without reserved string sizes can't take longer ids
+                logger.info(f"Rewriting trades of {pair} to extend string columns.")
+        self.trades_store(pair, self._trades_load(pair) + data)
 
     def _trades_load(self, pair: str, timerange: Optional[TimeRange] = None) -> TradeList:
         """
@@ -169,14 +221,34 @@ class HDF5DataHandler(IDataHandler):
 
         if not filename.exists():
             return []
-        where = []
-        if timerange:
-            if timerange.starttype == 'date':
-                where.append(f"timestamp >= {timerange.startts * 1e3}")
-            if timerange.stoptype == 'date':
-                where.append(f"timestamp < {timerange.stopts * 1e3}")
+        where = self._trades_where(timerange)
 
         trades: pd.DataFrame = pd.read_hdf(filename, key=key, mode="r", where=where)
+        return self._trades_to_list(trades)
+
+    def _trades_load_chunks(self, pair: str, chunk_size: int,
+                            timerange: Optional[TimeRange] = None) -> Iterator[TradeList]:
+        """
+        Load trades in chunks of chunk_size trades, oldest first.
+        Reads one chunk of rows from the h5 file at a time.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :param timerange: Timerange to load trades for
+        :return: Iterator of trade lists
+        """
+        key = self._pair_trades_key(pair)
+        filename = self._pair_trades_filename(self._datadir, pair)
+
+        if not filename.exists():
+            return
+        where = self._trades_where(timerange)
+        with pd.HDFStore(filename, mode='r') as ds:
+            for trades in ds.select(key, where=where or None, iterator=True,
+                                    chunksize=chunk_size):
+                yield self._trades_to_list(trades)
+
+    @staticmethod
+    def _trades_to_list(trades: pd.DataFrame) -> TradeList:
         trades[['id', 'type']] = trades[['id', 'type']].replace({np.nan: None})
         return trades.values.tolist()
 
@@ -192,6 +264,16 @@ class HDF5DataHandler(IDataHandler):
             return True
         return False
 
+    @staticmethod
+    def _trades_where(timerange: Optional[TimeRange]) -> List[str]:
+        where = []
+        if timerange:
+            if timerange.starttype == 'date':
+                where.append(f"timestamp >= {timerange.startts * 1e3}")
+            if timerange.stoptype == 'date':
+                where.append(f"timestamp < {timerange.stopts * 1e3}")
+        return where
+
     @classmethod
     def _pair_ohlcv_key(cls, pair: str, timeframe: str) -> str:
         return f"{pair}/ohlcv/tf_{timeframe}"
@@ -1,24 +1,34 @@
+import asyncio
 import logging
 import operator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
+from itertools import repeat, takewhile
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import arrow
+import numpy as np
 from pandas import DataFrame
 
 from freqtrade.configuration import TimeRange
-from freqtrade.constants import DEFAULT_DATAFRAME_COLUMNS
-from freqtrade.data.converter import (clean_ohlcv_dataframe, ohlcv_to_dataframe,
-                                      trades_remove_duplicates, trades_to_ohlcv)
+from freqtrade.constants import DEFAULT_DOWNLOAD_CONCURRENCY, TradeList
+from freqtrade.data.converter import (TradesOhlcvAggregator, clean_ohlcv_dataframe,
+                                      ohlcv_to_dataframe, trades_remove_duplicates)
+from freqtrade.data.history.download_scheduler import DOWNLOAD_STATE_FN, DownloadScheduler
 from freqtrade.data.history.idatahandler import IDataHandler, get_datahandler
 from freqtrade.exceptions import OperationalException
 from freqtrade.exchange import Exchange
+from freqtrade.loggers import emit_log_records, get_worker_log_records, setup_worker_logging
 from freqtrade.misc import format_ms_time
 
 
 logger = logging.getLogger(__name__)
 
+# Number of downloaded trades stored at once (see _async_download_trades_history())
+TRADES_CHUNK_SIZE = 100_000
+
 
 def load_pair_history(pair: str,
                       timeframe: str,
@@ -64,6 +74,7 @@ def load_data(datadir: Path,
               startup_candles: int = 0,
               fail_without_data: bool = False,
               data_format: str = 'json',
+              workers: int = 1,
               ) -> Dict[str, DataFrame]:
     """
     Load ohlcv history data for a list of pairs.
@@ -76,21 +87,28 @@ def load_data(datadir: Path,
     :param startup_candles: Additional candles to load at the start of the period
     :param fail_without_data: Raise OperationalException if no data is found.
     :param data_format: Data format which should be used. Defaults to json
+    :param workers: Number of processes used to load pairs in parallel. Defaults to 1
     :return: dict(<pair>:<Dataframe>)
     """
     result: Dict[str, DataFrame] = {}
     if startup_candles > 0 and timerange:
         logger.info(f'Using indicator startup period: {startup_candles} ...')
 
-    data_handler = get_datahandler(datadir, data_format)
-
-    for pair in pairs:
-        hist = load_pair_history(pair=pair, timeframe=timeframe,
-                                 datadir=datadir, timerange=timerange,
-                                 fill_up_missing=fill_up_missing,
-                                 startup_candles=startup_candles,
-                                 data_handler=data_handler
-                                 )
+    load_args: Dict[str, Any] = {
+        'timeframe': timeframe,
+        'datadir': datadir,
+        'timerange': timerange,
+        'fill_up_missing': fill_up_missing,
+        'startup_candles': startup_candles,
+    }
+    if workers > 1 and len(pairs) > 1:
+        loaded = _load_pairs_parallel(pairs, workers, data_format=data_format, **load_args)
+    else:
+        data_handler = get_datahandler(datadir, data_format)
+        loaded = ((pair, load_pair_history(pair=pair, data_handler=data_handler, **load_args))
+                  for pair in pairs)
+
+    for pair, hist in loaded:
         if not hist.empty:
             result[pair] = hist
 
@@ -99,6 +117,28 @@ def load_data(datadir: Path,
     return result
 
 
+def _load_pair_worker(pair: str, load_args: Dict[str, Any]
+                      ) -> Tuple[DataFrame, List[logging.LogRecord]]:
+    hist = load_pair_history(pair=pair, **load_args)
+    return hist, get_worker_log_records()
+
+
+def _load_pairs_parallel(pairs: List[str], workers: int,
+                         **load_args) -> Iterator[Tuple[str, DataFrame]]:
+    """
+    Load pairs in a pool of worker processes.
+    Results are returned in the order of pairs, and log records of the workers are emitted
+    in this order too - so the output doesn't depend on the number of workers.
+    """
+    with ProcessPoolExecutor(max_workers=min(workers, len(pairs)),
+                             initializer=setup_worker_logging,
+                             initargs=(logging.root.getEffectiveLevel(), )) as executor:
+        for pair, (hist, records) in zip(pairs, executor.map(_load_pair_worker, pairs,
+                                                             repeat(load_args))):
+            emit_log_records(records)
+            yield pair, hist
+
+
 def refresh_data(datadir: Path,
                  timeframe: str,
                  pairs: List[str],
@@ -122,34 +162,102 @@ def refresh_data(datadir: Path,
                                exchange=exchange, data_handler=data_handler)
 
 
-def _load_cached_data_for_updating(pair: str, timeframe: str, timerange: Optional[TimeRange],
-                                   data_handler: IDataHandler) -> Tuple[DataFrame, Optional[int]]:
+def _load_cached_data_for_updating(
+        pair: str, timeframe: str, timerange: Optional[TimeRange],
+        data_handler: IDataHandler) -> Tuple[Optional[Tuple[datetime, datetime]], Optional[int]]:
     """
-    Load cached data to download more data.
+    Determine the cached data to update.
     If timerange is passed in, checks whether data from an before the stored data will be
     downloaded.
     If that's the case then what's available should be completely overwritten.
     Otherwise downloads always start at the end of the available data to avoid data gaps.
+    Only the dates of the first and the last stored candle are read - unless the datahandler
+    doesn't support this.
     Note: Only used by download_pair_history().
+    :return: Tuple of (first and last date of the cached data - None if there is no data to
+        update, download start in milliseconds)
     """
     start = None
     if timerange:
         if timerange.starttype == 'date':
             start = datetime.fromtimestamp(timerange.startts, tz=timezone.utc)
 
-    # Intentionally don't pass timerange in - since we need to load the full dataset.
-    data = data_handler.ohlcv_load(pair, timeframe=timeframe,
-                                   timerange=None, fill_missing=False,
-                                   drop_incomplete=True, warn_no_data=False)
-    if not data.empty:
-        if start and start < data.iloc[0]['date']:
+    try:
+        cached = data_handler.ohlcv_data_min_max(pair, timeframe)
+    except NotImplementedError:
+        # Intentionally don't pass timerange in - since we need to load the full dataset.
+        data = data_handler.ohlcv_load(pair, timeframe=timeframe,
+                                       timerange=None, fill_missing=False,
+                                       drop_incomplete=False, warn_no_data=False)
+        cached = (data.iloc[0]['date'], data.iloc[-1]['date']) if not data.empty else None
+    if cached:
+        if start and start < cached[0]:
             # Earlier data than existing data requested, redownload all
-            data = DataFrame(columns=DEFAULT_DATAFRAME_COLUMNS)
+            cached = None
         else:
-            start = data.iloc[-1]['date']
+            start = cached[1]
 
     start_ms = int(start.timestamp() * 1000) if start else None
-    return data, start_ms
+    return cached, start_ms
+
+
+def _prepare_pair_history(datadir: Path, pair: str, timeframe: str,
+                          timerange: Optional[TimeRange], new_pairs_days: int,
+                          data_handler: IDataHandler) -> Tuple[bool, int]:
+    """
+    Determine the start of the download based on the cached data.
+    :return: Tuple of (True if the download continues the cached data,
+        download start in milliseconds)
+    """
+    logger.info(
+        f'Download history data for pair: "{pair}", timeframe: {timeframe} '
+        f'and store in {datadir}.'
+    )
+
+    cached, since_ms = _load_cached_data_for_updating(pair, timeframe, timerange,
+                                                      data_handler=data_handler)
+
+    logger.debug("Current Start: %s", f"{cached[0]:%Y-%m-%d %H:%M:%S}" if cached else 'None')
+    logger.debug("Current End: %s", f"{cached[1]:%Y-%m-%d %H:%M:%S}" if cached else 'None')
+
+    # Default since_ms to 30 days if nothing is given
+    if not since_ms:
+        since_ms = int(arrow.utcnow().shift(days=-new_pairs_days).float_timestamp) * 1000
+    return cached is not None, since_ms
+
+
+def _store_pair_history(pair: str, timeframe: str, append: bool, new_data: List,
+                        data_handler: IDataHandler) -> None:
+    """
+    Store downloaded candles
+    :param append: Append to the cached data - otherwise the cached data is replaced
+    """
+    # TODO: Maybe move parsing to exchange class (?)
+    new_dataframe = ohlcv_to_dataframe(new_data, timeframe, pair,
+                                       fill_missing=False, drop_incomplete=True)
+    if not append:
+        data_handler.ohlcv_store(pair, timeframe, data=new_dataframe)
+    else:
+        try:
+            # Only the new candles are written. Candles already stored are skipped
+            # by the datahandler, so only the new tail is checked for duplicates.
+            data_handler.ohlcv_append(pair, timeframe, data=new_dataframe)
+        except NotImplementedError:
+            data = data_handler.ohlcv_load(pair, timeframe=timeframe, timerange=None,
+                                           fill_missing=False, drop_incomplete=True,
+                                           warn_no_data=False)
+            # Run cleaning again to ensure there were no duplicate candles
+            # Especially between existing and new data.
+            data = clean_ohlcv_dataframe(data.append(new_dataframe), timeframe, pair,
+                                         fill_missing=False, drop_incomplete=False)
+            data_handler.ohlcv_store(pair, timeframe, data=data)
+
+    logger.debug("New  Start: %s",
+                 f"{new_dataframe.iloc[0]['date']:%Y-%m-%d %H:%M:%S}"
+                 if not new_dataframe.empty else 'None')
+    logger.debug("New End: %s",
+                 f"{new_dataframe.iloc[-1]['date']:%Y-%m-%d %H:%M:%S}"
+                 if not new_dataframe.empty else 'None')
 
 
 def _download_pair_history(datadir: Path,
@@ -175,44 +283,63 @@ def _download_pair_history(datadir: Path,
     data_handler = get_datahandler(datadir, data_handler=data_handler)
 
     try:
-        logger.info(
-            f'Download history data for pair: "{pair}", timeframe: {timeframe} '
-            f'and store in {datadir}.'
+        append, since_ms = _prepare_pair_history(datadir, pair, timeframe, timerange,
+                                                 new_pairs_days, data_handler)
+        new_data = exchange.get_historic_ohlcv(pair=pair, timeframe=timeframe, since_ms=since_ms)
+        _store_pair_history(pair, timeframe, append, new_data, data_handler)
+        return True
+
+    except Exception:
+        logger.exception(
+            f'Failed to download history data for pair: "{pair}", timeframe: {timeframe}.'
         )
+        return False
 
-        # data, since_ms = _load_cached_data_for_updating_old(datadir, pair, timeframe, timerange)
-        data, since_ms = _load_cached_data_for_updating(pair, timeframe, timerange,
-                                                        data_handler=data_handler)
-
-        logger.debug("Current Start: %s",
-                     f"{data.iloc[0]['date']:%Y-%m-%d %H:%M:%S}" if not data.empty else 'None')
-        logger.debug("Current End: %s",
-                     f"{data.iloc[-1]['date']:%Y-%m-%d %H:%M:%S}" if not data.empty else 'None')
-
-        # Default since_ms to 30 days if nothing is given
-        new_data = exchange.get_historic_ohlcv(pair=pair,
-                                               timeframe=timeframe,
-                                               since_ms=since_ms if since_ms else
-                                               int(arrow.utcnow().shift(
-                                                   days=-new_pairs_days).float_timestamp) * 1000
-                                               )
-        # TODO: Maybe move parsing to exchange class (?)
-        new_dataframe = ohlcv_to_dataframe(new_data, timeframe, pair,
-                                           fill_missing=False, drop_incomplete=True)
-        if data.empty:
-            data = new_dataframe
-        else:
-            # Run cleaning again to ensure there were no duplicate candles
-            # Especially between existing and new data.
-            data = clean_ohlcv_dataframe(data.append(new_dataframe), timeframe, pair,
-                                         fill_missing=False, drop_incomplete=False)
 
-        logger.debug("New  Start: %s",
-                     f"{data.iloc[0]['date']:%Y-%m-%d %H:%M:%S}" if not data.empty else 'None')
-        logger.debug("New End: %s",
-                     f"{data.iloc[-1]['date']:%Y-%m-%d %H:%M:%S}" if not data.empty else 'None')
+def _download_io_executor() -> ThreadPoolExecutor:
+    """
+    Executor for the disk I/O of a download run.
+    Uses one worker thread - not all datahandlers (hdf5) support access from multiple threads
+    at the same time.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='download-io')
+
 
-        data_handler.ohlcv_store(pair, timeframe, data=data)
+async def _run_blocking(io_executor: ThreadPoolExecutor, func: Callable, *args) -> Any:
+    """
+    Run blocking disk I/O outside of the event loop, so other downloads continue meanwhile.
+    """
+    return await asyncio.get_event_loop().run_in_executor(io_executor, func, *args)
+
+
+async def _async_download_pair_history(datadir: Path,
+                                       exchange: Exchange,
+                                       pair: str, *,
+                                       new_pairs_days: int = 30,
+                                       timeframe: str = '5m',
+                                       timerange: Optional[TimeRange] = None,
+                                       erase: bool = False,
+                                       data_handler: IDataHandler,
+                                       io_executor: ThreadPoolExecutor) -> bool:
+    """
+    Asynchronous version of _download_pair_history(), used by the download scheduler.
+    :param erase: Delete existing data before downloading
+    :param io_executor: Executor running the disk I/O
+    :return: bool with success state
+    """
+    try:
+        if erase:
+            if await _run_blocking(io_executor, data_handler.ohlcv_purge, pair, timeframe):
+                logger.info(f'Deleting existing data for pair {pair}, interval {timeframe}.')
+
+        logger.info(f'Downloading pair {pair}, interval {timeframe}.')
+        append, since_ms = await _run_blocking(io_executor, _prepare_pair_history, datadir,
+                                               pair, timeframe, timerange, new_pairs_days,
+                                               data_handler)
+        new_data = await exchange._async_get_historic_ohlcv(pair=pair, timeframe=timeframe,
+                                                            since_ms=since_ms)
+        await _run_blocking(io_executor, _store_pair_history, pair, timeframe, append,
+                            new_data, data_handler)
         return True
 
     except Exception:
@@ -222,46 +349,140 @@ def _download_pair_history(datadir: Path,
         return False
 
 
+def _timerange_parameters(timerange: Optional[TimeRange]) -> Optional[Dict[str, Any]]:
+    return vars(timerange) if timerange else None
+
+
 def refresh_backtest_ohlcv_data(exchange: Exchange, pairs: List[str], timeframes: List[str],
                                 datadir: Path, timerange: Optional[TimeRange] = None,
                                 new_pairs_days: int = 30, erase: bool = False,
-                                data_format: str = None) -> List[str]:
+                                data_format: str = None,
+                                concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY) -> List[str]:
     """
     Refresh stored ohlcv data for backtesting and hyperopt operations.
     Used by freqtrade download-data subcommand.
+    Pairs and timeframes are downloaded concurrently - an interrupted download
+    resumes with the downloads not completed yet.
+    :param concurrency: Number of downloads running at the same time
     :return: List of pairs that are not available.
     """
     pairs_not_available = []
     data_handler = get_datahandler(datadir, data_format)
-    total_downloads = len(pairs) * len(timeframes)
-    iteration = 0
-    
-    logger.info(f'Total number of downloads: {total_downloads}')
-    
-    for pair in pairs:
-        if pair not in exchange.markets:
-            pairs_not_available.append(pair)
-            logger.info(f"Skipping pair {pair}...")
-            continue
-        for timeframe in timeframes:
-            
-            iteration += 1
-            progress_pct = round(iteration/total_downloads * 100, 1)
-            logger.info(f'Download progress: {iteration}/{total_downloads} ({progress_pct} %)')
-            
-            if erase:
-                if data_handler.ohlcv_purge(pair, timeframe):
-                    logger.info(
-                        f'Deleting existing data for pair {pair}, interval {timeframe}.')
-
-            logger.info(f'Downloading pair {pair}, interval {timeframe}.')
-            _download_pair_history(datadir=datadir, exchange=exchange,
-                                   pair=pair, timeframe=str(timeframe),
-                                   new_pairs_days=new_pairs_days,
-                                   timerange=timerange, data_handler=data_handler)
+    scheduler = DownloadScheduler(
+        exchange, datadir / DOWNLOAD_STATE_FN, concurrency=concurrency,
+        parameters={'type': 'ohlcv', 'timerange': _timerange_parameters(timerange),
+                    'new_pairs_days': new_pairs_days, 'erase': erase,
+                    'data_format': data_format})
+
+    with _download_io_executor() as io_executor:
+        for pair in pairs:
+            if pair not in exchange.markets:
+                pairs_not_available.append(pair)
+                logger.info(f"Skipping pair {pair}...")
+                continue
+            for timeframe in timeframes:
+                scheduler.add_job(f'{pair} {timeframe}', partial(
+                    _async_download_pair_history, datadir=datadir, exchange=exchange,
+                    pair=pair, timeframe=str(timeframe), new_pairs_days=new_pairs_days,
+                    timerange=timerange, erase=erase, data_handler=data_handler,
+                    io_executor=io_executor))
+        scheduler.run()
     return pairs_not_available
 
 
+def _trades_checkpoint(trades: TradeList, checkpoint: Optional[Dict[str, Any]]
+                       ) -> Dict[str, Any]:
+    """
+    Checkpoint after storing `trades` - which are sorted and newer than `checkpoint`.
+    Records the last trade (to continue the download from), and all trade ids of the last
+    timestamp (to skip these trades when they are downloaded again).
+    """
+    last_ts = trades[-1][0]
+    ids = [t[1] for t in takewhile(lambda t: t[0] == last_ts, reversed(trades))]
+    if checkpoint and checkpoint['timestamp'] == last_ts:
+        ids += checkpoint['ids']
+    return {
+        'first_timestamp': checkpoint['first_timestamp'] if checkpoint else trades[0][0],
+        'timestamp': last_ts,
+        'id': trades[-1][1],
+        'ids': ids,
+        'trades': (checkpoint['trades'] if checkpoint else 0) + len(trades),
+    }
+
+
+def _load_trades_checkpoint(pair: str, data_handler: IDataHandler) -> Optional[Dict[str, Any]]:
+    checkpoint = data_handler.trades_checkpoint_load(pair)
+    if checkpoint is None:
+        # Data downloaded without checkpoint - create it from the available trades once
+        trades = data_handler.trades_load(pair)
+        if trades:
+            checkpoint = _trades_checkpoint(trades, None)
+            data_handler.trades_checkpoint_store(pair, checkpoint)
+    return checkpoint
+
+
+def _prepare_trades_history(pair: str, new_pairs_days: int, timerange: Optional[TimeRange],
+                            data_handler: IDataHandler
+                            ) -> Tuple[Optional[Dict[str, Any]], int, Optional[str]]:
+    """
+    Load the checkpoint of cached trades and determine the start of the download.
+    :return: Tuple of checkpoint (None if the download starts without data),
+        download start in milliseconds and the trade id to continue from
+    """
+    since = timerange.startts * 1000 if \
+        (timerange and timerange.starttype == 'date') else int(arrow.utcnow().shift(
+            days=-new_pairs_days).float_timestamp) * 1000
+
+    checkpoint = _load_trades_checkpoint(pair, data_handler)
+
+    if checkpoint and since < checkpoint['first_timestamp']:
+        # since is before the first trade - existing data is replaced by the first chunk
+        logger.info(f"Start earlier than available data. Redownloading trades for {pair}...")
+        checkpoint = None
+
+    from_id = checkpoint['id'] if checkpoint else None
+    if checkpoint and since < checkpoint['timestamp']:
+        # Reset since to the last available point
+        # - 5 seconds (to ensure we're getting all trades)
+        since = checkpoint['timestamp'] - (5 * 1000)
+        logger.info(f"Using last trade date -5s - Downloading trades for {pair} "
+                    f"since: {format_ms_time(since)}.")
+
+    if checkpoint:
+        logger.debug(f"Current Start: {format_ms_time(checkpoint['first_timestamp'])}")
+        logger.debug(f"Current End: {format_ms_time(checkpoint['timestamp'])}")
+    logger.info(f"Current Amount of trades: {checkpoint['trades'] if checkpoint else 0}")
+    return checkpoint, since, from_id
+
+
+def _store_trades_chunk(pair: str, trades: TradeList, checkpoint: Optional[Dict[str, Any]],
+                        data_handler: IDataHandler) -> Optional[Dict[str, Any]]:
+    """
+    Store a chunk of downloaded trades, followed by the checkpoint.
+    Only trades overlapping the checkpoint are checked for duplicates.
+    :param checkpoint: Checkpoint of the stored trades, None to replace existing data
+    :return: Updated checkpoint
+    """
+    trades = trades_remove_duplicates(trades)
+    if checkpoint:
+        last_ts, last_ids = checkpoint['timestamp'], set(checkpoint['ids'])
+        trades = [t for t in trades
+                  if t[0] > last_ts or (t[0] == last_ts and t[1] not in last_ids)]
+    if not trades:
+        return checkpoint
+
+    if checkpoint is None:
+        data_handler.trades_store(pair, data=trades)
+    else:
+        try:
+            data_handler.trades_append(pair, data=trades)
+        except NotImplementedError:
+            data_handler.trades_store(pair, data=data_handler.trades_load(pair) + trades)
+    checkpoint = _trades_checkpoint(trades, checkpoint)
+    data_handler.trades_checkpoint_store(pair, checkpoint)
+    return checkpoint
+
+
 def _download_trades_history(exchange: Exchange,
                              pair: str, *,
                              new_pairs_days: int = 30,
@@ -272,48 +493,51 @@ def _download_trades_history(exchange: Exchange,
     Download trade history from the exchange.
     Appends to previously downloaded trades data.
     """
+    with _download_io_executor() as io_executor:
+        return asyncio.get_event_loop().run_until_complete(_async_download_trades_history(
+            exchange, pair, new_pairs_days=new_pairs_days, timerange=timerange,
+            data_handler=data_handler, io_executor=io_executor))
+
+
+async def _async_download_trades_history(exchange: Exchange,
+                                         pair: str, *,
+                                         new_pairs_days: int = 30,
+                                         timerange: Optional[TimeRange] = None,
+                                         erase: bool = False,
+                                         data_handler: IDataHandler,
+                                         io_executor: ThreadPoolExecutor
+                                         ) -> bool:
+    """
+    Download trade history from the exchange, used by the download scheduler.
+    Trades are stored in chunks of TRADES_CHUNK_SIZE trades while downloading, each followed
+    by a checkpoint - so an interrupted download continues from the last stored chunk.
+    :param erase: Delete existing data before downloading
+    :param io_executor: Executor running the disk I/O
+    """
     try:
+        if erase:
+            if await _run_blocking(io_executor, data_handler.trades_purge, pair):
+                logger.info(f'Deleting existing data for pair {pair}.')
+            await _run_blocking(io_executor, data_handler.trades_checkpoint_purge, pair)
 
-        since = timerange.startts * 1000 if \
-            (timerange and timerange.starttype == 'date') else int(arrow.utcnow().shift(
-                days=-new_pairs_days).float_timestamp) * 1000
-
-        trades = data_handler.trades_load(pair)
-
-        # TradesList columns are defined in constants.DEFAULT_TRADES_COLUMNS
-        # DEFAULT_TRADES_COLUMNS: 0 -> timestamp
-        # DEFAULT_TRADES_COLUMNS: 1 -> id
-
-        if trades and since < trades[0][0]:
-            # since is before the first trade
-            logger.info(f"Start earlier than available data. Redownloading trades for {pair}...")
-            trades = []
-
-        from_id = trades[-1][1] if trades else None
-        if trades and since < trades[-1][0]:
-            # Reset since to the last available point
-            # - 5 seconds (to ensure we're getting all trades)
-            since = trades[-1][0] - (5 * 1000)
-            logger.info(f"Using last trade date -5s - Downloading trades for {pair} "
-                        f"since: {format_ms_time(since)}.")
-
-        logger.debug(f"Current Start: {format_ms_time(trades[0][0]) if trades else 'None'}")
-        logger.debug(f"Current End: {format_ms_time(trades[-1][0]) if trades else 'None'}")
-        logger.info(f"Current Amount of trades: {len(trades)}")
-
-        # Default since_ms to 30 days if nothing is given
-        new_trades = exchange.get_historic_trades(pair=pair,
-                                                  since=since,
-                                                  from_id=from_id,
-                                                  )
-        trades.extend(new_trades[1])
-        # Remove duplicates to make sure we're not storing data we don't need
-        trades = trades_remove_duplicates(trades)
-        data_handler.trades_store(pair, data=trades)
-
-        logger.debug(f"New Start: {format_ms_time(trades[0][0])}")
-        logger.debug(f"New End: {format_ms_time(trades[-1][0])}")
-        logger.info(f"New Amount of trades: {len(trades)}")
+        logger.info(f'Downloading trades for pair {pair}.')
+        checkpoint, since, from_id = await _run_blocking(
+            io_executor, _prepare_trades_history, pair, new_pairs_days, timerange, data_handler)
+        chunk: TradeList = []
+        async for trades in exchange._async_iter_trade_history(pair=pair, since=since,
+                                                               from_id=from_id):
+            chunk.extend(trades)
+            if len(chunk) >= TRADES_CHUNK_SIZE:
+                checkpoint = await _run_blocking(io_executor, _store_trades_chunk, pair, chunk,
+                                                 checkpoint, data_handler)
+                chunk = []
+        checkpoint = await _run_blocking(io_executor, _store_trades_chunk, pair, chunk,
+                                         checkpoint, data_handler)
+
+        if checkpoint:
+            logger.debug(f"New Start: {format_ms_time(checkpoint['first_timestamp'])}")
+            logger.debug(f"New End: {format_ms_time(checkpoint['timestamp'])}")
+        logger.info(f"New Amount of trades: {checkpoint['trades'] if checkpoint else 0}")
         return True
 
     except Exception:
@@ -325,31 +549,67 @@ def _download_trades_history(exchange: Exchange,
 
 def refresh_backtest_trades_data(exchange: Exchange, pairs: List[str], datadir: Path,
                                  timerange: TimeRange, new_pairs_days: int = 30,
-                                 erase: bool = False, data_format: str = 'jsongz') -> List[str]:
+                                 erase: bool = False, data_format: str = 'jsongz',
+                                 concurrency: int = DEFAULT_DOWNLOAD_CONCURRENCY) -> List[str]:
     """
     Refresh stored trades data for backtesting and hyperopt operations.
     Used by freqtrade download-data subcommand.
+    Pairs are downloaded concurrently - an interrupted download resumes with the
+    downloads not completed yet.
+    :param concurrency: Number of downloads running at the same time
     :return: List of pairs that are not available.
     """
     pairs_not_available = []
     data_handler = get_datahandler(datadir, data_format=data_format)
-    for pair in pairs:
-        if pair not in exchange.markets:
-            pairs_not_available.append(pair)
-            logger.info(f"Skipping pair {pair}...")
-            continue
+    scheduler = DownloadScheduler(
+        exchange, datadir / DOWNLOAD_STATE_FN, concurrency=concurrency,
+        parameters={'type': 'trades', 'timerange': _timerange_parameters(timerange),
+                    'new_pairs_days': new_pairs_days, 'erase': erase,
+                    'data_format': data_format})
+
+    with _download_io_executor() as io_executor:
+        for pair in pairs:
+            if pair not in exchange.markets:
+                pairs_not_available.append(pair)
+                logger.info(f"Skipping pair {pair}...")
+                continue
+
+            scheduler.add_job(pair, partial(
+                _async_download_trades_history, exchange=exchange, pair=pair,
+                new_pairs_days=new_pairs_days, timerange=timerange, erase=erase,
+                data_handler=data_handler, io_executor=io_executor))
+        scheduler.run()
+    return pairs_not_available
 
-        if erase:
-            if data_handler.trades_purge(pair):
-                logger.info(f'Deleting existing data for pair {pair}.')
 
-        logger.info(f'Downloading trades for pair {pair}.')
-        _download_trades_history(exchange=exchange,
-                                 pair=pair,
-                                 new_pairs_days=new_pairs_days,
-                                 timerange=timerange,
-                                 data_handler=data_handler)
-    return pairs_not_available
+def _trades_array_chunks(trades: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Split a structured array of trades into chunks, removing duplicates (trades with the same
+    timestamp and id) - across chunks, only trades with the last timestamp of the previous
+    chunk are compared.
+    :param trades: Structured array, as returned by IDataHandler.trades_load_array()
+    :param chunk_size: Number of trades per chunk
+    :return: Iterator of structured arrays
+    """
+    last_ts = None
+    last_ids = np.empty(0, dtype='int64')
+    for start in range(0, len(trades), chunk_size):
+        chunk = trades[start:start + chunk_size]
+        keys = np.empty(len(chunk), dtype=[('timestamp', '<i8'), ('id', '<i8')])
+        keys['timestamp'] = chunk['timestamp']
+        keys['id'] = chunk['id']
+        keep = np.zeros(len(chunk), dtype=bool)
+        keep[np.unique(keys, return_index=True)[1]] = True
+        if last_ts is not None:
+            keep &= ~((keys['timestamp'] == last_ts) & np.isin(keys['id'], last_ids))
+        chunk = chunk[keep]
+        if len(chunk) == 0:
+            continue
+        chunk_ts = chunk['timestamp'][-1]
+        ids = chunk['id'][chunk['timestamp'] == chunk_ts]
+        last_ids = np.concatenate((last_ids, ids)) if chunk_ts == last_ts else ids
+        last_ts = chunk_ts
+        yield chunk
 
 
 def convert_trades_to_ohlcv(pairs: List[str], timeframes: List[str],
@@ -357,19 +617,32 @@ def convert_trades_to_ohlcv(pairs: List[str], timeframes: List[str],
                             data_format_ohlcv: str = 'json',
                             data_format_trades: str = 'jsongz') -> None:
     """
-    Convert stored trades data to ohlcv data
+    Convert stored trades data to ohlcv data.
+    Trades are read in chunks of TRADES_CHUNK_SIZE trades, and converted to all timeframes
+    in one pass - so the memory used doesn't depend on the amount of stored trades.
+    Datahandlers storing trades as array (npy) provide slices of the array, without
+    converting trades to lists.
     """
     data_handler_trades = get_datahandler(datadir, data_format=data_format_trades)
     data_handler_ohlcv = get_datahandler(datadir, data_format=data_format_ohlcv)
 
     for pair in pairs:
-        trades = data_handler_trades.trades_load(pair)
+        aggregator = TradesOhlcvAggregator(timeframes)
+        chunks: Iterator[Union[TradeList, np.ndarray]]
+        try:
+            # Slices of the stored array are converted directly
+            chunks = _trades_array_chunks(data_handler_trades.trades_load_array(pair),
+                                          TRADES_CHUNK_SIZE)
+        except NotImplementedError:
+            chunks = data_handler_trades.trades_load_chunks(pair, TRADES_CHUNK_SIZE)
+        for trades in chunks:
+            aggregator.add_trades(trades)
         for timeframe in timeframes:
             if erase:
                 if data_handler_ohlcv.ohlcv_purge(pair, timeframe):
                     logger.info(f'Deleting existing data for pair {pair}, interval {timeframe}.')
             try:
-                ohlcv = trades_to_ohlcv(trades, timeframe)
+                ohlcv = aggregator.get_ohlcv(timeframe)
                 # Store ohlcv
                 data_handler_ohlcv.ohlcv_store(pair, timeframe, data=ohlcv)
             except ValueError:
@@ -8,10 +8,12 @@ from abc import ABC, abstractclassmethod, abstractmethod
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Type
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type
 
+import numpy as np
 from pandas import DataFrame
 
+from freqtrade import misc
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import ListPairsWithTimeframes, TradeList
 from freqtrade.data.converter import clean_ohlcv_dataframe, trades_remove_duplicates, trim_dataframe
@@ -88,6 +90,18 @@ class IDataHandler(ABC):
         :param data: Data to append.
         """
 
+    def ohlcv_data_min_max(self, pair: str,
+                           timeframe: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Returns the dates of the first and the last stored candle - without loading all data.
+        :param pair: Pair
+        :param timeframe: Timeframe (e.g. "5m")
+        :return: Tuple of (first date, last date), or None if no data is stored
+        :raises NotImplementedError: if the datahandler can't determine the dates without
+            loading all data.
+        """
+        raise NotImplementedError()
+
     @abstractclassmethod
     def trades_get_pairs(cls, datadir: Path) -> List[str]:
         """
@@ -141,6 +155,93 @@ class IDataHandler(ABC):
         """
         return trades_remove_duplicates(self._trades_load(pair, timerange=timerange))
 
+    def _trades_load_chunks(self, pair: str, chunk_size: int,
+                            timerange: Optional[TimeRange] = None) -> Iterator[TradeList]:
+        """
+        Load trades in chunks of (about) chunk_size trades, oldest first.
+        Loads all trades at once - override if the format allows reading parts of the data.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :param timerange: Timerange to load trades for - currently not implemented
+        :return: Iterator of trade lists
+        """
+        trades = self._trades_load(pair, timerange=timerange)
+        for start in range(0, len(trades), chunk_size):
+            yield trades[start:start + chunk_size]
+
+    def trades_load_array(self, pair: str, timerange: Optional[TimeRange] = None) -> np.ndarray:
+        """
+        Load trades as structured array - without converting them to lists.
+        :param pair: Load trades for this pair
+        :param timerange: Timerange to load trades for
+        :return: Structured array, sorted by timestamp, with (at least) timestamp, id, price and
+            amount fields. Ids may be stored as integer codes.
+        :raises NotImplementedError: if the datahandler doesn't store trades as array.
+        """
+        raise NotImplementedError()
+
+    def trades_load_chunks(self, pair: str, chunk_size: int,
+                           timerange: Optional[TimeRange] = None) -> Iterator[TradeList]:
+        """
+        Load trades in time-ordered chunks, to process large amounts of trades without loading
+        all of them at once.
+        Removes duplicates in the process - across chunks, only trades with the last timestamp
+        of the previous chunk are compared.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :param timerange: Timerange to load trades for - currently not implemented
+        :return: Iterator of trade lists
+        """
+        last_ts = None
+        last_trades: Set[Tuple] = set()
+        for trades in self._trades_load_chunks(pair, chunk_size, timerange=timerange):
+            trades = trades_remove_duplicates(trades)
+            if last_ts is not None:
+                trades = [t for t in trades if t[0] != last_ts or tuple(t) not in last_trades]
+            if not trades:
+                continue
+            if trades[-1][0] != last_ts:
+                last_ts = trades[-1][0]
+                last_trades = set()
+            last_trades.update(tuple(t) for t in trades if t[0] == last_ts)
+            yield trades
+
+    def trades_checkpoint_load(self, pair: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the checkpoint of the last trades download of this pair.
+        :param pair: Load checkpoint for this pair
+        :return: Checkpoint dict, or None if no checkpoint (or no trades data) exists
+        """
+        filename = self._pair_trades_checkpoint_filename(self._datadir, pair)
+        if not filename.is_file() or pair not in self.trades_get_pairs(self._datadir):
+            return None
+        return misc.file_load_json(filename)
+
+    def trades_checkpoint_store(self, pair: str, checkpoint: Dict[str, Any]) -> None:
+        """
+        Store the checkpoint of a trades download - written after every stored chunk of trades.
+        :param pair: Pair - used for filename
+        :param checkpoint: Dict describing the last stored trades
+        """
+        filename = self._pair_trades_checkpoint_filename(self._datadir, pair)
+        misc.file_dump_json(filename, checkpoint, log=False)
+
+    def trades_checkpoint_purge(self, pair: str) -> bool:
+        """
+        Remove the checkpoint for this pair
+        :param pair: Delete checkpoint for this pair.
+        :return: True when deleted, false if file did not exist.
+        """
+        filename = self._pair_trades_checkpoint_filename(self._datadir, pair)
+        if filename.exists():
+            filename.unlink()
+            return True
+        return False
+
+    @classmethod
+    def _pair_trades_checkpoint_filename(cls, datadir: Path, pair: str) -> Path:
+        return datadir.joinpath(f'{misc.pair_to_filename(pair)}-trades.checkpoint.json')
+
     def ohlcv_load(self, pair, timeframe: str,
                    timerange: Optional[TimeRange] = None,
                    fill_missing: bool = True,
@@ -237,6 +338,9 @@ def get_datahandlerclass(datatype: str) -> Type[IDataHandler]:
     elif datatype == 'hdf5':
         from .hdf5datahandler import HDF5DataHandler
         return HDF5DataHandler
+    elif datatype == 'npy':
+        from .npydatahandler import NpyDataHandler
+        return NpyDataHandler
     else:
         raise ValueError(f"No datahandler for datatype {datatype} available.")
 
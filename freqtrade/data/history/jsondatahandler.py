@@ -1,10 +1,12 @@
 import logging
 import re
+import shutil
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
-from pandas import DataFrame, read_json, to_datetime
+from pandas import DataFrame, concat, read_json, to_datetime
 
 from freqtrade import misc
 from freqtrade.configuration import TimeRange
@@ -18,9 +20,17 @@ logger = logging.getLogger(__name__)
 
 
 class JsonDataHandler(IDataHandler):
+    """
+    OHLCV data is stored in one json file per pair and timeframe, trades in one file per pair.
+    Appended candles / trades are stored as separate segment files (in the directory
+    `<filename>.parts`), so existing files are never rewritten when updating data.
+    Candle segments are merged back into the main file once there are more than
+    `_max_segments` of them. All segments are merged when the data is stored again.
+    """
 
     _use_zip = False
     _columns = DEFAULT_DATAFRAME_COLUMNS
+    _max_segments = 50
 
     @classmethod
     def ohlcv_get_available_data(cls, datadir: Path) -> ListPairsWithTimeframes:
@@ -60,6 +70,11 @@ class JsonDataHandler(IDataHandler):
         :return: None
         """
         filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        self._ohlcv_write(filename, data)
+        # All data is in the main file now
+        self._segments_purge(filename)
+
+    def _ohlcv_write(self, filename: Path, data: DataFrame) -> None:
         _data = data.copy()
         # Convert date to int
         _data['date'] = _data['date'].astype(np.int64) // 1000 // 1000
@@ -69,6 +84,35 @@ class JsonDataHandler(IDataHandler):
             filename, orient="values",
             compression='gzip' if self._use_zip else None)
 
+    def _ohlcv_read(self, filename: Path) -> DataFrame:
+        """
+        Read one ohlcv file, without converting the columns.
+        Raises ValueError if the file does not contain ohlcv data.
+        """
+        pairdata = read_json(filename, orient='values')
+        pairdata.columns = self._columns
+        return pairdata
+
+    def _segments(self, filename: Path) -> List[Path]:
+        """
+        Segment files with data appended to `filename`, oldest first.
+        """
+        segments_dir = self._segments_dir(filename)
+        if not segments_dir.is_dir():
+            return []
+        return sorted(segments_dir.glob(f"*.{self._get_file_extension()}"))
+
+    def _next_segment(self, filename: Path, segments: List[Path]) -> Path:
+        segments_dir = self._segments_dir(filename)
+        segments_dir.mkdir(exist_ok=True)
+        segment = int(segments[-1].name.split('.')[0]) + 1 if segments else 1
+        return segments_dir / f"{segment:06d}.{self._get_file_extension()}"
+
+    def _segments_purge(self, filename: Path) -> None:
+        segments_dir = self._segments_dir(filename)
+        if segments_dir.is_dir():
+            shutil.rmtree(segments_dir)
+
     def _ohlcv_load(self, pair: str, timeframe: str,
                     timerange: Optional[TimeRange] = None,
                     ) -> DataFrame:
@@ -86,9 +130,9 @@ class JsonDataHandler(IDataHandler):
         filename = self._pair_data_filename(self._datadir, pair, timeframe)
         if not filename.exists():
             return DataFrame(columns=self._columns)
+        files = [filename] + self._segments(filename)
         try:
-            pairdata = read_json(filename, orient='values')
-            pairdata.columns = self._columns
+            pairdata = concat([self._ohlcv_read(file) for file in files], ignore_index=True)
         except ValueError:
             logger.error(f"Could not load data for {pair}.")
             return DataFrame(columns=self._columns)
@@ -108,6 +152,7 @@ class JsonDataHandler(IDataHandler):
         :return: True when deleted, false if file did not exist.
         """
         filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        self._segments_purge(filename)
         if filename.exists():
             filename.unlink()
             return True
@@ -115,12 +160,53 @@ class JsonDataHandler(IDataHandler):
 
     def ohlcv_append(self, pair: str, timeframe: str, data: DataFrame) -> None:
         """
-        Append data to existing data structures
+        Append data to existing data structures.
+        New candles are written to a new segment file - candles up to the last stored
+        candle are skipped, so only the last segment is read.
         :param pair: Pair
         :param timeframe: Timeframe this ohlcv data is for
         :param data: Data to append.
         """
-        raise NotImplementedError()
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        if not filename.exists():
+            self.ohlcv_store(pair, timeframe, data)
+            return
+        segments = self._segments(filename)
+        stored = self._ohlcv_read(segments[-1] if segments else filename)
+        last_date = to_datetime(stored['date'].iloc[-1], unit='ms', utc=True)
+        data = data.loc[data['date'] > last_date]
+        if data.empty:
+            return
+
+        if len(segments) >= self._max_segments:
+            logger.info(f"Merging {len(segments)} segments of {pair}, {timeframe}.")
+            self.ohlcv_store(pair, timeframe, concat([self._ohlcv_load(pair, timeframe), data],
+                                                     ignore_index=True))
+            return
+        self._ohlcv_write(self._next_segment(filename, segments), data)
+
+    def ohlcv_data_min_max(self, pair: str,
+                           timeframe: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Returns the dates of the first and the last stored candle.
+        Reads the main file and the last segment only.
+        :param pair: Pair
+        :param timeframe: Timeframe (e.g. "5m")
+        :return: Tuple of (first date, last date), or None if no data is stored
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        if not filename.exists():
+            return None
+        segments = self._segments(filename)
+        try:
+            first = self._ohlcv_read(filename)
+            last = self._ohlcv_read(segments[-1]) if segments else first
+        except ValueError:
+            return None
+        if first.empty or last.empty:
+            return None
+        return (to_datetime(first['date'].iloc[0], unit='ms', utc=True),
+                to_datetime(last['date'].iloc[-1], unit='ms', utc=True))
 
     @classmethod
     def trades_get_pairs(cls, datadir: Path) -> List[str]:
@@ -143,15 +229,22 @@ class JsonDataHandler(IDataHandler):
         """
         filename = self._pair_trades_filename(self._datadir, pair)
         misc.file_dump_json(filename, data, is_zip=self._use_zip)
+        self._segments_purge(filename)
 
     def trades_append(self, pair: str, data: TradeList):
         """
-        Append data to existing files
+        Append data to existing files.
+        Trades are written to a new segment file, existing files are not modified.
         :param pair: Pair - used for filename
         :param data: List of Lists containing trade data,
                      column sequence as in DEFAULT_TRADES_COLUMNS
         """
-        raise NotImplementedError()
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.exists():
+            self.trades_store(pair, data)
+            return
+        misc.file_dump_json(self._next_segment(filename, self._segments(filename)), data,
+                            is_zip=self._use_zip, log=False)
 
     def _trades_load(self, pair: str, timerange: Optional[TimeRange] = None) -> TradeList:
         """
@@ -161,18 +254,42 @@ class JsonDataHandler(IDataHandler):
         :param timerange: Timerange to load trades for - currently not implemented
         :return: List of trades
         """
+        tradesdata: TradeList = []
+        for trades in self._trades_load_files(pair):
+            tradesdata.extend(trades)
+        return tradesdata
+
+    def _trades_load_chunks(self, pair: str, chunk_size: int,
+                            timerange: Optional[TimeRange] = None) -> Iterator[TradeList]:
+        """
+        Load trades in chunks of (about) chunk_size trades, oldest first.
+        Only one file (the main file or one segment) is loaded at a time.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :param timerange: Timerange to load trades for - currently not implemented
+        :return: Iterator of trade lists
+        """
+        for trades in self._trades_load_files(pair):
+            for start in range(0, len(trades), chunk_size):
+                yield trades[start:start + chunk_size]
+
+    def _trades_load_files(self, pair: str) -> Iterator[TradeList]:
+        """
+        Load the trades of the main file and all segments, one file at a time
+        """
         filename = self._pair_trades_filename(self._datadir, pair)
         tradesdata = misc.file_load_json(filename)
 
         if not tradesdata:
-            return []
+            return
 
         if isinstance(tradesdata[0], dict):
             # Convert trades dict to list
             logger.info("Old trades format detected - converting")
             tradesdata = trades_dict_to_list(tradesdata)
-            pass
-        return tradesdata
+        yield tradesdata
+        for segment in self._segments(filename):
+            yield misc.file_load_json(segment)
 
     def trades_purge(self, pair: str) -> bool:
         """
@@ -181,6 +298,7 @@ class JsonDataHandler(IDataHandler):
         :return: True when deleted, false if file did not exist.
         """
         filename = self._pair_trades_filename(self._datadir, pair)
+        self._segments_purge(filename)
         if filename.exists():
             filename.unlink()
             return True
@@ -192,6 +310,10 @@ class JsonDataHandler(IDataHandler):
         filename = datadir.joinpath(f'{pair_s}-{timeframe}.{cls._get_file_extension()}')
         return filename
 
+    @staticmethod
+    def _segments_dir(filename: Path) -> Path:
+        return filename.with_name(f'{filename.name}.parts')
+
     @classmethod
     def _get_file_extension(cls):
         return "json.gz" if cls._use_zip else "json"
@@ -0,0 +1,397 @@
+import logging
+import re
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+
+from freqtrade import misc
+from freqtrade.configuration import TimeRange
+from freqtrade.constants import DEFAULT_DATAFRAME_COLUMNS, ListPairsWithTimeframes, TradeList
+
+from .idatahandler import IDataHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+class NpyDataHandler(IDataHandler):
+    """
+    Uncompressed, columnar binary format.
+    Each ohlcv file is a .npy file (a small header followed by the raw data) containing a
+    float64 array of shape (len(columns), candles), so every column is stored contiguously.
+    Dates are stored as milliseconds since epoch.
+    Files are memory-mapped when loading, so only the requested timerange is read from disk.
+
+    Trades are stored as .npy file containing a structured array (one record per trade,
+    see `_trades_dtype`). Strings are dictionary-encoded: type and side contain codes into
+    the dictionary file `<pair>-trades.dict.json`. Integer ids are stored as they are,
+    all other ids (and missing ids) as negative codes into the dictionary.
+    """
+
+    _columns = DEFAULT_DATAFRAME_COLUMNS
+    _trades_dtype = np.dtype([('timestamp', '<i8'), ('id', '<i8'), ('type', '<i2'),
+                              ('side', '<i2'), ('price', '<f8'), ('amount', '<f8'),
+                              ('cost', '<f8')])
+    # Fixed length of the trades file header, including magic string and header length
+    _trades_header_len = 256
+
+    @classmethod
+    def ohlcv_get_available_data(cls, datadir: Path) -> ListPairsWithTimeframes:
+        """
+        Returns a list of all pairs with ohlcv data available in this datadir
+        :param datadir: Directory to search for ohlcv files
+        :return: List of Tuples of (pair, timeframe)
+        """
+        _tmp = [re.search(r'^([a-zA-Z_]+)\-(\d+\S+)(?=.npy)', p.name)
+                for p in datadir.glob("*.npy")]
+        return [(match[1].replace('_', '/'), match[2]) for match in _tmp
+                if match and len(match.groups()) > 1]
+
+    @classmethod
+    def ohlcv_get_pairs(cls, datadir: Path, timeframe: str) -> List[str]:
+        """
+        Returns a list of all pairs with ohlcv data available in this datadir
+        for the specified timeframe
+        :param datadir: Directory to search for ohlcv files
+        :param timeframe: Timeframe to search pairs for
+        :return: List of Pairs
+        """
+
+        _tmp = [re.search(r'^(\S+)(?=\-' + timeframe + '.npy)', p.name)
+                for p in datadir.glob(f"*{timeframe}.npy")]
+        # Check if regex found something and only return these results
+        return [match[0].replace('_', '/') for match in _tmp if match]
+
+    def ohlcv_store(self, pair: str, timeframe: str, data: DataFrame) -> None:
+        """
+        Store data in npy format.
+        :param pair: Pair - used to generate filename
+        :timeframe: Timeframe - used to generate filename
+        :data: Dataframe containing OHLCV data
+        :return: None
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        np.save(filename, self._ohlcv_columns(data), allow_pickle=False)
+
+    def _ohlcv_columns(self, data: DataFrame) -> np.ndarray:
+        columns = np.empty((len(self._columns), len(data)), dtype='float64')
+        columns[0] = data['date'].values.astype('int64') // 10 ** 6
+        for i, col in enumerate(self._columns[1:], start=1):
+            columns[i] = data[col].to_numpy(dtype='float64')
+        return columns
+
+    def _ohlcv_load(self, pair: str, timeframe: str,
+                    timerange: Optional[TimeRange] = None) -> DataFrame:
+        """
+        Internal method used to load data for one pair from disk.
+        Implements the loading and conversion to a Pandas dataframe.
+        Timerange trimming and dataframe validation happens outside of this method.
+        :param pair: Pair to load data
+        :param timeframe: Timeframe (e.g. "5m")
+        :param timerange: Limit data to be loaded to this timerange.
+                        Optionally implemented by subclasses to avoid loading
+                        all data where possible.
+        :return: DataFrame with ohlcv data, or empty DataFrame
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        if not filename.exists():
+            return DataFrame(columns=self._columns)
+
+        columns = np.load(filename, mmap_mode='r', allow_pickle=False)
+        if columns.ndim != 2 or columns.shape[0] != len(self._columns):
+            raise ValueError("Wrong dataframe format")
+
+        start, stop = 0, columns.shape[1]
+        if timerange:
+            # Dates are sorted - so the timerange is found using binary search
+            if timerange.starttype == 'date':
+                start = int(np.searchsorted(columns[0], timerange.startts * 1000, side='left'))
+            if timerange.stoptype == 'date':
+                stop = int(np.searchsorted(columns[0], timerange.stopts * 1000, side='right'))
+        columns = columns[:, start:stop]
+
+        # One block for all price columns, copied from the memory-mapped file
+        pairdata = DataFrame(columns[1:].T, columns=self._columns[1:], copy=True)
+        pairdata.insert(0, 'date', to_datetime(columns[0].astype('int64'), unit='ms', utc=True))
+        return pairdata
+
+    def ohlcv_purge(self, pair: str, timeframe: str) -> bool:
+        """
+        Remove data for this pair
+        :param pair: Delete data for this pair.
+        :param timeframe: Timeframe (e.g. "5m")
+        :return: True when deleted, false if file did not exist.
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        if filename.exists():
+            filename.unlink()
+            return True
+        return False
+
+    def ohlcv_append(self, pair: str, timeframe: str, data: DataFrame) -> None:
+        """
+        Append data to existing data structures.
+        Candles up to the last stored candle are skipped. As every column is stored
+        contiguously, the file is rewritten with the new candles added to each column.
+        :param pair: Pair
+        :param timeframe: Timeframe this ohlcv data is for
+        :param data: Data to append.
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        if not filename.exists():
+            self.ohlcv_store(pair, timeframe, data)
+            return
+        columns = np.load(filename, mmap_mode='r', allow_pickle=False)
+        if columns.ndim != 2 or columns.shape[0] != len(self._columns):
+            raise ValueError("Wrong dataframe format")
+        if columns.shape[1]:
+            last_date = to_datetime(int(columns[0, -1]), unit='ms', utc=True)
+            data = data.loc[data['date'] > last_date]
+        if data.empty:
+            return
+        columns = np.concatenate([columns, self._ohlcv_columns(data)], axis=1)
+        np.save(filename, columns, allow_pickle=False)
+
+    def ohlcv_data_min_max(self, pair: str,
+                           timeframe: str) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Returns the dates of the first and the last stored candle.
+        The file is memory-mapped, so only these 2 values are read.
+        :param pair: Pair
+        :param timeframe: Timeframe (e.g. "5m")
+        :return: Tuple of (first date, last date), or None if no data is stored
+        """
+        filename = self._pair_data_filename(self._datadir, pair, timeframe)
+        if not filename.exists():
+            return None
+        columns = np.load(filename, mmap_mode='r', allow_pickle=False)
+        if columns.ndim != 2 or columns.shape[1] == 0:
+            return None
+        return (to_datetime(int(columns[0, 0]), unit='ms', utc=True),
+                to_datetime(int(columns[0, -1]), unit='ms', utc=True))
+
+    @classmethod
+    def trades_get_pairs(cls, datadir: Path) -> List[str]:
+        """
+        Returns a list of all pairs for which trade data is available in this
+        :param datadir: Directory to search for ohlcv files
+        :return: List of Pairs
+        """
+        _tmp = [re.search(r'^(\S+)(?=\-trades.npy)', p.name)
+                for p in datadir.glob("*trades.npy")]
+        # Check if regex found something and only return these results to avoid exceptions.
+        return [match[0].replace('_', '/') for match in _tmp if match]
+
+    def trades_store(self, pair: str, data: TradeList) -> None:
+        """
+        Store trades data (list of Dicts) to file
+        :param pair: Pair - used for filename
+        :param data: List of Lists containing trade data,
+                     column sequence as in DEFAULT_TRADES_COLUMNS
+        """
+        dictionary: Dict[str, List] = {'id': [], 'type': [], 'side': []}
+        trades = self._trades_encode(data, dictionary)
+        misc.file_dump_json(self._pair_trades_dictionary_filename(self._datadir, pair),
+                            dictionary, log=False)
+        with self._pair_trades_filename(self._datadir, pair).open('wb') as fp:
+            fp.write(self._trades_header(len(trades)))
+            fp.write(trades.tobytes())
+
+    def trades_append(self, pair: str, data: TradeList):
+        """
+        Append data to existing files.
+        New trades are written to the end of the file, followed by updating the header.
+        :param pair: Pair - used for filename
+        :param data: List of Lists containing trade data,
+                     column sequence as in DEFAULT_TRADES_COLUMNS
+        """
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.exists():
+            self.trades_store(pair, data)
+            return
+        dictionary = self._trades_dictionary_load(pair)
+        sizes = [len(values) for values in dictionary.values()]
+        trades = self._trades_encode(data, dictionary)
+        if sizes != [len(values) for values in dictionary.values()]:
+            misc.file_dump_json(self._pair_trades_dictionary_filename(self._datadir, pair),
+                                dictionary, log=False)
+
+        with filename.open('r+b') as fp:
+            shape, dtype = None, None
+            if np.lib.format.read_magic(fp) == (1, 0):
+                shape, _, dtype = np.lib.format.read_array_header_1_0(fp)
+            if (shape and fp.tell() == self._trades_header_len
+                    and dtype == self._trades_dtype):
+                rows = shape[0]
+                # Overwrites data left behind by an interrupted append
+                fp.seek(self._trades_header_len + rows * self._trades_dtype.itemsize)
+                fp.write(trades.tobytes())
+                fp.truncate()
+                fp.seek(0)
+                fp.write(self._trades_header(rows + len(trades)))
+                return
+        # File not written by trades_store() - rewrite it
+        self.trades_store(pair, self._trades_load(pair) + data)
+
+    def _trades_load(self, pair: str, timerange: Optional[TimeRange] = None) -> TradeList:
+        """
+        Load a pair from file.
+        :param pair: Load trades for this pair
+        :param timerange: Timerange to load trades for
+        :return: List of trades
+        """
+        trades = self.trades_load_array(pair, timerange=timerange)
+        if len(trades) == 0:
+            return []
+        return self._trades_decode(trades, self._trades_dictionary_load(pair))
+
+    def _trades_load_chunks(self, pair: str, chunk_size: int,
+                            timerange: Optional[TimeRange] = None) -> Iterator[TradeList]:
+        """
+        Load trades in chunks of chunk_size trades, oldest first.
+        Only the trades of one chunk are read from the memory-mapped file at a time.
+        :param pair: Load trades for this pair
+        :param chunk_size: Number of trades per chunk
+        :param timerange: Timerange to load trades for
+        :return: Iterator of trade lists
+        """
+        trades = self.trades_load_array(pair, timerange=timerange)
+        if len(trades) == 0:
+            return
+        dictionary = self._trades_dictionary_load(pair)
+        for start in range(0, len(trades), chunk_size):
+            yield self._trades_decode(trades[start:start + chunk_size], dictionary)
+
+    def trades_load_array(self, pair: str, timerange: Optional[TimeRange] = None) -> np.ndarray:
+        """
+        Load trades as structured array (without copying them from the memory-mapped file).
+        Columns id, type and side contain codes - all other columns can be used directly,
+        e.g. with trades_to_ohlcv().
+        :param pair: Load trades for this pair
+        :param timerange: Timerange to load trades for
+        :return: Structured array with the dtype `_trades_dtype`
+        """
+        filename = self._pair_trades_filename(self._datadir, pair)
+        if not filename.exists():
+            return np.empty(0, dtype=self._trades_dtype)
+
+        trades = np.load(filename, mmap_mode='r', allow_pickle=False)
+        if trades.dtype != self._trades_dtype:
+            raise ValueError("Wrong trades format")
+
+        start, stop = 0, len(trades)
+        if timerange:
+            # Timestamps are sorted - so the timerange is found using binary search
+            if timerange.starttype == 'date':
+                start = int(np.searchsorted(trades['timestamp'], timerange.startts * 1000,
+                                            side='left'))
+            if timerange.stoptype == 'date':
+                stop = int(np.searchsorted(trades['timestamp'], timerange.stopts * 1000,
+                                           side='left'))
+        return trades[start:stop]
+
+    def trades_purge(self, pair: str) -> bool:
+        """
+        Remove data for this pair
+        :param pair: Delete data for this pair.
+        :return: True when deleted, false if file did not exist.
+        """
+        filename = self._pair_trades_filename(self._datadir, pair)
+        dictionary_file = self._pair_trades_dictionary_filename(self._datadir, pair)
+        if dictionary_file.exists():
+            dictionary_file.unlink()
+        if filename.exists():
+            filename.unlink()
+            return True
+        return False
+
+    @classmethod
+    def _trades_header(cls, rows: int) -> bytes:
+        """
+        npy header (format version 1.0) for an array of `rows` trades.
+        The header is padded to a fixed length, so it can be updated in place when appending.
+        """
+        header = repr({'descr': np.lib.format.dtype_to_descr(cls._trades_dtype),
+                       'fortran_order': False, 'shape': (rows, )})
+        header = header.ljust(cls._trades_header_len - 11) + '\n'
+        return np.lib.format.magic(1, 0) + struct.pack('<H', len(header)) + header.encode('latin1')
+
+    def _trades_dictionary_load(self, pair: str) -> Dict[str, List]:
+        dictionary = misc.file_load_json(
+            self._pair_trades_dictionary_filename(self._datadir, pair))
+        if dictionary is None:
+            raise ValueError(f"Dictionary of trades for {pair} is missing.")
+        return dictionary
+
+    def _trades_encode(self, data: TradeList, dictionary: Dict[str, List]) -> np.ndarray:
+        """
+        Convert trades to a structured array, adding new values to the dictionary.
+        """
+        trades = np.empty(len(data), dtype=self._trades_dtype)
+        if not data:
+            return trades
+        codes = {col: {value: code for code, value in enumerate(values)}
+                 for col, values in dictionary.items()}
+
+        def encode(col: str, value: Any) -> int:
+            code = codes[col].get(value)
+            if code is None:
+                code = codes[col][value] = len(dictionary[col])
+                dictionary[col].append(value)
+            return code
+
+        def encode_id(value: Any) -> int:
+            # Integer ids are stored as they are, other ids as negative dictionary code
+            if (isinstance(value, str) and value.isascii() and value.isdigit()
+                    and len(value) < 19 and (value[0] != '0' or value == '0')):
+                return int(value)
+            return -1 - encode('id', value)
+
+        # TradesList columns are defined in constants.DEFAULT_TRADES_COLUMNS
+        timestamps, ids, types, sides, prices, amounts, costs = zip(*data)
+        trades['timestamp'] = timestamps
+        trades['id'] = [encode_id(value) for value in ids]
+        trades['type'] = [encode('type', value) for value in types]
+        trades['side'] = [encode('side', value) for value in sides]
+        trades['price'] = prices
+        trades['amount'] = amounts
+        trades['cost'] = costs
+        return trades
+
+    @staticmethod
+    def _trades_decode(trades: np.ndarray, dictionary: Dict[str, List]) -> TradeList:
+        """
+        Convert a structured array of trades back to a list of trades
+        """
+        ids = trades['id'].astype(str).astype(object)
+        id_codes = np.asarray(trades['id'])
+        dictionary_ids = id_codes < 0
+        ids[dictionary_ids] = np.array(dictionary['id'] or [None],
+                                       dtype=object)[-1 - id_codes[dictionary_ids]]
+        types = np.array(dictionary['type'] or [None], dtype=object)[trades['type']]
+        sides = np.array(dictionary['side'] or [None], dtype=object)[trades['side']]
+        return [list(trade) for trade in zip(
+            trades['timestamp'].tolist(), ids.tolist(), types.tolist(), sides.tolist(),
+            trades['price'].tolist(), trades['amount'].tolist(), trades['cost'].tolist())]
+
+    @classmethod
+    def _pair_data_filename(cls, datadir: Path, pair: str, timeframe: str) -> Path:
+        pair_s = misc.pair_to_filename(pair)
+        filename = datadir.joinpath(f'{pair_s}-{timeframe}.npy')
+        return filename
+
+    @classmethod
+    def _pair_trades_filename(cls, datadir: Path, pair: str) -> Path:
+        pair_s = misc.pair_to_filename(pair)
+        filename = datadir.joinpath(f'{pair_s}-trades.npy')
+        return filename
+
+    @classmethod
+    def _pair_trades_dictionary_filename(cls, datadir: Path, pair: str) -> Path:
+        pair_s = misc.pair_to_filename(pair)
+        filename = datadir.joinpath(f'{pair_s}-trades.dict.json')
+        return filename
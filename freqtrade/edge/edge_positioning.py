@@ -141,6 +141,7 @@ class Edge:
             timerange=self._timerange,
             startup_candles=self.strategy.startup_candle_count,
             data_format=self.config.get('dataformat_ohlcv', 'json'),
+            workers=self.config.get('dataload_workers', 1),
         )
 
         if not data:
@@ -9,7 +9,7 @@ import logging
 from copy import deepcopy
 from datetime import datetime, timezone
 from math import ceil
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import arrow
 import ccxt
@@ -17,16 +17,17 @@ import ccxt.async_support as ccxt_async
 from cachetools import TTLCache
 from ccxt.base.decimal_to_precision import (ROUND_DOWN, ROUND_UP, TICK_SIZE, TRUNCATE,
                                             decimal_to_precision)
-from pandas import DataFrame
+from pandas import DataFrame, concat
 
 from freqtrade.constants import DEFAULT_AMOUNT_RESERVE_PERCENT, ListPairsWithTimeframes
-from freqtrade.data.converter import ohlcv_to_dataframe, trades_dict_to_list
+from freqtrade.data.converter import clean_ohlcv_dataframe, ohlcv_to_dataframe, trades_dict_to_list
 from freqtrade.exceptions import (DDosProtection, ExchangeError, InsufficientFundsError,
                                   InvalidOrderException, OperationalException, RetryableOrderError,
                                   TemporaryError)
 from freqtrade.exchange.common import (API_FETCH_ORDER_RETRY_COUNT, BAD_EXCHANGES,
                                        EXCHANGE_HAS_OPTIONAL, EXCHANGE_HAS_REQUIRED, retrier,
                                        retrier_async)
+from freqtrade.exchange.rate_limiter import TokenBucket
 from freqtrade.misc import deep_merge_dicts, safe_value_fallback2
 from freqtrade.plugins.pairlist.pairlist_helpers import expand_pairlist
 
@@ -66,6 +67,7 @@ class Exchange:
         "trades_pagination_arg": "since",
         "l2_limit_range": None,
         "l2_limit_range_required": True,  # Allow Empty L2 limit (kucoin)
+        "ohlcv_refresh_overlap": 3,  # Candles fetched again when refreshing cached candles
     }
     _ft_has: Dict = {}
 
@@ -95,6 +97,9 @@ class Exchange:
         # Holds all open sell orders for dry_run
         self._dry_run_open_orders: Dict[str, Any] = {}
 
+        # Shared by concurrent history downloads (see set_rate_limiter())
+        self._rate_limiter: Optional[TokenBucket] = None
+
         if config['dry_run']:
             logger.info('Instance is running with dry_run enabled')
         logger.info(f"Using CCXT {ccxt.__version__}")
@@ -286,6 +291,18 @@ class Exchange:
                 symbol_parts[1] == market.get('quote')
                 )
 
+    def set_rate_limiter(self, rate_limiter: Optional[TokenBucket]) -> None:
+        """
+        Limit history requests (candles and trades) with a rate limiter shared by all
+        concurrent downloads. Use None to remove the rate limiter.
+        """
+        self._rate_limiter = rate_limiter
+
+    @property
+    def rate_limit(self) -> float:
+        """Minimum delay between two requests in milliseconds (ccxt `rateLimit`)"""
+        return self._api_async.rateLimit
+
     def klines(self, pair_interval: Tuple[str, str], copy: bool = True) -> DataFrame:
         if pair_interval in self._klines:
             return self._klines[pair_interval].copy() if copy else self._klines[pair_interval]
@@ -806,13 +823,19 @@ class Exchange:
         logger.debug("Refreshing candle (OHLCV) data for %d pairs", len(pair_list))
 
         input_coroutines = []
+        incremental = set()
 
         # Gather coroutines to run
         for pair, timeframe in set(pair_list):
             if (((pair, timeframe) not in self._klines)
                     or self._now_is_time_to_refresh(pair, timeframe)):
-                input_coroutines.append(self._async_get_candle_history(pair, timeframe,
-                                                                       since_ms=since_ms))
+                call_since_ms, limit = since_ms, None
+                if cache and since_ms is None:
+                    call_since_ms, limit = self._get_incremental_refresh(pair, timeframe)
+                    if call_since_ms is not None:
+                        incremental.add((pair, timeframe))
+                input_coroutines.append(self._async_get_candle_history(
+                    pair, timeframe, since_ms=call_since_ms, limit=limit))
             else:
                 logger.debug(
                     "Using cached candle (OHLCV) data for pair %s, timeframe %s ...",
@@ -837,11 +860,48 @@ class Exchange:
             ohlcv_df = ohlcv_to_dataframe(
                     ticks, timeframe, pair=pair, fill_missing=True,
                     drop_incomplete=self._ohlcv_partial_candle)
+            if (pair, timeframe) in incremental:
+                ohlcv_df = self._merge_cached_ohlcv(pair, timeframe, ohlcv_df)
             results_df[(pair, timeframe)] = ohlcv_df
             if cache:
                 self._klines[(pair, timeframe)] = ohlcv_df
         return results_df
 
+    def _get_incremental_refresh(self, pair: str, timeframe: str
+                                 ) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Determine since / limit to only fetch candles after the last cached candle
+        (plus a few overlapping candles, which may have changed since the last refresh).
+        :return: Tuple of (since_ms, limit), or (None, None) if all candles need to be fetched
+        """
+        cached = self._klines.get((pair, timeframe))
+        if cached is None or cached.empty:
+            return None, None
+        timeframe_ms = timeframe_to_msecs(timeframe)
+        since_ms = (int(cached['date'].iloc[-1].timestamp()) * 1000
+                    - self._ft_has['ohlcv_refresh_overlap'] * timeframe_ms)
+        # Candles since since_ms, including the current (incomplete) candle
+        limit = (arrow.utcnow().int_timestamp * 1000 - since_ms) // timeframe_ms + 1
+        if limit >= self.ohlcv_candle_limit(timeframe):
+            # Gap is too large for one call
+            return None, None
+        return since_ms, limit
+
+    def _merge_cached_ohlcv(self, pair: str, timeframe: str, ohlcv_df: DataFrame) -> DataFrame:
+        """
+        Merge freshly fetched candles into the cached candles.
+        Fetched candles replace cached candles with the same date, and the result is limited
+        to ohlcv_candle_limit() candles.
+        """
+        cached = self._klines[(pair, timeframe)]
+        if ohlcv_df.empty:
+            return cached
+        merged = concat([cached[cached['date'] < ohlcv_df['date'].iloc[0]], ohlcv_df],
+                        ignore_index=True)
+        merged = clean_ohlcv_dataframe(merged, timeframe, pair,
+                                       fill_missing=True, drop_incomplete=False)
+        return merged.tail(self.ohlcv_candle_limit(timeframe)).reset_index(drop=True)
+
     def _now_is_time_to_refresh(self, pair: str, timeframe: str) -> bool:
         # Timeframe in seconds
         interval_in_sec = timeframe_to_seconds(timeframe)
@@ -851,9 +911,11 @@ class Exchange:
 
     @retrier_async
     async def _async_get_candle_history(self, pair: str, timeframe: str,
-                                        since_ms: Optional[int] = None) -> Tuple[str, str, List]:
+                                        since_ms: Optional[int] = None,
+                                        limit: Optional[int] = None) -> Tuple[str, str, List]:
         """
         Asynchronously get candle history data using fetch_ohlcv
+        :param limit: Number of candles to fetch, defaults to ohlcv_candle_limit()
         returns tuple: (pair, timeframe, ohlcv_list)
         """
         try:
@@ -864,9 +926,12 @@ class Exchange:
                 pair, timeframe, since_ms, s
             )
             params = self._ft_has.get('ohlcv_params', {})
+            limit = limit or self.ohlcv_candle_limit(timeframe)
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
             data = await self._api_async.fetch_ohlcv(pair, timeframe=timeframe,
                                                      since=since_ms,
-                                                     limit=self.ohlcv_candle_limit(timeframe),
+                                                     limit=limit,
                                                      params=params)
 
             # Some exchanges sort OHLCV in ASC order and others in DESC.
@@ -908,6 +973,8 @@ class Exchange:
         returns: List of dicts containing trades
         """
         try:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
             # fetch trades asynchronously
             if params:
                 logger.debug("Fetching trades for pair %s, params: %s ", pair, params)
@@ -932,22 +999,20 @@ class Exchange:
         except ccxt.BaseError as e:
             raise OperationalException(f'Could not fetch trade data. Msg: {e}') from e
 
-    async def _async_get_trade_history_id(self, pair: str,
-                                          until: int,
-                                          since: Optional[int] = None,
-                                          from_id: Optional[str] = None) -> Tuple[str, List[List]]:
+    async def _async_iter_trade_history_id(self, pair: str,
+                                           until: int,
+                                           since: Optional[int] = None,
+                                           from_id: Optional[str] = None
+                                           ) -> AsyncIterator[List[List]]:
         """
-        Asyncronously gets trade history using fetch_trades
+        Asyncronously gets trade history using fetch_trades, yielding one page at a time.
         use this when exchange uses id-based iteration (check `self._trades_pagination`)
         :param pair: Pair to fetch trade data for
         :param since: Since as integer timestamp in milliseconds
         :param until: Until as integer timestamp in milliseconds
         :param from_id: Download data starting with ID (if id is known). Ignores "since" if set.
-        returns tuple: (pair, trades-list)
+        returns: Async iterator of trades-lists
         """
-
-        trades: List[List] = []
-
         if not from_id:
             # Fetch first elements using timebased method to get an ID to paginate on
             # Depending on the Exchange, this can introduce a drift at the start of the interval
@@ -958,45 +1023,62 @@ class Exchange:
             # DEFAULT_TRADES_COLUMNS: 0 -> timestamp
             # DEFAULT_TRADES_COLUMNS: 1 -> id
             from_id = t[-1][1]
-            trades.extend(t[:-1])
+            yield t[:-1]
         while True:
             t = await self._async_fetch_trades(pair,
                                                params={self._trades_pagination_arg: from_id})
             if t:
-                # Skip last id since its the key for the next call
-                trades.extend(t[:-1])
                 if from_id == t[-1][1] or t[-1][0] > until:
                     logger.debug(f"Stopping because from_id did not change. "
                                  f"Reached {t[-1][0]} > {until}")
                     # Reached the end of the defined-download period - add last trade as well.
-                    trades.extend(t[-1:])
+                    yield t
                     break
+                # Skip last id since its the key for the next call
+                yield t[:-1]
 
                 from_id = t[-1][1]
             else:
                 break
 
-        return (pair, trades)
-
-    async def _async_get_trade_history_time(self, pair: str, until: int,
-                                            since: Optional[int] = None) -> Tuple[str, List[List]]:
+    async def _async_get_trade_history_id(self, pair: str,
+                                          until: int,
+                                          since: Optional[int] = None,
+                                          from_id: Optional[str] = None) -> Tuple[str, List[List]]:
         """
-        Asyncronously gets trade history using fetch_trades,
-        when the exchange uses time-based iteration (check `self._trades_pagination`)
+        Asyncronously gets trade history using fetch_trades
+        use this when exchange uses id-based iteration (check `self._trades_pagination`)
         :param pair: Pair to fetch trade data for
         :param since: Since as integer timestamp in milliseconds
         :param until: Until as integer timestamp in milliseconds
+        :param from_id: Download data starting with ID (if id is known). Ignores "since" if set.
         returns tuple: (pair, trades-list)
         """
 
         trades: List[List] = []
+        async for t in self._async_iter_trade_history_id(pair, until=until, since=since,
+                                                         from_id=from_id):
+            trades.extend(t)
+        return (pair, trades)
+
+    async def _async_iter_trade_history_time(self, pair: str, until: int,
+                                             since: Optional[int] = None
+                                             ) -> AsyncIterator[List[List]]:
+        """
+        Asyncronously gets trade history using fetch_trades, yielding one page at a time,
+        when the exchange uses time-based iteration (check `self._trades_pagination`)
+        :param pair: Pair to fetch trade data for
+        :param since: Since as integer timestamp in milliseconds
+        :param until: Until as integer timestamp in milliseconds
+        returns: Async iterator of trades-lists
+        """
         # DEFAULT_TRADES_COLUMNS: 0 -> timestamp
         # DEFAULT_TRADES_COLUMNS: 1 -> id
         while True:
             t = await self._async_fetch_trades(pair, since=since)
             if t:
                 since = t[-1][0]
-                trades.extend(t)
+                yield t
                 # Reached the end of the defined-download period
                 if until and t[-1][0] > until:
                     logger.debug(
@@ -1005,8 +1087,46 @@ class Exchange:
             else:
                 break
 
+    async def _async_get_trade_history_time(self, pair: str, until: int,
+                                            since: Optional[int] = None) -> Tuple[str, List[List]]:
+        """
+        Asyncronously gets trade history using fetch_trades,
+        when the exchange uses time-based iteration (check `self._trades_pagination`)
+        :param pair: Pair to fetch trade data for
+        :param since: Since as integer timestamp in milliseconds
+        :param until: Until as integer timestamp in milliseconds
+        returns tuple: (pair, trades-list)
+        """
+
+        trades: List[List] = []
+        async for t in self._async_iter_trade_history_time(pair, until=until, since=since):
+            trades.extend(t)
         return (pair, trades)
 
+    def _async_iter_trade_history(self, pair: str,
+                                  since: Optional[int] = None,
+                                  until: Optional[int] = None,
+                                  from_id: Optional[str] = None) -> AsyncIterator[List[List]]:
+        """
+        Download trades page by page, using either time or id based methods.
+        Used to store large trade histories without keeping all trades in memory.
+        :return: Async iterator of trades-lists
+        """
+        if not self.exchange_has("fetchTrades"):
+            raise OperationalException("This exchange does not suport downloading Trades.")
+
+        if until is None:
+            until = ccxt.Exchange.milliseconds()
+
+        if self._trades_pagination == 'time':
+            return self._async_iter_trade_history_time(pair=pair, since=since, until=until)
+        elif self._trades_pagination == 'id':
+            return self._async_iter_trade_history_id(pair=pair, since=since, until=until,
+                                                     from_id=from_id)
+        else:
+            raise OperationalException(f"Exchange {self.name} does use neither time, "
+                                       f"nor id based pagination")
+
     async def _async_get_trade_history(self, pair: str,
                                        since: Optional[int] = None,
                                        until: Optional[int] = None,
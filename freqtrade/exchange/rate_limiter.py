@@ -0,0 +1,55 @@
+"""
+Token bucket rate limiter for concurrent exchange requests
+"""
+import asyncio
+import logging
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by all concurrent requests on one event loop.
+    The bucket is refilled with `rate` tokens per second, up to `capacity` tokens.
+    Every request takes one token - and waits for the next token if the bucket is empty.
+    Waiting requests are served in the sequence they arrived.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1) -> None:
+        """
+        :param rate: Requests per second
+        :param capacity: Maximum number of requests sent without delay (burst)
+        """
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._last: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_rate_limit(cls, rate_limit: float, capacity: float = 1) -> 'TokenBucket':
+        """
+        Create a bucket from a ccxt `rateLimit` (milliseconds between two requests)
+        """
+        return cls(rate=1000 / max(rate_limit, 1), capacity=capacity)
+
+    def _refill(self, now: float) -> None:
+        if self._last is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self) -> None:
+        """
+        Wait until a request may be sent.
+        """
+        async with self._lock:
+            loop = asyncio.get_event_loop()
+            self._refill(loop.time())
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                logger.debug(f"Rate limit reached, waiting {delay:.3f}s.")
+                await asyncio.sleep(delay)
+                self._refill(loop.time())
+            self._tokens -= 1
@@ -2,7 +2,7 @@ import logging
 import sys
 from logging import Formatter
 from logging.handlers import BufferingHandler, RotatingFileHandler, SysLogHandler
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from freqtrade.exceptions import OperationalException
 
@@ -14,6 +14,9 @@ LOGFORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 bufferHandler = BufferingHandler(1000)
 bufferHandler.setFormatter(Formatter(LOGFORMAT))
 
+# Keeps log records of a worker process
+_worker_log_handler: Optional[BufferingHandler] = None
+
 
 def _set_loggers(verbosity: int = 0, api_verbosity: str = 'info') -> None:
     """
@@ -116,3 +119,39 @@ def setup_logging(config: Dict[str, Any]) -> None:
     _set_loggers(verbosity, config.get('api_server', {}).get('verbosity', 'info'))
 
     logger.info('Verbosity set to %s', verbosity)
+
+
+def setup_worker_logging(log_level: int) -> None:
+    """
+    Initialize logging of a worker process (e.g. of a ProcessPoolExecutor).
+    Log records are not emitted by the worker, but kept until they are collected
+    by get_worker_log_records() - to be returned to the main process with the results.
+    """
+    global _worker_log_handler
+    _worker_log_handler = BufferingHandler(sys.maxsize)
+    logging.root.handlers = [_worker_log_handler]
+    logging.root.setLevel(log_level)
+
+
+def get_worker_log_records() -> List[logging.LogRecord]:
+    """
+    Returns (and clears) the log records of this worker process, in a picklable form.
+    """
+    assert _worker_log_handler is not None
+    records, _worker_log_handler.buffer = _worker_log_handler.buffer, []
+    for record in records:
+        # Arguments and exceptions may not be picklable
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+    return records
+
+
+def emit_log_records(records: List[logging.LogRecord]) -> None:
+    """
+    Emit log records of a worker process in the main process.
+    """
+    for record in records:
+        logging.getLogger(record.name).handle(record)
@@ -0,0 +1,165 @@
+"""
+Exit evaluation for backtesting.
+
+BacktestExitEvaluator implements the sell logic of IStrategy.should_sell() for backtesting.
+It is called for every open trade on every candle, so it avoids per-call work:
+config flags are resolved once per backtest, trade durations are calculated from integer
+epoch timestamps, candle dates are only converted to datetime for strategy callbacks,
+and results without custom sell reason are shared instances.
+"""
+import logging
+from typing import Callable, Optional
+
+from pandas import DataFrame, Timestamp
+
+from freqtrade.optimize.backtest_vectorized import get_exit_parameters
+from freqtrade.persistence import LocalTrade
+from freqtrade.strategy.interface import (CUSTOM_SELL_MAX_LENGTH, SELL_CHECK_RESULTS, IStrategy,
+                                          SellCheckTuple, SellType)
+from freqtrade.strategy.strategy_wrapper import strategy_safe_wrapper
+
+
+logger = logging.getLogger(__name__)
+
+# Methods which define the sell logic. Strategies overriding one of these use should_sell().
+SELL_LOGIC_METHODS = ('should_sell', 'stop_loss_reached', 'min_roi_reached',
+                      'min_roi_reached_entry')
+
+
+def uses_default_sell_logic(strategy: IStrategy) -> bool:
+    """
+    True if the strategy doesn't override the sell logic of IStrategy.
+    custom_sell() and custom_stoploss() are supported by the evaluator.
+    """
+    return all(getattr(type(strategy), method) is getattr(IStrategy, method)
+               for method in SELL_LOGIC_METHODS)
+
+
+class BacktestExitEvaluator:
+    """
+    Backtest variant of IStrategy.should_sell().
+    Must be created for every backtest, as hyperopt modifies the strategy attributes.
+    """
+
+    def __init__(self, strategy: IStrategy) -> None:
+        self.strategy = strategy
+        self.params = get_exit_parameters(strategy)
+        # Stoploss on exchange is disabled by backtesting - resolved like stop_loss_reached()
+        self.stoploss_active = bool(not strategy.order_types.get('stoploss_on_exchange')
+                                    or strategy.config['dry_run'])
+
+        self.custom_stoploss: Optional[Callable] = None
+        if strategy.use_custom_stoploss:
+            self.custom_stoploss = strategy_safe_wrapper(strategy.custom_stoploss,
+                                                         default_retval=None)
+        # The default custom_sell() never sells - so it's not called at all.
+        self.custom_sell: Optional[Callable] = None
+        if getattr(strategy.custom_sell, '__func__', None) is not IStrategy.custom_sell:
+            self.custom_sell = strategy_safe_wrapper(strategy.custom_sell, default_retval=False)
+
+    def _trade_duration(self, trade: LocalTrade, date: Timestamp) -> int:
+        """
+        Trade duration in minutes, as calculated by min_roi_reached()
+        """
+        open_ts = int(trade.open_date_utc.timestamp())
+        return (date.value // 10 ** 9 - open_ts) // 60
+
+    def _adjust_stop_loss(self, trade: LocalTrade, current_price: float, stoploss: float) -> None:
+        """
+        Call trade.adjust_stop_loss() only if the stoploss moves up.
+        In all other cases, adjust_stop_loss() doesn't modify the trade.
+        """
+        if float(current_price * (1 - abs(stoploss))) > trade.stop_loss:
+            trade.adjust_stop_loss(current_price, stoploss)
+
+    def _stop_loss_reached(self, dataframe: DataFrame, trade: LocalTrade, date: Timestamp,
+                           current_rate: float, high: Optional[float],
+                           high_profit: float) -> SellType:
+        """
+        Stoploss handling of IStrategy.stop_loss_reached().
+        The profit at current_rate is only calculated if it's used.
+        :param high_profit: Profit at `high or rate`
+        :return: SellType.STOP_LOSS, SellType.TRAILING_STOP_LOSS or SellType.NONE
+        """
+        params = self.params
+        stop_loss_value = params.stoploss
+        if not trade.stop_loss:
+            trade.adjust_stop_loss(trade.open_rate, stop_loss_value, initial=True)
+
+        current_profit = None
+        if self.custom_stoploss:
+            current_profit = trade.calc_profit_ratio(current_rate)
+            stop_loss_value = self.custom_stoploss(
+                pair=trade.pair, trade=trade, current_time=date.to_pydatetime(),
+                current_rate=current_rate, current_profit=current_profit, dataframe=dataframe)
+            if stop_loss_value:
+                self._adjust_stop_loss(trade, current_rate, stop_loss_value)
+            else:
+                logger.warning("CustomStoploss function did not return valid stoploss")
+
+        if params.trailing_stop:
+            sl_offset = params.trailing_stop_positive_offset
+            if not high:
+                high_profit = (current_profit if current_profit is not None
+                               else trade.calc_profit_ratio(current_rate))
+            if not (params.trailing_only_offset_is_reached and high_profit < sl_offset):
+                if params.trailing_stop_positive is not None and high_profit > sl_offset:
+                    stop_loss_value = params.trailing_stop_positive
+                self._adjust_stop_loss(trade, high or current_rate, stop_loss_value)
+
+        if self.stoploss_active and trade.stop_loss >= current_rate:
+            if trade.initial_stop_loss != trade.stop_loss:
+                return SellType.TRAILING_STOP_LOSS
+            return SellType.STOP_LOSS
+        return SellType.NONE
+
+    def should_sell(self, dataframe: DataFrame, trade: LocalTrade, date: Timestamp, rate: float,
+                    buy: bool, sell: bool, low: Optional[float] = None,
+                    high: Optional[float] = None) -> SellCheckTuple:
+        """
+        Same result as strategy.should_sell(), with the candle date as Timestamp.
+        """
+        params = self.params
+        # Profit at the high rate - the profit at the low rate is only required by callbacks
+        current_rate = high or rate
+        current_profit = trade.calc_profit_ratio(current_rate)
+        trade.adjust_min_max_rates(high or low or rate)
+
+        # Set current rate to low for backtesting stoploss
+        stoploss_type = self._stop_loss_reached(dataframe, trade, date, low or rate, high,
+                                                current_profit)
+
+        roi_reached = False
+        if not (buy and params.ignore_roi_if_buy_signal):
+            _, roi = self.strategy.min_roi_reached_entry(self._trade_duration(trade, date))
+            roi_reached = roi is not None and current_profit > roi
+
+        sell_signal = SellType.NONE
+        custom_reason = None
+        if (not (params.sell_profit_only and current_profit <= params.sell_profit_offset)
+                and params.use_sell_signal and not buy):
+            if sell:
+                sell_signal = SellType.SELL_SIGNAL
+            elif self.custom_sell:
+                custom_reason = self.custom_sell(
+                    pair=trade.pair, trade=trade, current_time=date.to_pydatetime(),
+                    current_rate=current_rate, current_profit=current_profit,
+                    dataframe=dataframe)
+                if custom_reason:
+                    sell_signal = SellType.CUSTOM_SELL
+                    if not isinstance(custom_reason, str):
+                        custom_reason = None
+                    elif len(custom_reason) > CUSTOM_SELL_MAX_LENGTH:
+                        logger.warning(f'Custom sell reason returned from custom_sell is too '
+                                       f'long and was trimmed to {CUSTOM_SELL_MAX_LENGTH} '
+                                       f'characters.')
+                        custom_reason = custom_reason[:CUSTOM_SELL_MAX_LENGTH]
+
+        # Same sequence as should_sell(): ROI (if not stoploss), sell-signal, stoploss
+        if roi_reached and stoploss_type != SellType.STOP_LOSS:
+            return SELL_CHECK_RESULTS[SellType.ROI]
+        if custom_reason:
+            return SellCheckTuple(sell_type=sell_signal, sell_reason=custom_reason)
+        if sell_signal != SellType.NONE:
+            return SELL_CHECK_RESULTS[sell_signal]
+        return SELL_CHECK_RESULTS[stoploss_type]
@@ -0,0 +1,183 @@
+"""
+Helpers for sharded backtesting.
+
+A sharded backtest splits the timerange into contiguous windows, which are backtested
+in parallel - every window starting without open trades.
+Windows are stitched together in sequence: If the state at the start of a window doesn't
+match the parallel run (trades were left open at the end of the previous window), the window
+is continued from these trades until its open trades are identical to the parallel run.
+From that candle on, both runs are identical - so the remaining trades of the parallel run
+are used, and the result is the same as a backtest of the complete timerange.
+"""
+import logging
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Tuple
+
+from pandas import DataFrame, Timestamp
+
+from freqtrade.configuration import TimeRange
+from freqtrade.data.converter import trim_dataframe
+from freqtrade.persistence import LocalTrade
+
+
+logger = logging.getLogger(__name__)
+
+# Minimum distance of the available balance to the stake amount (in stake currency).
+# Closer entries may be decided differently by the balance of the stitched backtest.
+STAKE_TOLERANCE = 1e-8
+
+# Windows start with the startup candles before the window. Recursive indicators (EMA, RSI,
+# ADX) depend on all previous candles, so they only match the complete backtest after a long
+# warm-up - sharding requires at least this startup_candle_count.
+SHARD_MIN_STARTUP_CANDLES = 300
+
+
+class ShardWindow(NamedTuple):
+    """
+    Candles processed by the backtest loop for one window.
+    """
+    start: datetime  # First candle of the window
+    end: datetime  # Last candle of the window
+
+
+def get_shard_windows(start_date: datetime, end_date: datetime, timeframe_min: int,
+                      shards: int) -> List[ShardWindow]:
+    """
+    Split the candles of a backtest into contiguous windows of (nearly) equal length.
+    As in the backtest loop, the first candle processed is the candle after start_date.
+    :param shards: Number of windows - reduced if there are less candles
+    """
+    timeframe = timedelta(minutes=timeframe_min)
+    candles = int((end_date - start_date) / timeframe)
+    shards = max(min(shards, candles), 1)
+    return [ShardWindow(start_date + timeframe * (candles * shard // shards + 1),
+                        start_date + timeframe * (candles * (shard + 1) // shards))
+            for shard in range(shards)]
+
+
+def slice_shard_data(data: Dict[str, DataFrame], timerange: TimeRange, startup_candles: int,
+                     window: ShardWindow) -> Tuple[Dict[str, DataFrame], Dict[str, int]]:
+    """
+    Cut the candles of one window from the loaded candle data, including the startup candles
+    required for indicator warm-up, and the candle before the window (which provides the
+    signals of the first candle of the window).
+    Candles are selected the same way as trim_dataframe() trims the startup period
+    of a complete backtest.
+    :return: Candles per pair and the number of warm-up candles to trim per pair.
+        Pairs without candles in the window are not included.
+    """
+    sliced = {}
+    warmup = {}
+    for pair, df in data.items():
+        trimmed = trim_dataframe(df, timerange, startup_candles=startup_candles)
+        if len(trimmed) == 0:
+            continue
+        first = df.index.get_loc(trimmed.index[0])
+        dates = trimmed['date']
+        start = first + max(int(dates.searchsorted(Timestamp(window.start))) - 1, 0)
+        end = first + int(dates.searchsorted(Timestamp(window.end), side='right'))
+        if end - start < 2:
+            # The first candle is only used for the signals of the next candle
+            continue
+        compute_from = max(start - startup_candles, 0)
+        sliced[pair] = df.iloc[compute_from:end]
+        warmup[pair] = start - compute_from
+    return sliced, warmup
+
+
+def trade_profit(trades: List[LocalTrade], profit: float = 0.0) -> float:
+    """
+    Add the profit of closed trades - in sequence, as done by LocalTrade.close_bt_trade().
+    """
+    for trade in trades:
+        profit += trade.close_profit_abs or 0.0
+    return profit
+
+
+class ShardRun:
+    """
+    Result of a window backtested without open trades at the start of the window.
+    """
+
+    def __init__(self, trades: List[LocalTrade], open_trades: List[LocalTrade],
+                 stake_margins: List[Tuple[datetime, float]], tradable_balance_ratio: float):
+        """
+        :param trades: Closed trades, in the sequence they were closed
+        :param open_trades: Trades still open at the end of the window
+        :param stake_margins: Available balance minus stake amount, for every
+            entry attempt (in sequence)
+        """
+        self.trades = trades
+        self.open_trades = open_trades
+        self.tradable_balance_ratio = tradable_balance_ratio
+        self._trades = {(trade.pair, trade.open_date): trade for trade in trades + open_trades}
+        self._open_dates = sorted(trade.open_date for trade in self._trades.values())
+        self._close_dates: List[datetime] = [trade.close_date for trade in trades]  # type: ignore
+        self._profits = [0.0]
+        for trade in trades:
+            self._profits.append(trade_profit([trade], self._profits[-1]))
+
+        # Lowest margin of accepted / highest margin of rejected entries from every attempt on
+        self._margin_dates = [date for date, _ in stake_margins]
+        self._min_accepted = [float('inf')] * (len(stake_margins) + 1)
+        self._max_rejected = [-float('inf')] * (len(stake_margins) + 1)
+        for idx in range(len(stake_margins) - 1, -1, -1):
+            margin = stake_margins[idx][1]
+            self._min_accepted[idx] = self._min_accepted[idx + 1]
+            self._max_rejected[idx] = self._max_rejected[idx + 1]
+            if margin >= 0:
+                self._min_accepted[idx] = min(margin, self._min_accepted[idx])
+            else:
+                self._max_rejected[idx] = max(margin, self._max_rejected[idx])
+
+    def _is_open(self, trade: LocalTrade, date: datetime) -> bool:
+        return trade.open_date < date and (trade.is_open
+                                           or trade.close_date >= date)  # type: ignore
+
+    def _stakes_match(self, date: datetime, profit: float) -> bool:
+        """
+        Entries from `date` on are only identical if the wallet decides every entry the same
+        way with the balance of the stitched backtest (which differs by the realized profit).
+        """
+        idx = bisect_left(self._margin_dates, date)
+        offset = (profit - self._profits[bisect_left(self._close_dates, date)]
+                  ) * self.tradable_balance_ratio
+        return (self._min_accepted[idx] + offset >= STAKE_TOLERANCE
+                and self._max_rejected[idx] + offset <= -STAKE_TOLERANCE)
+
+    def matches(self, date: datetime, open_trades: Dict[str, List[LocalTrade]],
+                profit: float) -> bool:
+        """
+        Check if a backtest with these open trades at the start of the candle `date`
+        continues identical to this run.
+        :param profit: Realized profit of the backtest at `date`
+        """
+        open_count = (bisect_left(self._open_dates, date)
+                      - bisect_left(self._close_dates, date))
+        count = 0
+        for trades in open_trades.values():
+            for trade in trades:
+                shard_trade = self._trades.get((trade.pair, trade.open_date))
+                if shard_trade is None or not self._is_open(shard_trade, date):
+                    return False
+                count += 1
+        return count == open_count and self._stakes_match(date, profit)
+
+    def trades_from(self, date: datetime) -> List[LocalTrade]:
+        """
+        Trades closed at or after the candle `date`, in the sequence they were closed.
+        """
+        return self.trades[bisect_left(self._close_dates, date):]
+
+
+def group_open_trades(trades: List[LocalTrade],
+                      pairs: List[str]) -> Dict[str, List[LocalTrade]]:
+    """
+    Open trades per pair, with all pairs in the sequence of the backtest loop.
+    Trades of a pair stay in the sequence they were opened.
+    """
+    open_trades: Dict[str, List[LocalTrade]] = {pair: [] for pair in pairs}
+    for trade in trades:
+        open_trades.setdefault(trade.pair, []).append(trade)
+    return open_trades
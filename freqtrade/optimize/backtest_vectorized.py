@@ -0,0 +1,306 @@
+"""
+Array helpers for the vectorized backtesting engine.
+
+The vectorized engine uses these helpers to skip candles on which a trade can not exit.
+Every candle flagged as a possible exit is re-evaluated with the regular sell logic
+(IStrategy.should_sell()), so results are identical to the candle-by-candle loop.
+"""
+import logging
+from datetime import datetime
+from heapq import heappush
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame
+from pandas.api.types import is_datetime64_any_dtype
+
+from freqtrade.persistence import LocalTrade
+
+
+logger = logging.getLogger(__name__)
+
+# Profit ratios are rounded to 8 decimals in LocalTrade.calc_profit_ratio().
+# Comparisons closer than this are treated as possible exits and verified with the exact logic.
+PROFIT_TOLERANCE = 1e-7
+
+# Number of candles evaluated at once while searching for the next possible exit.
+MIN_SCAN_WINDOW = 32
+MAX_SCAN_WINDOW = 4096
+
+
+class PairArrays(NamedTuple):
+    """
+    Columnar representation of the signal dataframe of one pair.
+    """
+    dates: np.ndarray  # int64, epoch seconds
+    date_objs: Any  # pandas Timestamps, only used to build rows for the scalar logic
+    buy: np.ndarray
+    open: np.ndarray
+    close: np.ndarray
+    sell: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+    def row(self, idx: int) -> list:
+        """
+        Build a row as used by the candle-by-candle loop.
+        Sequence must be aligned to the index-constants in backtesting.py.
+        """
+        return [self.date_objs[idx], float(self.buy[idx]), float(self.open[idx]),
+                float(self.close[idx]), float(self.sell[idx]), float(self.low[idx]),
+                float(self.high[idx])]
+
+
+class PairTimeline(NamedTuple):
+    """
+    Arrays of one pair, with the backtest-relevant section and possible entries.
+    """
+    arrays: PairArrays
+    end: int  # Index of the first candle after the backtest end
+    entries: np.ndarray  # Indexes of candles with a buy signal
+
+    def next_entry(self, after: int) -> Optional[int]:
+        """
+        :return: Index of the first possible entry after candle `after`, or None
+        """
+        idx = int(np.searchsorted(self.entries, after, side='right'))
+        return int(self.entries[idx]) if idx < len(self.entries) else None
+
+
+class ExitParameters(NamedTuple):
+    """
+    Strategy settings relevant to find possible exits.
+    """
+    stoploss: float
+    trailing_stop: bool
+    trailing_stop_positive: Optional[float]
+    trailing_stop_positive_offset: float
+    trailing_only_offset_is_reached: bool
+    roi_durations: np.ndarray
+    roi_values: np.ndarray
+    use_sell_signal: bool
+    sell_profit_only: bool
+    sell_profit_offset: float
+    ignore_roi_if_buy_signal: bool
+
+
+class ExitScanResult(NamedTuple):
+    """
+    Result of scan_for_exit().
+    exit_index is the first candle which may cause an exit (or `end` if there is none).
+    The remaining fields describe the trade state after all candles before `exit_index`.
+    """
+    exit_index: int
+    max_high: Optional[float]
+    min_high: Optional[float]
+    stop_loss: float
+    stop_loss_pct: Optional[float]
+
+
+def dataframe_to_arrays(dataframe: DataFrame) -> Optional[PairArrays]:
+    """
+    Convert a signal dataframe (as created by Backtesting) to numpy arrays.
+    :return: PairArrays, or None if the dataframe can't be used by the vectorized engine.
+    """
+    if not is_datetime64_any_dtype(dataframe['date']):
+        return None
+    dates_ns = dataframe['date'].values.astype('int64')
+    if (dates_ns % 10 ** 9).any():
+        return None
+
+    columns = {col: dataframe[col].to_numpy(dtype='float64')
+               for col in ['buy', 'open', 'close', 'sell', 'low', 'high']}
+    prices = np.concatenate([columns['open'], columns['low'], columns['high']])
+    # Zero or missing prices behave differently in the scalar logic ("low or rate").
+    if not np.isfinite(prices).all() or (prices <= 0).any():
+        return None
+
+    return PairArrays(dates=dates_ns // 10 ** 9, date_objs=dataframe['date'].array, **columns)
+
+
+def arrays_aligned(arrays: PairArrays, first_candle: int, end: int, step: int) -> bool:
+    """
+    Verify that every candle up to `end` falls on the candle-loop timeline
+    (first_candle, first_candle + step, ...), without duplicates.
+    """
+    dates = arrays.dates[:end]
+    if len(dates) == 0:
+        return True
+    return bool(dates[0] >= first_candle
+                and ((dates - first_candle) % step == 0).all()
+                and (np.diff(dates) > 0).all())
+
+
+def prepare_pair_timelines(signals: Dict[str, DataFrame], start_ts: int, end_ts: int,
+                           step: int) -> Optional[Dict[str, PairTimeline]]:
+    """
+    Convert the signal dataframes of all pairs and locate all possible entries.
+    :param start_ts: backtest start, in epoch seconds
+    :param end_ts: backtest end, in epoch seconds
+    :param step: timeframe in seconds
+    :return: Dict of PairTimeline, or None if one of the pairs can't be used
+    """
+    timelines: Dict[str, PairTimeline] = {}
+    for pair, dataframe in signals.items():
+        arrays = dataframe_to_arrays(dataframe)
+        if arrays is None:
+            logger.debug(f"{pair} - Data not supported by the vectorized engine.")
+            return None
+        end = int(np.searchsorted(arrays.dates, end_ts, side='right'))
+        if not arrays_aligned(arrays, start_ts + step, end, step):
+            logger.debug(f"{pair} - Data not aligned to the timeframe.")
+            return None
+        # Same conditions as in the candle loop - not opening on the last candle.
+        entries = np.flatnonzero((arrays.buy[:end] == 1) & (arrays.sell[:end] != 1)
+                                 & (arrays.dates[:end] != end_ts))
+        timelines[pair] = PairTimeline(arrays=arrays, end=end, entries=entries)
+    return timelines
+
+
+def get_exit_parameters(strategy) -> ExitParameters:
+    """
+    Collect exit-relevant settings from the strategy.
+    Must be called for every backtest, as hyperopt modifies these attributes.
+    """
+    roi_durations, roi_values = strategy.get_roi_table()
+    ask_strategy = strategy.config.get('ask_strategy', {})
+    return ExitParameters(
+        stoploss=strategy.stoploss,
+        trailing_stop=strategy.trailing_stop,
+        trailing_stop_positive=strategy.trailing_stop_positive,
+        trailing_stop_positive_offset=strategy.trailing_stop_positive_offset,
+        trailing_only_offset_is_reached=strategy.trailing_only_offset_is_reached,
+        roi_durations=np.array(roi_durations, dtype='float64'),
+        roi_values=np.array(roi_values, dtype='float64'),
+        use_sell_signal=ask_strategy.get('use_sell_signal', True),
+        sell_profit_only=ask_strategy.get('sell_profit_only', False),
+        sell_profit_offset=ask_strategy.get('sell_profit_offset', 0),
+        ignore_roi_if_buy_signal=ask_strategy.get('ignore_roi_if_buy_signal', False),
+    )
+
+
+def _exit_candidates(arrays: PairArrays, start: int, stop: int, params: ExitParameters,
+                     trade: LocalTrade, open_ts: int, stop_loss: float
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate candles [start, stop) for a trade.
+    :return: Tuple of
+        candidates: bool array, True where the trade may exit
+        stops: stoploss before each candle (stops[i]) and after it (stops[i + 1])
+        new_stops: stoploss proposed by each candle (-inf if none)
+        stop_values: stoploss ratio used by each candle
+    """
+    high = arrays.high[start:stop]
+    low = arrays.low[start:stop]
+    buy = arrays.buy[start:stop]
+    # Mirrors LocalTrade.calc_profit_ratio(high), without rounding
+    sell_value = trade.amount * high
+    profit = (sell_value - sell_value * trade.fee_close) / trade.open_trade_value - 1
+
+    candidates = np.zeros(len(high), dtype=bool)
+    stop_values = np.full(len(high), params.stoploss)
+    if params.trailing_stop:
+        offset = params.trailing_stop_positive_offset
+        # Trailing decisions too close to call are verified by the exact logic
+        candidates |= np.abs(profit - offset) < PROFIT_TOLERANCE
+        if params.trailing_stop_positive is not None:
+            stop_values[profit > offset] = params.trailing_stop_positive
+        new_stops = high * (1 - np.abs(stop_values))
+        if params.trailing_only_offset_is_reached:
+            new_stops[profit < offset] = -np.inf
+    else:
+        new_stops = np.full(len(high), -np.inf)
+    stops = np.maximum.accumulate(np.concatenate(([stop_loss], new_stops)))
+
+    # Stoploss - evaluated against low after adjusting to high
+    candidates |= stops[1:] >= low
+
+    # ROI
+    if len(params.roi_durations):
+        durations = (arrays.dates[start:stop] - open_ts) // 60
+        idx = np.searchsorted(params.roi_durations, durations, side='right') - 1
+        roi = np.where(idx >= 0, params.roi_values[np.maximum(idx, 0)], np.inf)
+        roi_hit = profit > roi - PROFIT_TOLERANCE
+        if params.ignore_roi_if_buy_signal:
+            roi_hit &= buy == 0
+        candidates |= roi_hit
+
+    # Sell signal
+    if params.use_sell_signal:
+        signal = (buy == 0) & (arrays.sell[start:stop] != 0)
+        if params.sell_profit_only:
+            signal &= profit > params.sell_profit_offset - PROFIT_TOLERANCE
+        candidates |= signal
+
+    return candidates, stops, new_stops, stop_values
+
+
+def scan_for_exit(arrays: PairArrays, start: int, end: int, params: ExitParameters,
+                  trade: LocalTrade) -> ExitScanResult:
+    """
+    Find the first candle in [start, end) on which `trade` may exit.
+    Candles are evaluated in growing windows, so short trades don't scan the whole pair.
+    """
+    open_ts = int(trade.open_date_utc.timestamp())
+    stop_loss = trade.stop_loss
+    stop_loss_pct = None
+    max_high: Optional[float] = None
+    min_high: Optional[float] = None
+    window = MIN_SCAN_WINDOW
+    pos = start
+    while pos < end:
+        stop = min(pos + window, end)
+        candidates, stops, new_stops, stop_values = _exit_candidates(
+            arrays, pos, stop, params, trade, open_ts, stop_loss)
+        hits = np.flatnonzero(candidates)
+        count = int(hits[0]) if len(hits) else stop - pos
+        if count:
+            # Apply candles without exit to the trade state
+            high = arrays.high[pos:pos + count]
+            window_max, window_min = float(high.max()), float(high.min())
+            max_high = window_max if max_high is None else max(max_high, window_max)
+            min_high = window_min if min_high is None else min(min_high, window_min)
+            raised = np.flatnonzero(new_stops[:count] > stops[:count])
+            if len(raised):
+                stop_loss_pct = -1 * abs(float(stop_values[raised[-1]]))
+            stop_loss = float(stops[count])
+        if len(hits):
+            return ExitScanResult(pos + count, max_high, min_high, stop_loss, stop_loss_pct)
+        pos = stop
+        window = min(window * 2, MAX_SCAN_WINDOW)
+
+    return ExitScanResult(end, max_high, min_high, stop_loss, stop_loss_pct)
+
+
+def find_exit(timeline: PairTimeline, start: int, params: ExitParameters,
+              trade: LocalTrade) -> int:
+    """
+    Advance `trade` to the next candle (starting at `start`) which may cause an exit.
+    :return: Index of this candle, or timeline.end if there is none.
+    """
+    result = scan_for_exit(timeline.arrays, start, timeline.end, params, trade)
+    apply_scan_result(trade, result)
+    return result.exit_index
+
+
+def push_event(events: List[Tuple[int, int, int]], pos: int, timeline: PairTimeline,
+               idx: Optional[int]) -> None:
+    """
+    Schedule candle `idx` of the pair at position `pos` for evaluation.
+    Candles after the backtest end are ignored.
+    """
+    if idx is not None and idx < timeline.end:
+        heappush(events, (int(timeline.arrays.dates[idx]), pos, idx))
+
+
+def apply_scan_result(trade: LocalTrade, result: ExitScanResult) -> None:
+    """
+    Update the trade as if IStrategy.should_sell() had been called for the skipped candles.
+    """
+    if result.max_high is not None and result.min_high is not None:
+        trade.max_rate = max(result.max_high, trade.max_rate or trade.open_rate)
+        trade.min_rate = min(result.min_high, trade.min_rate or trade.open_rate)
+    if result.stop_loss_pct is not None:
+        trade.stop_loss = result.stop_loss
+        trade.stop_loss_pct = result.stop_loss_pct
+        trade.stoploss_last_update = datetime.utcnow()
@@ -5,23 +5,41 @@ This module contains the backtesting logic
 """
 import logging
 from collections import defaultdict
-from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from copy import copy, deepcopy
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from heapq import heappop
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
 
-from pandas import DataFrame
+import numpy as np
+from arrow import Arrow
+from cachetools import LRUCache
+from joblib import dump, load, wrap_non_picklable_objects
+from pandas import DataFrame, Series, to_datetime
 
 from freqtrade.configuration import TimeRange, remove_credentials, validate_config_consistency
-from freqtrade.constants import DATETIME_PRINT_FORMAT
+from freqtrade.constants import DATETIME_PRINT_FORMAT, UNLIMITED_STAKE_AMOUNT
 from freqtrade.data import history
 from freqtrade.data.btanalysis import trade_list_to_dataframe
 from freqtrade.data.converter import trim_dataframe
 from freqtrade.data.dataprovider import DataProvider
 from freqtrade.exceptions import DependencyException, OperationalException
 from freqtrade.exchange import timeframe_to_minutes, timeframe_to_seconds
+from freqtrade.loggers import emit_log_records, get_worker_log_records, setup_worker_logging
 from freqtrade.mixins import LoggingMixin
+from freqtrade.optimize.backtest_exit import BacktestExitEvaluator, uses_default_sell_logic
+from freqtrade.optimize.backtest_shards import (SHARD_MIN_STARTUP_CANDLES, ShardRun, ShardWindow,
+                                                get_shard_windows, group_open_trades,
+                                                slice_shard_data, trade_profit)
+from freqtrade.optimize.backtest_vectorized import (find_exit, get_exit_parameters,
+                                                    prepare_pair_timelines, push_event)
+from freqtrade.optimize.hyperopt_data import dump_preprocessed, load_preprocessed
 from freqtrade.optimize.optimize_reports import (generate_backtest_stats, show_backtest_results,
                                                  store_backtest_stats)
+from freqtrade.optimize.profiling import Profiler, cprofile, merge_profiles, show_profile
 from freqtrade.persistence import LocalTrade, PairLocks, Trade
 from freqtrade.plugins.pairlistmanager import PairListManager
 from freqtrade.plugins.protectionmanager import ProtectionManager
@@ -41,6 +59,105 @@ CLOSE_IDX = 3
 SELL_IDX = 4
 LOW_IDX = 5
 HIGH_IDX = 6
+# Every change to this headers list must evaluate further usages of the resulting tuple
+# and eventually change the constants for indexes above
+HEADERS = ['date', 'buy', 'open', 'close', 'sell', 'low', 'high']
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Memory (in bytes) available to keep buy / sell signals of previous hyperopt epochs
+SIGNAL_CACHE_SIZE = 256 * 1024 * 1024
+
+
+def _signals_size(signals: Tuple) -> int:
+    return sum(array.nbytes for array in signals)
+
+
+def _signal_array(signal: Series) -> np.ndarray:
+    """
+    Buy / sell signals as int8 - float64 is kept if a strategy uses values other than 0 and 1.
+    """
+    values = signal.to_numpy(dtype='float64')
+    if ((values == 0) | (values == 1)).all():
+        return values.astype(np.int8)
+    return values
+
+
+class PairRows:
+    """
+    Signal dataframe of one pair, as used by the candle loop.
+    Columns are kept as compact numpy arrays (dates as int64 epoch nanoseconds, prices as
+    float64, signals as int8). A row (a list in the sequence of HEADERS) is only created
+    when it's accessed.
+    """
+
+    def __init__(self, dataframe: DataFrame) -> None:
+        self.dates = to_datetime(dataframe['date'], utc=True).values.view('int64')
+        # Timestamps are created on access
+        self.date_objs = dataframe['date'].array
+        self.buy = _signal_array(dataframe['buy'])
+        self.open = dataframe['open'].to_numpy(dtype='float64')
+        self.close = dataframe['close'].to_numpy(dtype='float64')
+        self.sell = _signal_array(dataframe['sell'])
+        self.low = dataframe['low'].to_numpy(dtype='float64')
+        self.high = dataframe['high'].to_numpy(dtype='float64')
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, idx: int) -> List:
+        # Sequence must be aligned to the index-constants above
+        return [self.date_objs[idx], float(self.buy[idx]), float(self.open[idx]),
+                float(self.close[idx]), float(self.sell[idx]), float(self.low[idx]),
+                float(self.high[idx])]
+
+
+# Backtesting instance and data directory of a strategy worker process
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_backtest_worker(state_file: Path, data_directory: Path, log_level: int) -> None:
+    """
+    Initialize a worker process of Backtesting._backtest_parallel().
+    """
+    setup_worker_logging(log_level)
+    # Attributes are restored without calling __init__ - the exchange and pairlists
+    # are initialized already.
+    backtesting = Backtesting.__new__(Backtesting)
+    backtesting.__dict__.update(load(state_file))
+    LoggingMixin.show_output = False
+    IStrategy.dp = DataProvider(backtesting.config, backtesting.exchange, backtesting.pairlists)
+    _worker_state['backtesting'] = backtesting
+    _worker_state['data_directory'] = data_directory
+
+
+def _backtest_strategy_worker(strategy_id: int, timerange: TimeRange
+                              ) -> Tuple[Dict[str, Any], Arrow, Arrow, List[logging.LogRecord]]:
+    """
+    Backtest one strategy of the strategy list in a worker process.
+    :return: Results, min_date and max_date of backtest_one_strategy() and the log records
+    """
+    backtesting: Backtesting = _worker_state['backtesting']
+    # Memory-mapped - the candle data is loaded only once into memory for all workers
+    data = load_preprocessed(_worker_state['data_directory'])
+    strategy = backtesting.strategylist[strategy_id]
+    min_date, max_date = backtesting.backtest_one_strategy(strategy, data, timerange)
+    results = backtesting.all_results.pop(strategy.get_strategy_name())
+    return results, min_date, max_date, get_worker_log_records()
+
+
+def _backtest_shard_worker(strategy_id: int, timerange: TimeRange, window: ShardWindow,
+                           last_date: datetime, max_open_trades: int
+                           ) -> Tuple[ShardRun, List[logging.LogRecord]]:
+    """
+    Backtest one window of a sharded backtest in a worker process.
+    """
+    backtesting: Backtesting = _worker_state['backtesting']
+    data = load_preprocessed(_worker_state['data_directory'])
+    strategy = backtesting.strategylist[strategy_id]
+    if backtesting.strategy is not strategy:
+        backtesting._set_strategy(strategy)
+    strategy_safe_wrapper(strategy.bot_loop_start, supress_error=True)()
+    run = backtesting._backtest_shard(data, timerange, window, last_date, max_open_trades)
+    return run, get_worker_log_records()
 
 
 class Backtesting:
@@ -61,6 +178,8 @@ class Backtesting:
         remove_credentials(self.config)
         self.strategylist: List[IStrategy] = []
         self.all_results: Dict[str, Dict] = {}
+        # Timings per phase - only recorded with --profile
+        self.profiler = Profiler(enabled=bool(self.config.get('profile')))
 
         self.exchange = ExchangeResolver.load_exchange(self.config['exchange']['name'], self.config)
 
@@ -116,6 +235,8 @@ class Backtesting:
             self.protections = ProtectionManager(self.config)
 
         self.wallets = Wallets(self.config, self.exchange, log=False)
+        # Available balance minus stake amount of every entry attempt - only for sharded backtests
+        self.stake_margins: Optional[List[Tuple[datetime, float]]] = None
 
         # Get maximum required startup period
         self.required_startup = max([strat.startup_candle_count for strat in self.strategylist])
@@ -137,6 +258,32 @@ class Backtesting:
         # And the regular "stoploss" function would not apply to that case
         self.strategy.order_types['stoploss_on_exchange'] = False
 
+        # Signals are cached while signal_key is set (by hyperopt).
+        # signal_key must change whenever the buy / sell signals of the strategy may change.
+        self.signal_key: Optional[Hashable] = None
+        self.signal_cache: LRUCache = LRUCache(
+            maxsize=SIGNAL_CACHE_SIZE, getsizeof=_signals_size)
+
+        # Created for every backtest, if the strategy uses the default sell logic
+        self.exit_evaluator: Optional[BacktestExitEvaluator] = None
+
+        self.vectorized = False
+        if self.config.get('backtest_engine', 'loop') == 'vectorized':
+            self.vectorized = self._supports_vectorized(strategy)
+            if not self.vectorized:
+                logger.info(f"Strategy {strategy.get_strategy_name()} uses custom sell logic, "
+                            "falling back to the candle-by-candle backtest engine.")
+
+    @staticmethod
+    def _supports_vectorized(strategy: IStrategy) -> bool:
+        """
+        The vectorized engine only calls the sell logic on candles which may cause a sell.
+        Strategies with custom sell / stoploss callbacks must see every candle.
+        """
+        return (not strategy.use_custom_stoploss
+                and type(strategy).custom_sell is IStrategy.custom_sell
+                and uses_default_sell_logic(strategy))
+
     def load_bt_data(self) -> Tuple[Dict[str, DataFrame], TimeRange]:
         """
         Loads backtest data and returns the data combined with the timerange
@@ -145,15 +292,17 @@ class Backtesting:
         timerange = TimeRange.parse_timerange(None if self.config.get(
             'timerange') is None else str(self.config.get('timerange')))
 
-        data = history.load_data(
-            datadir=self.config['datadir'],
-            pairs=self.pairlists.whitelist,
-            timeframe=self.timeframe,
-            timerange=timerange,
-            startup_candles=self.required_startup,
-            fail_without_data=True,
-            data_format=self.config.get('dataformat_ohlcv', 'json'),
-        )
+        with self.profiler.phase('load_data'):
+            data = history.load_data(
+                datadir=self.config['datadir'],
+                pairs=self.pairlists.whitelist,
+                timeframe=self.timeframe,
+                timerange=timerange,
+                startup_candles=self.required_startup,
+                fail_without_data=True,
+                data_format=self.config.get('dataformat_ohlcv', 'json'),
+                workers=self.config.get('dataload_workers', 1),
+            )
 
         min_date, max_date = history.get_timerange(data)
 
@@ -177,37 +326,149 @@ class Backtesting:
         PairLocks.reset_locks()
         Trade.reset_trades()
 
-    def _get_ohlcv_as_lists(self, processed: Dict[str, DataFrame]) -> Dict[str, Tuple]:
+    def _get_worker_state(self) -> Dict[str, Any]:
+        """
+        Attributes of this instance required by the worker processes of _backtest_parallel().
+        Exchange API objects can't be transferred to other processes - backtesting only uses
+        the markets, which are kept. Pairlist handlers are dropped, as the whitelist is final.
         """
-        Helper function to convert a processed dataframes into lists for performance reasons.
+        state = dict(self.__dict__)
+        exchange = copy(self.exchange)
+        exchange._markets = self.exchange.markets
+        exchange._api = None  # type: ignore
+        exchange._api_async = None  # type: ignore
+        pairlists = copy(self.pairlists)
+        pairlists._exchange = exchange
+        pairlists._pairlist_handlers = []
+        wallets = copy(self.wallets)
+        wallets._exchange = exchange
+        state.update({'exchange': exchange, 'pairlists': pairlists, 'wallets': wallets,
+                      'all_results': {}})
+        return state
+
+    @contextmanager
+    def _worker_pool(self, data: Dict[str, DataFrame],
+                     workers: int) -> Iterator[ProcessPoolExecutor]:
+        """
+        Pool of worker processes, initialized with the state of this instance.
+        The candle data is shared through memory-mapped files.
+        """
+        with TemporaryDirectory(prefix='freqtrade-backtest-') as tmpdir:
+            data_directory = Path(tmpdir) / 'data'
+            dump_preprocessed(data, data_directory)
+            state_file = Path(tmpdir) / 'backtesting.pkl'
+            # Strategies are loaded from files, so they need cloudpickle.
+            dump(wrap_non_picklable_objects(self._get_worker_state(), keep_wrapper=False),
+                 state_file)
+
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_backtest_worker,
+                                     initargs=(state_file, data_directory,
+                                               logging.root.getEffectiveLevel())) as executor:
+                yield executor
+
+    def _backtest_parallel(self, data: Dict[str, DataFrame],
+                           timerange: TimeRange) -> Tuple[Arrow, Arrow]:
+        """
+        Backtest all strategies of the strategy list in a pool of worker processes.
+        The results of every strategy are collected as soon as it finishes.
+        Results are stored in the order of the strategy list.
+        """
+        workers = min(self.config['backtest_workers'], len(self.strategylist))
+        logger.info(f"Backtesting {len(self.strategylist)} strategies "
+                    f"using {workers} worker processes.")
+        results: Dict[int, Tuple[Dict[str, Any], Arrow, Arrow]] = {}
+        with self._worker_pool(data, workers) as executor:
+            futures = {executor.submit(_backtest_strategy_worker, strategy_id, timerange):
+                       strategy_id for strategy_id in range(len(self.strategylist))}
+            for future in as_completed(futures):
+                strategy_results, min_date, max_date, records = future.result()
+                emit_log_records(records)
+                strategy_id = futures[future]
+                results[strategy_id] = (strategy_results, min_date, max_date)
+                logger.info(f"Backtesting of strategy "
+                            f"{self.strategylist[strategy_id].get_strategy_name()} "
+                            f"finished ({len(results)}/{len(self.strategylist)}).")
+
+        for strategy_id, strat in enumerate(self.strategylist):
+            strategy_results, min_date, max_date = results[strategy_id]
+            self.all_results[strat.get_strategy_name()] = strategy_results
+        return min_date, max_date
 
-        Used by backtest() - so keep this optimized for performance.
+    def populate_indicators(self, data: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
+        """
+        Populate indicators for all pairs, as done by strategy.ohlcvdata_to_dataframe().
+        While profiling, every pair is timed separately.
+        """
+        if (not self.profiler.enabled or type(self.strategy).ohlcvdata_to_dataframe
+                is not IStrategy.ohlcvdata_to_dataframe):
+            with self.profiler.phase('populate_indicators'):
+                return self.strategy.ohlcvdata_to_dataframe(data)
+
+        preprocessed = {}
+        for pair, pair_data in data.items():
+            with self.profiler.phase('populate_indicators', pair):
+                preprocessed[pair] = self.strategy.advise_indicators(pair_data.copy(),
+                                                                     {'pair': pair})
+        return preprocessed
+
+    def _get_signal_dataframes(self, processed: Dict[str, DataFrame]) -> Dict[str, DataFrame]:
+        """
+        Helper function to populate buy / sell signals for all pairs.
+        Signals are shifted by one candle, and only the columns in HEADERS are kept.
+        While signal_key is set, signals are taken from the signal cache if possible.
         """
-        # Every change to this headers list must evaluate further usages of the resulting tuple
-        # and eventually change the constants for indexes at the top
-        headers = ['date', 'buy', 'open', 'close', 'sell', 'low', 'high']
         data: Dict = {}
-        # Create dict with data
         for pair, pair_data in processed.items():
-            pair_data.loc[:, 'buy'] = 0  # cleanup from previous run
-            pair_data.loc[:, 'sell'] = 0  # cleanup from previous run
+            cache_key = (pair, self.signal_key)
+            signals = self.signal_cache.get(cache_key) if self.signal_key is not None else None
+            if signals is not None:
+                df_analyzed = pair_data.iloc[1:].reindex(columns=HEADERS)
+                df_analyzed['buy'], df_analyzed['sell'] = signals
+            else:
+                df_analyzed = self._populate_signals(pair, pair_data)
+                if self.signal_key is not None:
+                    self._cache_signals(cache_key, df_analyzed)
+            data[pair] = df_analyzed
+        return data
 
-            df_analyzed = self.strategy.advise_sell(
-                self.strategy.advise_buy(pair_data, {'pair': pair}), {'pair': pair})[headers].copy()
+    def _populate_signals(self, pair: str, pair_data: DataFrame) -> DataFrame:
+        pair_data.loc[:, 'buy'] = 0  # cleanup from previous run
+        pair_data.loc[:, 'sell'] = 0  # cleanup from previous run
 
-            # To avoid using data from future, we use buy/sell signals shifted
-            # from the previous candle
-            df_analyzed.loc[:, 'buy'] = df_analyzed.loc[:, 'buy'].shift(1)
-            df_analyzed.loc[:, 'sell'] = df_analyzed.loc[:, 'sell'].shift(1)
+        with self.profiler.phase('advise_buy', pair):
+            df_analyzed = self.strategy.advise_buy(pair_data, {'pair': pair})
+        with self.profiler.phase('advise_sell', pair):
+            df_analyzed = self.strategy.advise_sell(df_analyzed, {'pair': pair})[HEADERS].copy()
 
-            df_analyzed.drop(df_analyzed.head(1).index, inplace=True)
+        # To avoid using data from future, we use buy/sell signals shifted
+        # from the previous candle
+        df_analyzed.loc[:, 'buy'] = df_analyzed.loc[:, 'buy'].shift(1)
+        df_analyzed.loc[:, 'sell'] = df_analyzed.loc[:, 'sell'].shift(1)
 
-            # Convert from Pandas to list for performance reasons
-            # (Looping Pandas is slow.)
-            data[pair] = df_analyzed.values.tolist()
-        return data
+        df_analyzed.drop(df_analyzed.head(1).index, inplace=True)
+        return df_analyzed
 
-    def _get_close_rate(self, sell_row: Tuple, trade: LocalTrade, sell: SellCheckTuple,
+    def _cache_signals(self, cache_key: Tuple[str, Hashable], df_analyzed: DataFrame) -> None:
+        """
+        Keep the shifted signals, so a later call with the same signal_key skips
+        advise_buy / advise_sell. Least recently used signals are evicted first.
+        """
+        signals = (df_analyzed['buy'].to_numpy(copy=True), df_analyzed['sell'].to_numpy(copy=True))
+        if self.signal_cache.getsizeof(signals) <= self.signal_cache.maxsize:
+            self.signal_cache[cache_key] = signals
+
+    def _get_ohlcv_as_lists(self, processed: Dict[str, DataFrame]) -> Dict[str, PairRows]:
+        """
+        Helper function to convert a processed dataframes into rows for performance reasons.
+        Rows are backed by numpy arrays and only converted to python objects when accessed.
+
+        Used by backtest() - so keep this optimized for performance.
+        """
+        # Looping Pandas is slow - and python lists of all candles use a lot of memory.
+        return {pair: PairRows(df)
+                for pair, df in self._get_signal_dataframes(processed).items()}
+
+    def _get_close_rate(self, sell_row: List, trade: LocalTrade, sell: SellCheckTuple,
                         trade_dur: int) -> float:
         """
         Get close rate for backtesting result
@@ -248,12 +509,17 @@ class Backtesting:
             return sell_row[OPEN_IDX]
 
     def _get_sell_trade_entry(self, dataframe: DataFrame, trade: LocalTrade,
-                              sell_row: Tuple) -> Optional[LocalTrade]:
+                              sell_row: List) -> Optional[LocalTrade]:
 
-        sell = self.strategy.should_sell(dataframe, trade, sell_row[OPEN_IDX],  # type: ignore
-                                         sell_row[DATE_IDX].to_pydatetime(), sell_row[BUY_IDX],
-                                         sell_row[SELL_IDX],
-                                         low=sell_row[LOW_IDX], high=sell_row[HIGH_IDX])
+        if self.exit_evaluator:
+            sell = self.exit_evaluator.should_sell(
+                dataframe, trade, sell_row[DATE_IDX], sell_row[OPEN_IDX], sell_row[BUY_IDX],
+                sell_row[SELL_IDX], low=sell_row[LOW_IDX], high=sell_row[HIGH_IDX])
+        else:
+            sell = self.strategy.should_sell(dataframe, trade, sell_row[OPEN_IDX],  # type: ignore
+                                             sell_row[DATE_IDX].to_pydatetime(),
+                                             sell_row[BUY_IDX], sell_row[SELL_IDX],
+                                             low=sell_row[LOW_IDX], high=sell_row[HIGH_IDX])
 
         if sell.sell_flag:
             trade.close_date = sell_row[DATE_IDX].to_pydatetime()
@@ -275,7 +541,17 @@ class Backtesting:
 
         return None
 
+    def _record_stake_margin(self, date: datetime) -> None:
+        """
+        Record the distance of the available balance to the stake amount for an entry attempt.
+        """
+        self.wallets.update()
+        available = self.wallets._get_available_stake_amount(Trade.total_open_trades_stakes())
+        self.stake_margins.append((date, available - self.config['stake_amount']))  # type: ignore
+
     def _enter_trade(self, pair: str, row: List) -> Optional[LocalTrade]:
+        if self.stake_margins is not None:
+            self._record_stake_margin(row[DATE_IDX])
         try:
             stake_amount = self.wallets.get_trade_stake_amount(pair, None)
         except DependencyException:
@@ -307,24 +583,28 @@ class Backtesting:
         return None
 
     def handle_left_open(self, open_trades: Dict[str, List[LocalTrade]],
-                         data: Dict[str, List[Tuple]]) -> List[LocalTrade]:
+                         data: Dict[str, Any]) -> List[LocalTrade]:
         """
-        Handling of left open trades at the end of backtesting
+        Handling of left open trades at the end of backtesting.
+        Trades are closed in the sequence they were opened (by open date, then by the
+        position of the pair in the backtest loop) - independent of how they are grouped.
         """
+        pair_index = {pair: i for i, pair in enumerate(data)}
+        left_open = sorted((trade for pair_trades in open_trades.values()
+                            for trade in pair_trades),
+                           key=lambda trade: (trade.open_date, pair_index[trade.pair]))
         trades = []
-        for pair in open_trades.keys():
-            if len(open_trades[pair]) > 0:
-                for trade in open_trades[pair]:
-                    sell_row = data[pair][-1]
+        for trade in left_open:
+            sell_row = data[trade.pair][-1]
 
-                    trade.close_date = sell_row[DATE_IDX].to_pydatetime()
-                    trade.sell_reason = SellType.FORCE_SELL.value
-                    trade.close(sell_row[OPEN_IDX], show_msg=False)
-                    LocalTrade.close_bt_trade(trade)
-                    # Deepcopy object to have wallets update correctly
-                    trade1 = deepcopy(trade)
-                    trade1.is_open = True
-                    trades.append(trade1)
+            trade.close_date = sell_row[DATE_IDX].to_pydatetime()
+            trade.sell_reason = SellType.FORCE_SELL.value
+            trade.close(sell_row[OPEN_IDX], show_msg=False)
+            LocalTrade.close_bt_trade(trade)
+            # Deepcopy object to have wallets update correctly
+            trade1 = deepcopy(trade)
+            trade1.is_open = True
+            trades.append(trade1)
         return trades
     
     def backtest(self, processed: Dict,
@@ -346,47 +626,97 @@ class Backtesting:
         :param enable_protections: Should protections be enabled?
         :return: DataFrame with trades (results of backtesting)
         """
-        trades: List[LocalTrade] = []
+        trades: Optional[List[LocalTrade]] = None
         self.prepare_backtest(enable_protections)
+        self._init_exit_evaluator()
+
+        signals = self._get_signal_dataframes(processed)
+        with self.profiler.phase('backtest_loop'):
+            if self.vectorized and not position_stacking:
+                trades = self._backtest_vectorized(processed, signals, start_date, end_date,
+                                                   max_open_trades, enable_protections)
+            if trades is None:
+                # Use compact rows for performance
+                # (looping arrays is a lot faster than pandas DataFrames)
+                data = {pair: PairRows(df) for pair, df in signals.items()}
+                trades = self._backtest_loop(processed, data, start_date, end_date,
+                                             max_open_trades, position_stacking,
+                                             enable_protections)
+        self.wallets.update()
 
-        # Use dict of lists with data for performance
-        # (looping lists is a lot faster than pandas DataFrames)
-        data: Dict = self._get_ohlcv_as_lists(processed)
+        results = trade_list_to_dataframe(trades)
+        return {
+            'results': results,
+            'config': self.strategy.config,
+            'locks': PairLocks.get_all_locks(),
+            'final_balance': self.wallets.get_total(self.strategy.config['stake_currency']),
+        }
+
+    def _init_exit_evaluator(self) -> None:
+        self.exit_evaluator = None
+        if uses_default_sell_logic(self.strategy):
+            self.exit_evaluator = BacktestExitEvaluator(self.strategy)
+
+    def _backtest_loop(self, processed: Dict, data: Dict[str, PairRows],
+                       start_date: datetime, end_date: datetime,
+                       max_open_trades: int, position_stacking: bool,
+                       enable_protections: bool,
+                       open_trades: Optional[Dict[str, List[LocalTrade]]] = None,
+                       last_date: Optional[datetime] = None,
+                       stop_check: Optional[Callable[[datetime, Dict], bool]] = None
+                       ) -> List[LocalTrade]:
+        """
+        Candle-by-candle backtesting loop.
+        :param data: Dict of PairRows per pair, as created by _get_ohlcv_as_lists()
+        :param open_trades: defaultdict of trades open at start_date (sharded backtests).
+            Trades left open at the end remain in this dict and are not closed.
+        :param last_date: Last candle of the complete backtest (default: end_date)
+        :param stop_check: Called with the candle date and the open trades at the start of
+            every candle - stops the loop if it returns True.
+        :return: List of trades, including trades left open at the end (unless open_trades
+            is given).
+        """
+        trades: List[LocalTrade] = []
 
         # Indexes per pair, so some pairs are allowed to have a missing start.
         indexes: Dict = defaultdict(int)
         tmp = start_date + timedelta(minutes=self.timeframe_min)
+        # Candle dates are compared as epoch nanoseconds
+        tmp_ns = (tmp - EPOCH) // timedelta(microseconds=1) * 1000
+        step_ns = self.timeframe_min * 60 * 10 ** 9
 
-        open_trades: Dict[str, List[LocalTrade]] = defaultdict(list)
-        open_trade_count = 0
-
-        # Variable to keep tabs on available balance
-        available_balance: float = self.config['dry_run_wallet']
+        close_open_trades = open_trades is None
+        open_trades = defaultdict(list) if open_trades is None else open_trades
+        open_trade_count = sum(len(pair_trades) for pair_trades in open_trades.values())
+        last_date = last_date or end_date
 
         # Loop timerange and get candle for each pair at that point in time
-        while tmp <= end_date:
+        while tmp <= end_date and not (stop_check and stop_check(tmp, open_trades)):
             open_trade_count_start = open_trade_count
 
             for i, pair in enumerate(data):
-                try:
-                    row = data[pair][indexes[pair]]
-                except IndexError:
+                rows = data[pair]
+                idx = indexes[pair]
+                if idx >= len(rows):
                     # missing Data for one pair at the end.
                     # Warnings for this are shown during data loading
                     continue
 
                 # Waits until the time-counter reaches the start of the data for this pair.
-                if row[DATE_IDX] > tmp:
+                if rows.dates[idx] > tmp_ns:
                     continue
                 indexes[pair] += 1
 
+                # The row is only needed if the candle can open or close a trade
+                entry = rows.buy[idx] == 1 and rows.sell[idx] != 1
+                row: Any = rows[idx] if entry or open_trades[pair] else None
+
                 # without positionstacking, we can only have one open trade per pair.
                 # max_open_trades must be respected
                 # don't open on the last row
-                if ((position_stacking or len(open_trades[pair]) == 0)
+                if (entry and (position_stacking or len(open_trades[pair]) == 0)
                         and (max_open_trades <= 0 or open_trade_count_start < max_open_trades)
-                        and tmp != end_date
-                        and row[BUY_IDX] == 1 and row[SELL_IDX] != 1
+                        and tmp != last_date
                         and not PairLocks.is_pair_locked(pair, row[DATE_IDX])):
                     trade = self._enter_trade(pair, row)
                     if trade:
@@ -421,13 +751,267 @@ class Backtesting:
 
             # Move time one configured time_interval ahead.
             tmp += timedelta(minutes=self.timeframe_min)
+            tmp_ns += step_ns
+
+        if close_open_trades:
+            trades += self.handle_left_open(open_trades, data=data)
+        return trades
 
-        trades += self.handle_left_open(open_trades, data=data)
+    def _backtest_vectorized(self, processed: Dict, signals: Dict[str, DataFrame],
+                             start_date: datetime, end_date: datetime,
+                             max_open_trades: int,
+                             enable_protections: bool) -> Optional[List[LocalTrade]]:
+        """
+        Columnar variant of _backtest_loop().
+        Candles are only visited if they can open or close a trade - which is determined
+        using numpy arrays. Visited candles run through the same logic as the candle loop,
+        in the same order, so the resulting trades are identical.
+        :param signals: Dict of signal dataframes, as created by _get_signal_dataframes()
+        :return: List of trades, or None if the data can't be backtested this way.
+        """
+        start_ts = start_date.timestamp()
+        end_ts = end_date.timestamp()
+        if (start_ts != int(start_ts) or end_ts != int(end_ts)
+                or abs(self.strategy.stoploss) >= 1):
+            return None
+        start_ts = int(start_ts)
+        timelines = prepare_pair_timelines(signals, start_ts, int(end_ts),
+                                           self.timeframe_min * 60)
+        if timelines is None:
+            return None
+        pairs = list(timelines.keys())
+        lines = list(timelines.values())
+
+        params = get_exit_parameters(self.strategy)
+        trades: List[LocalTrade] = []
+        open_trades: Dict[int, LocalTrade] = {}
+        open_trade_count = 0
+        # Heap of (candle date, pair position, candle index) - one entry per pair at most.
+        # Pairs without open trade wait for the next buy-signal, others for a possible exit.
+        events: List[Tuple[int, int, int]] = []
+
+        for pos in range(len(pairs)):
+            push_event(events, pos, lines[pos], lines[pos].next_entry(-1))
+
+        while events:
+            candle_ts = events[0][0]
+            open_trade_count_start = open_trade_count
+            while events and events[0][0] == candle_ts:
+                _, pos, idx = heappop(events)
+                pair = pairs[pos]
+                row = lines[pos].arrays.row(idx)
+                trade = open_trades.get(pos)
+                if trade is None:
+                    trade = self._enter_trade_vectorized(
+                        pair, row, max_open_trades <= 0 or open_trade_count_start < max_open_trades)
+                    if not trade:
+                        push_event(events, pos, lines[pos], lines[pos].next_entry(idx))
+                        continue
+                    open_trade_count_start += 1
+                    open_trade_count += 1
+                    open_trades[pos] = trade
+                    # also check the buying candle for sell conditions.
+                    exit_idx = find_exit(lines[pos], idx, params, trade)
+                    if exit_idx != idx:
+                        push_event(events, pos, lines[pos], exit_idx)
+                        continue
+
+                trade_entry = self._get_sell_trade_entry(processed[pair], trade, row)
+                if trade_entry:
+                    open_trade_count -= 1
+                    del open_trades[pos]
+                    LocalTrade.close_bt_trade(trade)
+                    trades.append(trade_entry)
+                    if enable_protections:
+                        self.protections.stop_per_pair(pair, row[DATE_IDX])
+                        self.protections.global_stop(
+                            start_date + timedelta(seconds=candle_ts - start_ts))
+                    push_event(events, pos, lines[pos], lines[pos].next_entry(idx))
+                else:
+                    push_event(events, pos, lines[pos],
+                               find_exit(lines[pos], idx + 1, params, trade))
+
+        # Trades left open are handled in the order the candle loop would have seen the pairs.
+        left_open: Dict[str, List[LocalTrade]] = {}
+        last_rows: Dict[str, List] = {}
+        for pos in sorted(open_trades, key=lambda p: (lines[p].arrays.dates[0], p)):
+            left_open[pairs[pos]] = [open_trades[pos]]
+            last_rows[pairs[pos]] = [lines[pos].arrays.row(-1)]
+        trades += self.handle_left_open(left_open, data=last_rows)
+        return trades
+
+    def _enter_trade_vectorized(self, pair: str, row: List,
+                                slot_available: bool) -> Optional[LocalTrade]:
+        """
+        Entry logic of the candle loop, for candles with buy signal.
+        """
+        if not slot_available or PairLocks.is_pair_locked(pair, row[DATE_IDX]):
+            return None
+        trade = self._enter_trade(pair, row)
+        if trade:
+            LocalTrade.add_bt_trade(trade)
+            # Initialize stoploss, as done by the first call to should_sell()
+            trade.adjust_stop_loss(trade.open_rate, self.strategy.stoploss, initial=True)
+        return trade
+
+    def _supports_sharding(self) -> bool:
+        """
+        Windows are stitched together based on the open trades and the balance.
+        Protections and stake amounts depending on the balance carry further state.
+        Indicators must match the complete backtest after the startup candles of a window.
+        """
+        if self.required_startup < SHARD_MIN_STARTUP_CANDLES:
+            reason = (f'startup_candle_count below {SHARD_MIN_STARTUP_CANDLES} (indicators '
+                      'like EMA or RSI would differ from the complete timerange)')
+        elif self.config.get('enable_protections', False):
+            reason = 'protections'
+        elif self.config['stake_amount'] == UNLIMITED_STAKE_AMOUNT:
+            reason = 'unlimited stake amount'
+        elif self.config.get('amend_last_stake_amount', False):
+            reason = 'amend_last_stake_amount'
+        else:
+            return True
+        logger.info(f"Sharded backtesting is not supported with {reason}, "
+                    "backtesting the complete timerange at once.")
+        return False
+
+    def _backtest_window(self, data: Dict[str, DataFrame], timerange: TimeRange,
+                         window: ShardWindow, last_date: datetime, max_open_trades: int,
+                         open_trades: Dict[str, List[LocalTrade]], profit: float = 0.0,
+                         stop_check: Optional[Callable[[datetime, Dict], bool]] = None
+                         ) -> List[LocalTrade]:
+        """
+        Backtest one window of a sharded backtest with the candle loop.
+        Indicators are calculated for the window, including the startup candles.
+        :param open_trades: Trades open at the start of the window - trades left open at the
+            end of the window remain in this dict.
+        :param profit: Realized profit at the start of the window
+        :return: Closed trades
+        """
+        sliced, warmup = slice_shard_data(data, timerange, self.required_startup, window)
+        processed = self.populate_indicators(sliced)
+        for pair, df in processed.items():
+            processed[pair] = df.iloc[warmup[pair]:]
+
+        self.prepare_backtest(False)
+        LocalTrade.total_profit = profit
+        for pair_trades in open_trades.values():
+            for trade in pair_trades:
+                LocalTrade.add_bt_trade(trade)
+        self._init_exit_evaluator()
+
+        signals = self._get_signal_dataframes(processed)
+        rows = {pair: PairRows(df) for pair, df in signals.items()}
+        return self._backtest_loop(processed, rows,
+                                   window.start - timedelta(minutes=self.timeframe_min),
+                                   window.end, max_open_trades,
+                                   self.config.get('position_stacking', False), False,
+                                   open_trades=open_trades, last_date=last_date,
+                                   stop_check=stop_check)
+
+    def _backtest_shard(self, data: Dict[str, DataFrame], timerange: TimeRange,
+                        window: ShardWindow, last_date: datetime,
+                        max_open_trades: int) -> ShardRun:
+        """
+        Backtest one window without open trades, as done in parallel by the worker processes.
+        """
+        open_trades = group_open_trades([], list(data))
+        self.stake_margins = []
+        try:
+            trades = self._backtest_window(data, timerange, window, last_date,
+                                           max_open_trades, open_trades)
+            return ShardRun(trades, [trade for pair_trades in open_trades.values()
+                                     for trade in pair_trades],
+                            self.stake_margins, self.config['tradable_balance_ratio'])
+        finally:
+            self.stake_margins = None
+
+    def _continue_window(self, data: Dict[str, DataFrame], timerange: TimeRange,
+                         window: ShardWindow, last_date: datetime, max_open_trades: int,
+                         run: ShardRun, open_trades: Dict[str, List[LocalTrade]],
+                         profit: float) -> Tuple[List[LocalTrade], Optional[datetime]]:
+        """
+        Continue the backtest through a window, starting with the trades left open by the
+        previous window - until the state matches the parallel run of this window.
+        :return: Closed trades and the candle from which on `run` is identical
+            (None if the state didn't match up to the end of the window)
+        """
+        converged: List[datetime] = []
+
+        def stop_check(date: datetime, open_trades: Dict[str, List[LocalTrade]]) -> bool:
+            if run.matches(date, open_trades, LocalTrade.total_profit):
+                converged.append(date)
+                return True
+            return False
+
+        trades = self._backtest_window(data, timerange, window, last_date, max_open_trades,
+                                       open_trades, profit, stop_check)
+        return trades, converged[0] if converged else None
+
+    def _backtest_sharded(self, data: Dict[str, DataFrame], timerange: TimeRange,
+                          max_open_trades: int) -> Tuple[Arrow, Arrow, Dict[str, Any]]:
+        """
+        Backtest the timerange in windows, which are backtested in parallel worker processes
+        and stitched together in sequence - with the same trades as a single backtest().
+        """
+        trimmed = {pair: trim_dataframe(df, timerange, startup_candles=self.required_startup)
+                   for pair, df in data.items()}
+        min_date, max_date = history.get_timerange(trimmed)
+        windows = get_shard_windows(min_date.datetime, max_date.datetime, self.timeframe_min,
+                                    self.config['backtest_shards'])
+        logger.info(f'Backtesting with data from {min_date.strftime(DATETIME_PRINT_FORMAT)} '
+                    f'up to {max_date.strftime(DATETIME_PRINT_FORMAT)} '
+                    f'({(max_date - min_date).days} days) in {len(windows)} windows '
+                    f'using {len(windows)} worker processes..')
+
+        with self.profiler.phase('backtest_loop'):
+            runs: Dict[int, ShardRun] = {}
+            strategy_id = self.strategylist.index(self.strategy)
+            with self._worker_pool(data, len(windows)) as executor:
+                futures = {executor.submit(_backtest_shard_worker, strategy_id, timerange,
+                                           window, max_date.datetime, max_open_trades): shard
+                           for shard, window in enumerate(windows)}
+                for future in as_completed(futures):
+                    run, records = future.result()
+                    emit_log_records(records)
+                    runs[futures[future]] = run
+
+            pairs = list(data)
+            trades: List[LocalTrade] = []
+            open_trades = group_open_trades([], pairs)
+            profit = 0.0
+            continued = 0
+            for shard, window in enumerate(windows):
+                run = runs[shard]
+                start: Optional[datetime] = window.start
+                if not run.matches(window.start, open_trades, profit):
+                    continued += 1
+                    window_trades, start = self._continue_window(
+                        data, timerange, window, max_date.datetime, max_open_trades, run,
+                        open_trades, profit)
+                    trades += window_trades
+                    profit = trade_profit(window_trades, profit)
+                if start is not None:
+                    window_trades = run.trades_from(start)
+                    trades += window_trades
+                    profit = trade_profit(window_trades, profit)
+                    open_trades = group_open_trades(run.open_trades, pairs)
+            logger.info(f"Stitched {len(windows)} windows, {continued} of them were continued "
+                        "from the trades of the previous window.")
+
+        # Close trades left open at the end, as backtest() does
+        self.prepare_backtest(False)
+        LocalTrade.total_profit = profit
+        for pair_trades in open_trades.values():
+            for trade in pair_trades:
+                LocalTrade.add_bt_trade(trade)
+        last_rows = {pair: df.iloc[-1:].reindex(columns=HEADERS).values.tolist()
+                     for pair, df in trimmed.items() if len(df) > 0}
+        trades += self.handle_left_open(open_trades, data=last_rows)
         self.wallets.update()
 
-        results = trade_list_to_dataframe(trades)
-        return {
-            'results': results,
+        return min_date, max_date, {
+            'results': trade_list_to_dataframe(trades),
             'config': self.strategy.config,
             'locks': PairLocks.get_all_locks(),
             'final_balance': self.wallets.get_total(self.strategy.config['stake_currency']),
@@ -437,6 +1021,7 @@ class Backtesting:
         logger.info("Running backtesting for Strategy %s", strat.get_strategy_name())
         backtest_start_time = datetime.now(timezone.utc)
         self._set_strategy(strat)
+        self.profiler.reset()
 
         strategy_safe_wrapper(self.strategy.bot_loop_start, supress_error=True)()
 
@@ -449,32 +1034,38 @@ class Backtesting:
                 'Ignoring max_open_trades (--disable-max-market-positions was used) ...')
             max_open_trades = 0
 
-        # need to reprocess data every time to populate signals
-        preprocessed = self.strategy.ohlcvdata_to_dataframe(data)
-
-        # Trim startup period from analyzed dataframe
-        for pair, df in preprocessed.items():
-            preprocessed[pair] = trim_dataframe(df, timerange,
-                                                startup_candles=self.required_startup)
-        min_date, max_date = history.get_timerange(preprocessed)
-
-        logger.info(f'Backtesting with data from {min_date.strftime(DATETIME_PRINT_FORMAT)} '
-                    f'up to {max_date.strftime(DATETIME_PRINT_FORMAT)} '
-                    f'({(max_date - min_date).days} days)..')
-        # Execute backtest and store results
-        results = self.backtest(
-            processed=preprocessed,
-            start_date=min_date.datetime,
-            end_date=max_date.datetime,
-            max_open_trades=max_open_trades,
-            position_stacking=self.config.get('position_stacking', False),
-            enable_protections=self.config.get('enable_protections', False),
-        )
+        if self.config.get('backtest_shards', 1) > 1 and self._supports_sharding():
+            min_date, max_date, results = self._backtest_sharded(data, timerange,
+                                                                 max_open_trades)
+        else:
+            # need to reprocess data every time to populate signals
+            preprocessed = self.populate_indicators(data)
+
+            # Trim startup period from analyzed dataframe
+            for pair, df in preprocessed.items():
+                preprocessed[pair] = trim_dataframe(df, timerange,
+                                                    startup_candles=self.required_startup)
+            min_date, max_date = history.get_timerange(preprocessed)
+
+            logger.info(f'Backtesting with data from {min_date.strftime(DATETIME_PRINT_FORMAT)} '
+                        f'up to {max_date.strftime(DATETIME_PRINT_FORMAT)} '
+                        f'({(max_date - min_date).days} days)..')
+            # Execute backtest and store results
+            results = self.backtest(
+                processed=preprocessed,
+                start_date=min_date.datetime,
+                end_date=max_date.datetime,
+                max_open_trades=max_open_trades,
+                position_stacking=self.config.get('position_stacking', False),
+                enable_protections=self.config.get('enable_protections', False),
+            )
         backtest_end_time = datetime.now(timezone.utc)
         results.update({
             'backtest_start_time': int(backtest_start_time.timestamp()),
             'backtest_end_time': int(backtest_end_time.timestamp()),
         })
+        if self.profiler.enabled:
+            results['profile'] = self.profiler.to_dict()
         self.all_results[self.strategy.get_strategy_name()] = results
 
         return min_date, max_date
@@ -484,19 +1075,40 @@ class Backtesting:
         Run backtesting end-to-end
         :return: None
         """
+        with cprofile(self.config, 'backtest_results', 'backtest'):
+            self._start()
+
+    def _start(self) -> None:
         data: Dict[str, Any] = {}
 
+        self.profiler.reset()
         data, timerange = self.load_bt_data()
+        load_profile = self.profiler.to_dict()
         logger.info("Dataload complete. Calculating indicators")
 
-        for strat in self.strategylist:
-            min_date, max_date = self.backtest_one_strategy(strat, data, timerange)
+        # Sharded backtests use all worker processes for one strategy
+        if (self.config.get('backtest_workers', 1) > 1 and len(self.strategylist) > 1
+                and self.config.get('backtest_shards', 1) <= 1):
+            min_date, max_date = self._backtest_parallel(data, timerange)
+        else:
+            for strat in self.strategylist:
+                min_date, max_date = self.backtest_one_strategy(strat, data, timerange)
         if len(self.strategylist) > 0:
-            stats = generate_backtest_stats(data, self.all_results,
-                                            min_date=min_date, max_date=max_date)
+            self.profiler.reset()
+            with self.profiler.phase('generate_stats'):
+                stats = generate_backtest_stats(data, self.all_results,
+                                                min_date=min_date, max_date=max_date)
+            if self.profiler.enabled:
+                # Timings of the strategies are part of the strategy results
+                stats['profile'] = merge_profiles([load_profile, self.profiler.to_dict()])
 
             if self.config.get('export', False):
                 store_backtest_stats(self.config['exportfilename'], stats)
 
             # Show backtest results
             show_backtest_results(self.config, stats)
+            if self.profiler.enabled:
+                for strategy, results in stats['strategy'].items():
+                    if 'profile' in results:
+                        show_profile(results['profile'], f'TIMINGS {strategy}')
+                show_profile(stats['profile'], 'TIMINGS')
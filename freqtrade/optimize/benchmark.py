@@ -0,0 +1,351 @@
+"""
+Performance benchmark of the backtesting and hyperopt pipeline.
+
+Runs the sample strategy (and sample hyperopt) from freqtrade/templates on deterministic,
+synthetic candle data - so results of different runs (and machines) are comparable.
+No exchange connection is required, the markets of the synthetic pairs are generated as well.
+"""
+import logging
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice, product
+from pathlib import Path
+from string import ascii_uppercase
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import rapidjson
+from pandas import DataFrame, to_datetime
+
+from freqtrade import __version__
+from freqtrade.configuration import TimeRange
+from freqtrade.configuration.config_validation import validate_config_schema
+from freqtrade.configuration.directory_operations import create_userdata_dir
+from freqtrade.constants import DEFAULT_DATAFRAME_COLUMNS
+from freqtrade.data.converter import trim_dataframe
+from freqtrade.data.history import get_datahandler, get_timerange, load_data
+from freqtrade.exceptions import OperationalException
+from freqtrade.exchange import timeframe_to_seconds
+from freqtrade.misc import file_dump_json
+from freqtrade.optimize.backtesting import Backtesting
+from freqtrade.optimize.optimize_reports import generate_backtest_stats
+from freqtrade.state import RunMode
+
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_PAIRS = 10
+BENCHMARK_CANDLES = 10000
+BENCHMARK_EPOCHS = 10
+BENCHMARK_TIMEFRAME = '5m'
+BENCHMARK_RANDOM_STATE = 1
+BENCHMARK_START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+BENCHMARK_STAKE_CURRENCY = 'USDT'
+# Relative slowdown against the baseline which is reported as regression
+BENCHMARK_TOLERANCE = 0.2
+
+TEMPLATES_PATH = Path(__file__).parent.parent / 'templates'
+
+
+def synthetic_pairs(count: int, stake_currency: str = BENCHMARK_STAKE_CURRENCY) -> List[str]:
+    """
+    Names of synthetic pairs (AAA/USDT, AAB/USDT, ...)
+    """
+    return [f"{''.join(base)}/{stake_currency}"
+            for base in islice(product(ascii_uppercase, repeat=3), count)]
+
+
+def synthetic_markets(pairs: List[str]) -> Dict[str, Any]:
+    """
+    Markets for the synthetic pairs, in the format returned by ccxt
+    """
+    markets = {}
+    for pair in pairs:
+        base, quote = pair.split('/')
+        markets[pair] = {
+            'id': f'{base}{quote}'.lower(),
+            'symbol': pair,
+            'base': base,
+            'quote': quote,
+            'active': True,
+            'spot': True,
+            'type': 'spot',
+            'precision': {'price': 8, 'amount': 8},
+            'limits': {'amount': {'min': 0.00001}, 'cost': {'min': 0.0001}},
+            'info': {},
+        }
+    return markets
+
+
+def generate_ohlcv(candles: int, timeframe: str, seed: int,
+                   start: datetime = BENCHMARK_START) -> DataFrame:
+    """
+    Generate deterministic candle data (a random walk) - the same seed gives the same data.
+    :param candles: Number of candles
+    :param timeframe: Timeframe of the candles
+    :param seed: Random seed
+    :param start: Date of the first candle
+    :return: Dataframe with OHLCV data
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, candles)))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    wicks = np.abs(rng.normal(0, 0.002, (2, candles)))
+    step_ms = timeframe_to_seconds(timeframe) * 1000
+    dates = int(start.timestamp() * 1000) + np.arange(candles, dtype='int64') * step_ms
+    return DataFrame({
+        'date': to_datetime(dates, unit='ms', utc=True),
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + wicks[0]),
+        'low': np.minimum(open_, close) * (1 - wicks[1]),
+        'close': close,
+        'volume': rng.lognormal(10, 1, candles),
+    }, columns=DEFAULT_DATAFRAME_COLUMNS)
+
+
+def get_benchmark_config(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Configuration used for the benchmark. Independent of the user configuration,
+    so results only depend on the benchmark parameters.
+    :param args: Cli args from Arguments()
+    """
+    epochs = args.get('benchmark_epochs')
+    if epochs is None:
+        epochs = BENCHMARK_EPOCHS
+    if epochs < 0:
+        raise OperationalException("Number of epochs must not be negative.")
+    random_state = args.get('hyperopt_random_state')
+    if random_state is None:
+        random_state = BENCHMARK_RANDOM_STATE
+    pairs = synthetic_pairs(args.get('benchmark_pairs') or BENCHMARK_PAIRS)
+    markets = synthetic_markets(pairs)
+    config = {
+        'runmode': RunMode.BACKTEST,
+        'dry_run': True,
+        'max_open_trades': 5,
+        'stake_currency': BENCHMARK_STAKE_CURRENCY,
+        'stake_amount': 100,
+        'dry_run_wallet': 1000,
+        'fee': 0.001,
+        'timeframe': args.get('timeframe') or BENCHMARK_TIMEFRAME,
+        'backtest_engine': args.get('backtest_engine') or 'loop',
+        'dataformat_ohlcv': args.get('dataformat_ohlcv') or 'json',
+        'dataformat_trades': 'jsongz',
+        'exchange': {
+            'name': 'binance',
+            'key': '',
+            'secret': '',
+            'pair_whitelist': pairs,
+            'pair_blacklist': [],
+            # Markets are known to ccxt - so no connection to the exchange is made
+            'ccxt_config': {'markets': markets},
+            'ccxt_async_config': {'markets': markets},
+        },
+        'pairlists': [{'method': 'StaticPairList'}],
+        'strategy': 'SampleStrategy',
+        'strategy_path': str(TEMPLATES_PATH),
+        'hyperopt': 'SampleHyperOpt',
+        'hyperopt_path': str(TEMPLATES_PATH),
+        'hyperopt_loss': 'SharpeHyperOptLoss',
+        'hyperopt_min_trades': 1,
+        'spaces': ['default'],
+        'epochs': epochs,
+        'hyperopt_random_state': random_state,
+        'benchmark_candles': args.get('benchmark_candles') or BENCHMARK_CANDLES,
+        'benchmark_baseline': args.get('benchmark_baseline'),
+        'exportfilename': args.get('benchmark_exportfilename'),
+        'internals': {},
+    }
+    return validate_config_schema(config)
+
+
+def peak_rss() -> Optional[float]:
+    """
+    Peak resident set size of this process in MB, or None if not available (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes on Linux
+    return maxrss / 1024 ** 2 if sys.platform == 'darwin' else maxrss / 1024
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float = BENCHMARK_TOLERANCE) -> List[str]:
+    """
+    Compare throughput and phase timings of a report with a baseline report.
+    :return: List of regressions (slower than the baseline by more than `tolerance`)
+    """
+    regressions = []
+    for key in ('candles_per_second', 'epochs_per_second'):
+        current, base = report.get(key), baseline.get(key)
+        if current and base and current < base * (1 - tolerance):
+            regressions.append(f"{key}: {current:.2f} (baseline: {base:.2f})")
+    for phase, base in baseline.get('timings', {}).items():
+        current = report['timings'].get(phase)
+        if current is not None and base and current > base * (1 + tolerance):
+            regressions.append(f"{phase}: {current:.3f}s (baseline: {base:.3f}s)")
+    return regressions
+
+
+class Benchmark:
+    """
+    Benchmark class - generates data and times all phases of backtesting and hyperopt.
+
+    To run a benchmark:
+    benchmark = Benchmark(config)
+    report = benchmark.start()
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self.pairs: List[str] = config['exchange']['pair_whitelist']
+        self.candles: int = config['benchmark_candles']
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def _timed(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.timings[phase] = self.timings.get(phase, 0) + time.perf_counter() - start
+        logger.info(f"Benchmark phase {phase} took {self.timings[phase]:.3f}s.")
+
+    def generate_data(self) -> None:
+        """
+        Store synthetic candles for all pairs in the configured data format.
+        """
+        handler = get_datahandler(self.config['datadir'], self.config['dataformat_ohlcv'])
+        for i, pair in enumerate(self.pairs):
+            data = generate_ohlcv(self.candles, self.config['timeframe'],
+                                  seed=self.config['hyperopt_random_state'] + i)
+            handler.ohlcv_store(pair, self.config['timeframe'], data)
+
+    def run_backtest(self) -> Dict[str, Any]:
+        """
+        Time the backtesting pipeline - loading data, analyzing, backtesting and statistics.
+        """
+        with self._timed('backtest_setup'):
+            backtesting = Backtesting(self.config)
+        with self._timed('load_data'):
+            data = load_data(datadir=self.config['datadir'], pairs=self.pairs,
+                             timeframe=self.config['timeframe'],
+                             data_format=self.config['dataformat_ohlcv'],
+                             workers=self.config.get('dataload_workers', 1))
+        with self._timed('analyze'):
+            preprocessed = backtesting.strategy.ohlcvdata_to_dataframe(data)
+            for pair, df in preprocessed.items():
+                preprocessed[pair] = trim_dataframe(
+                    df, TimeRange(), startup_candles=backtesting.required_startup)
+        min_date, max_date = get_timerange(preprocessed)
+        with self._timed('backtest'):
+            backtest_start_time = datetime.now(timezone.utc)
+            results = backtesting.backtest(
+                processed=preprocessed, start_date=min_date.datetime, end_date=max_date.datetime,
+                max_open_trades=self.config['max_open_trades'])
+        results.update({
+            'backtest_start_time': int(backtest_start_time.timestamp()),
+            'backtest_end_time': int(datetime.now(timezone.utc).timestamp()),
+        })
+        with self._timed('backtest_stats'):
+            generate_backtest_stats(data, {backtesting.strategy.get_strategy_name(): results},
+                                    min_date=min_date, max_date=max_date)
+        return {
+            'candles': sum(len(df) for df in preprocessed.values()),
+            'trades': len(results['results']),
+        }
+
+    def run_hyperopt(self) -> None:
+        """
+        Time hyperopt epochs, for random points of the hyperopt space.
+        """
+        try:
+            from freqtrade.optimize.hyperopt import Hyperopt
+            from freqtrade.optimize.hyperopt_data import dump_preprocessed
+        except ImportError as e:
+            raise OperationalException(
+                f"{e}. Please ensure that the hyperopt dependencies are installed.") from e
+        from skopt.space import Space
+
+        with self._timed('hyperopt_setup'):
+            hyperopt = Hyperopt(self.config)
+            hyperopt.init_spaces()
+            data = load_data(datadir=self.config['datadir'], pairs=self.pairs,
+                             timeframe=self.config['timeframe'],
+                             data_format=self.config['dataformat_ohlcv'])
+            preprocessed = hyperopt.backtesting.strategy.ohlcvdata_to_dataframe(data)
+            for pair, df in preprocessed.items():
+                preprocessed[pair] = trim_dataframe(
+                    df, TimeRange(), startup_candles=hyperopt.backtesting.required_startup)
+            hyperopt.min_date, hyperopt.max_date = get_timerange(preprocessed)
+            dump_preprocessed(preprocessed, hyperopt.data_directory)
+            points = Space(hyperopt.dimensions).rvs(
+                self.config['epochs'], random_state=self.config['hyperopt_random_state'])
+
+        with self._timed('hyperopt_epochs'):
+            for i, point in enumerate(points):
+                hyperopt.generate_optimizer(point, i)
+
+    def start(self) -> Dict[str, Any]:
+        """
+        Run the benchmark end-to-end
+        :return: Benchmark report
+        """
+        with tempfile.TemporaryDirectory(prefix='freqtrade_benchmark_') as tmpdir:
+            self.config['user_data_dir'] = create_userdata_dir(tmpdir)
+            self.config['datadir'] = self.config['user_data_dir'] / 'data'
+
+            with self._timed('generate_data'):
+                self.generate_data()
+            backtest = self.run_backtest()
+            if self.config['epochs']:
+                self.run_hyperopt()
+
+        report = {
+            'freqtrade_version': __version__,
+            'python_version': platform.python_version(),
+            'platform': platform.platform(),
+            'parameters': {
+                'pairs': len(self.pairs),
+                'candles': self.candles,
+                'timeframe': self.config['timeframe'],
+                'epochs': self.config['epochs'],
+                'strategy': self.config['strategy'],
+                'hyperopt': self.config['hyperopt'],
+                'backtest_engine': self.config['backtest_engine'],
+                'dataformat_ohlcv': self.config['dataformat_ohlcv'],
+                'random_state': self.config['hyperopt_random_state'],
+            },
+            'timings': self.timings,
+            'candles': backtest['candles'],
+            'trades': backtest['trades'],
+            'candles_per_second': backtest['candles'] / self.timings['backtest'],
+            'epochs_per_second': (self.config['epochs'] / self.timings['hyperopt_epochs']
+                                  if self.config['epochs'] else None),
+            'peak_rss_mb': peak_rss(),
+        }
+        self.show_report(report)
+        return report
+
+    def show_report(self, report: Dict[str, Any]) -> None:
+        """
+        Print the report, store it and compare it with the baseline.
+        :raises OperationalException: If slower than the baseline.
+        """
+        print(rapidjson.dumps(report, indent=2, number_mode=rapidjson.NM_NATIVE))
+        if self.config.get('exportfilename'):
+            file_dump_json(Path(self.config['exportfilename']), report)
+
+        if self.config.get('benchmark_baseline'):
+            with Path(self.config['benchmark_baseline']).open('r') as file:
+                baseline = rapidjson.load(file, number_mode=rapidjson.NM_NATIVE)
+            regressions = compare_to_baseline(report, baseline)
+            if regressions:
+                raise OperationalException(
+                    "Benchmark is slower than the baseline:\n" + "\n".join(regressions))
+            logger.info("Benchmark is within the tolerance of the baseline.")
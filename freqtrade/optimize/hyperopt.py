@@ -6,12 +6,15 @@ This module contains the hyperopt logic
 
 import logging
 import random
+import shutil
 import warnings
+from copy import copy
 from datetime import datetime, timezone
 from math import ceil
 from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from uuid import uuid4
 
 import progressbar
 from colorama import Fore, Style
@@ -26,10 +29,12 @@ from freqtrade.misc import file_dump_json, plural
 from freqtrade.optimize.backtesting import Backtesting
 # Import IHyperOpt and IHyperOptLoss to allow unpickling classes from these modules
 from freqtrade.optimize.hyperopt_auto import HyperOptAuto
+from freqtrade.optimize.hyperopt_data import dump_preprocessed, load_preprocessed
 from freqtrade.optimize.hyperopt_interface import IHyperOpt  # noqa: F401
 from freqtrade.optimize.hyperopt_loss_interface import IHyperOptLoss  # noqa: F401
 from freqtrade.optimize.hyperopt_tools import HyperoptTools
 from freqtrade.optimize.optimize_reports import generate_strategy_stats
+from freqtrade.optimize.profiling import cprofile, merge_profiles, show_profile
 from freqtrade.resolvers.hyperopt_resolver import HyperOptLossResolver, HyperOptResolver
 from freqtrade.strategy import IStrategy
 
@@ -53,6 +58,24 @@ SKOPT_MODEL_QUEUE_SIZE = 10
 
 MAX_LOSS = 100000  # just a big enough number to be bad result in loss optimization
 
+# Hyperopt instance of the current worker process, keyed by the id of the hyperopt run
+_worker_hyperopt: Dict[str, 'Hyperopt'] = {}
+
+
+def _generate_optimizer_worker(state_file: Path, state_id: str, raw_params: List[Any],
+                               iteration=None) -> Dict:
+    """
+    Evaluate one epoch in a worker process.
+    The Hyperopt instance (including Backtesting and the strategy) is loaded only for the
+    first epoch of a worker and reused afterwards - so epochs only transfer parameters.
+    """
+    hyperopt = _worker_hyperopt.get(state_id)
+    if hyperopt is None:
+        _worker_hyperopt.clear()
+        hyperopt = load(state_file)
+        _worker_hyperopt[state_id] = hyperopt
+    return hyperopt.generate_optimizer(raw_params, iteration)
+
 
 class Hyperopt:
     """
@@ -88,8 +111,10 @@ class Hyperopt:
         strategy = str(self.config['strategy'])
         self.results_file: Path = (self.config['user_data_dir'] / 'hyperopt_results' /
                                    f'strategy_{strategy}_hyperopt_results_{time_now}.pickle')
-        self.data_pickle_file = (self.config['user_data_dir'] /
-                                 'hyperopt_results' / 'hyperopt_tickerdata.pkl')
+        self.data_directory = (self.config['user_data_dir'] /
+                               'hyperopt_results' / 'hyperopt_tickerdata')
+        self.worker_state_file = self.data_directory / 'hyperopt_state.pkl'
+        self.worker_state_id: Optional[str] = None
         self.total_epochs = config.get('epochs', 0)
 
         self.current_best_loss = 100
@@ -140,11 +165,14 @@ class Hyperopt:
         """
         Remove hyperopt pickle files to restart hyperopt.
         """
-        for f in [self.data_pickle_file, self.results_file]:
+        for f in [self.results_file]:
             p = Path(f)
             if p.is_file():
                 logger.info(f"Removing `{p}`.")
                 p.unlink()
+        if self.data_directory.is_dir():
+            logger.info(f"Removing `{self.data_directory}`.")
+            shutil.rmtree(self.data_directory)
 
     def _get_params_dict(self, dimensions: List[Dimension], raw_params: List[Any]) -> Dict:
 
@@ -209,6 +237,16 @@ class Hyperopt:
             )
             self.hyperopt_table_header = 2
 
+    def print_profile(self, startup_profile: Dict[str, Any]) -> None:
+        """
+        Print the startup timings and the timings of all epochs
+        """
+        show_profile(startup_profile, 'STARTUP TIMINGS')
+        if self.epochs:
+            epochs = len(self.epochs)
+            show_profile(merge_profiles([epoch['profile'] for epoch in self.epochs]),
+                         f"TIMINGS OF {epochs} {plural(epochs, 'EPOCH', 'EPOCHS')}")
+
     def init_spaces(self):
         """
         Assign the dimensions in the hyperoptimization space.
@@ -242,6 +280,8 @@ class Hyperopt:
         Keep this function as optimized as possible!
         """
         backtest_start_time = datetime.now(timezone.utc)
+        profiler = self.backtesting.profiler
+        profiler.reset()
         params_dict = self._get_params_dict(self.dimensions, raw_params)
 
         # Apply parameters
@@ -269,35 +309,46 @@ class Hyperopt:
             self.backtesting.strategy.trailing_only_offset_is_reached = \
                 d['trailing_only_offset_is_reached']
 
-        processed = load(self.data_pickle_file)
-
-        bt_results = self.backtesting.backtest(
-            processed=processed,
-            start_date=self.min_date.datetime,
-            end_date=self.max_date.datetime,
-            max_open_trades=self.max_open_trades,
-            position_stacking=self.position_stacking,
-            enable_protections=self.config.get('enable_protections', False),
-        )
+        # Signals only depend on the buy / sell parameters, so epochs changing
+        # other spaces only can reuse the signals calculated by previous epochs.
+        self.backtesting.signal_key = tuple(params_dict[d.name]
+                                            for d in self.buy_space + self.sell_space)
+        with profiler.phase('load_preprocessed'):
+            processed = load_preprocessed(self.data_directory)
+
+        with profiler.phase('backtest'):
+            bt_results = self.backtesting.backtest(
+                processed=processed,
+                start_date=self.min_date.datetime,
+                end_date=self.max_date.datetime,
+                max_open_trades=self.max_open_trades,
+                position_stacking=self.position_stacking,
+                enable_protections=self.config.get('enable_protections', False),
+            )
         backtest_end_time = datetime.now(timezone.utc)
         bt_results.update({
             'backtest_start_time': int(backtest_start_time.timestamp()),
             'backtest_end_time': int(backtest_end_time.timestamp()),
         })
 
-        return self._get_results_dict(bt_results, self.min_date, self.max_date,
-                                      params_dict,
-                                      processed=processed)
+        results = self._get_results_dict(bt_results, self.min_date, self.max_date,
+                                         params_dict,
+                                         processed=processed)
+        if profiler.enabled:
+            results['profile'] = profiler.to_dict()
+        return results
 
     def _get_results_dict(self, backtesting_results, min_date, max_date,
                           params_dict, processed: Dict[str, DataFrame]
                           ) -> Dict[str, Any]:
         params_details = self._get_params_details(params_dict)
+        profiler = self.backtesting.profiler
 
-        strat_stats = generate_strategy_stats(
-            processed, self.backtesting.strategy.get_strategy_name(),
-            backtesting_results, min_date, max_date, market_change=0
-        )
+        with profiler.phase('generate_stats'):
+            strat_stats = generate_strategy_stats(
+                processed, self.backtesting.strategy.get_strategy_name(),
+                backtesting_results, min_date, max_date, market_change=0
+            )
         results_explanation = HyperoptTools.format_results_explanation_string(
             strat_stats, self.config['stake_currency'])
 
@@ -312,10 +363,12 @@ class Hyperopt:
         # path. We do not want to optimize 'hodl' strategies.
         loss: float = MAX_LOSS
         if trade_count >= self.config['hyperopt_min_trades']:
-            loss = self.calculate_loss(results=backtesting_results['results'],
-                                       trade_count=trade_count,
-                                       min_date=min_date.datetime, max_date=max_date.datetime,
-                                       config=self.config, processed=processed)
+            with profiler.phase('loss'):
+                loss = self.calculate_loss(results=backtesting_results['results'],
+                                           trade_count=trade_count,
+                                           min_date=min_date.datetime,
+                                           max_date=max_date.datetime,
+                                           config=self.config, processed=processed)
         return {
             'loss': loss,
             'params_dict': params_dict,
@@ -337,22 +390,43 @@ class Hyperopt:
             model_queue_size=SKOPT_MODEL_QUEUE_SIZE,
         )
 
+    def _dump_worker_state(self) -> str:
+        """
+        Store this instance for the worker processes, without optimizer and results.
+        :return: Id of the stored state
+        """
+        state = copy(self)
+        state.opt = None  # type: ignore
+        state.epochs = []
+        # Strategies and hyperopts are loaded from files, so they need cloudpickle.
+        dump(wrap_non_picklable_objects(state, keep_wrapper=False), self.worker_state_file)
+        return f'{self.worker_state_file}-{uuid4()}'
+
     def run_optimizer_parallel(self, parallel, asked, i) -> List:
-        return parallel(delayed(
-                        wrap_non_picklable_objects(self.generate_optimizer))(v, i) for v in asked)
+        if not self.worker_state_id:
+            self.worker_state_id = self._dump_worker_state()
+        return parallel(delayed(_generate_optimizer_worker)(
+            self.worker_state_file, self.worker_state_id, v, i) for v in asked)
 
     def _set_random_state(self, random_state: Optional[int]) -> int:
         return random_state or random.randint(1, 2**16 - 1)
 
     def start(self) -> None:
+        with cprofile(self.config, 'hyperopt_results',
+                      f"strategy_{self.config['strategy']}_hyperopt"):
+            self._start()
+
+    def _start(self) -> None:
         self.random_state = self._set_random_state(self.config.get('hyperopt_random_state', None))
         logger.info(f"Using optimizer random state: {self.random_state}")
         self.hyperopt_table_header = -1
         # Initialize spaces ...
         self.init_spaces()
+        profiler = self.backtesting.profiler
+        profiler.reset()
         data, timerange = self.backtesting.load_bt_data()
         logger.info("Dataload complete. Calculating indicators")
-        preprocessed = self.backtesting.strategy.ohlcvdata_to_dataframe(data)
+        preprocessed = self.backtesting.populate_indicators(data)
 
         # Trim startup period from analyzed dataframe
         for pair, df in preprocessed.items():
@@ -364,7 +438,12 @@ class Hyperopt:
                     f'up to {self.max_date.strftime(DATETIME_PRINT_FORMAT)} '
                     f'({(self.max_date - self.min_date).days} days)..')
 
-        dump(preprocessed, self.data_pickle_file)
+        with profiler.phase('dump_preprocessed'):
+            dump_preprocessed(preprocessed, self.data_directory)
+        startup_profile = profiler.to_dict()
+        self.backtesting.signal_cache.clear()
+        # Workers state is stored with the first epochs
+        self.worker_state_id = None
 
         # We don't need exchange instance anymore while running hyperopt
         self.backtesting.exchange.close()
@@ -468,3 +547,6 @@ class Hyperopt:
             # This is printed when Ctrl+C is pressed quickly, before first epochs have
             # a chance to be evaluated.
             print("No epochs evaluated yet, no best result.")
+
+        if profiler.enabled:
+            self.print_profile(startup_profile)
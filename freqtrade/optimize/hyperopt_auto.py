@@ -28,6 +28,7 @@ class HyperOptAuto(IHyperOpt):
                 if attr.optimize:
                     # noinspection PyProtectedMember
                     attr.value = params[attr_name]
+            dataframe = self.strategy.resolve_parameter_indicators(dataframe)
             return self.strategy.populate_buy_trend(dataframe, metadata)
 
         return populate_buy_trend
@@ -38,6 +39,7 @@ class HyperOptAuto(IHyperOpt):
                 if attr.optimize:
                     # noinspection PyProtectedMember
                     attr.value = params[attr_name]
+            dataframe = self.strategy.resolve_parameter_indicators(dataframe)
             return self.strategy.populate_sell_trend(dataframe, metadata)
 
         return populate_sell_trend
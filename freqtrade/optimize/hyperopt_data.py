@@ -0,0 +1,117 @@
+"""
+Storage of preprocessed (analyzed) dataframes shared by all hyperopt workers.
+
+Numeric columns are written once to .npy files, grouped by dtype (one 2D array per pair and
+dtype). Workers memory-map these files, so loading the data for an epoch does not read or
+copy it - all workers share the same pages through the operating system's page cache.
+Maps are opened copy-on-write, so strategies modifying the dataframe don't change the files.
+"""
+import logging
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from joblib import dump, load
+from pandas import DataFrame
+
+
+logger = logging.getLogger(__name__)
+
+METADATA_FILE = 'metadata.pkl'
+
+
+def _is_mappable(series: pd.Series) -> bool:
+    """
+    Only plain numpy dtypes (numbers, booleans, naive datetimes) can be memory-mapped.
+    """
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufM'
+
+
+def _dump_pair(directory: Path, pair_id: int, df: DataFrame) -> Dict[str, Any]:
+    """
+    Write one dataframe to `directory`.
+    :return: Metadata required to rebuild the dataframe.
+    """
+    meta: Dict[str, Any] = {'columns': list(df.columns), 'blocks': [], 'utc': []}
+    groups: Dict[str, List[Any]] = {}
+    other = []
+    for col in df.columns:
+        series = df[col]
+        if (isinstance(series.dtype, pd.DatetimeTZDtype) and str(series.dtype.tz) == 'UTC'):
+            # Stored as naive datetime, localized again when loading
+            meta['utc'].append(col)
+            series = series.dt.tz_localize(None)
+        if _is_mappable(series):
+            groups.setdefault(series.dtype.str, []).append((col, series))
+        else:
+            other.append(col)
+
+    for block_id, (dtype, items) in enumerate(groups.items()):
+        filename = f'{pair_id}_{block_id}.npy'
+        np.save(directory / filename,
+                np.vstack([s.to_numpy(dtype=dtype) for _, s in items]), allow_pickle=False)
+        meta['blocks'].append((filename, [col for col, _ in items]))
+
+    if isinstance(df.index, pd.RangeIndex):
+        meta['index'] = (df.index.start, df.index.stop, df.index.step)
+    else:
+        meta['index'] = f'{pair_id}_index.npy'
+        np.save(directory / meta['index'], df.index.to_numpy(), allow_pickle=False)
+
+    # Columns which can't be mapped (e.g. strings) are loaded from a pickle
+    meta['other'] = None
+    if other:
+        meta['other'] = f'{pair_id}_other.pkl'
+        dump(df[other], directory / meta['other'])
+    return meta
+
+
+def dump_preprocessed(preprocessed: Dict[str, DataFrame], directory: Path) -> None:
+    """
+    Store preprocessed dataframes in `directory`, replacing previous contents.
+    :param preprocessed: Dict of analyzed dataframes, with the pair as key
+    :param directory: Directory to use - will be created
+    """
+    if directory.is_dir():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+
+    metadata = {pair: _dump_pair(directory, pair_id, df)
+                for pair_id, (pair, df) in enumerate(preprocessed.items())}
+    dump(metadata, directory / METADATA_FILE)
+
+
+def _load_pair(directory: Path, meta: Dict[str, Any]) -> DataFrame:
+    columns: Dict[str, Any] = {}
+    for filename, block_columns in meta['blocks']:
+        block = np.load(directory / filename, mmap_mode='c', allow_pickle=False)
+        for i, col in enumerate(block_columns):
+            columns[col] = block[i]
+
+    if isinstance(meta['index'], tuple):
+        index = pd.RangeIndex(*meta['index'])
+    else:
+        index = pd.Index(np.load(directory / meta['index'], mmap_mode='c', allow_pickle=False))
+
+    if meta['other']:
+        other = load(directory / meta['other'])
+        columns.update({col: other[col].array for col in other.columns})
+
+    for col in meta['utc']:
+        columns[col] = pd.DatetimeIndex(columns[col]).tz_localize('UTC')
+
+    # copy=False keeps the memory-mapped arrays, one block per column.
+    return DataFrame({col: columns[col] for col in meta['columns']}, index=index, copy=False)
+
+
+def load_preprocessed(directory: Path) -> Dict[str, DataFrame]:
+    """
+    Load dataframes stored by dump_preprocessed().
+    Numeric columns are memory-mapped - so this call is cheap and doesn't copy data.
+    :param directory: Directory used in dump_preprocessed()
+    :return: Dict of dataframes, with the pair as key
+    """
+    metadata = load(directory / METADATA_FILE)
+    return {pair: _load_pair(directory, meta) for pair, meta in metadata.items()}
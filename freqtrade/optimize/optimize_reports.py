@@ -424,6 +424,9 @@ def generate_strategy_stats(btdata: Dict[str, DataFrame],
             'csum_max': 0
         })
 
+    if 'profile' in content:
+        strat_stats['profile'] = content['profile']
+
     return strat_stats
 
 def generate_backtest_stats(btdata: Dict[str, DataFrame],
@@ -0,0 +1,149 @@
+"""
+Profiling of backtesting and hyperopt runs.
+
+Profiler records the wall time of named phases (data load, populate_indicators, ...),
+optionally per pair. Timers are only active with `--profile` - phases are coarse
+(per pair and backtest, never per candle), so a disabled profiler adds no measurable cost.
+With `--profile cprofile`, the complete run is additionally recorded with cProfile.
+"""
+import cProfile
+import logging
+import pstats
+from contextlib import contextmanager
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from tabulate import tabulate
+
+
+logger = logging.getLogger(__name__)
+
+# Number of functions shown for cProfile results
+CPROFILE_TOP_FUNCTIONS = 25
+
+
+class Profiler:
+    """
+    Accumulates the duration and number of calls of named phases.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        # {phase: {'calls': count, 'seconds': duration}}
+        self.phases: Dict[str, Dict[str, float]] = {}
+        # {pair: {phase: duration}}
+        self.pairs: Dict[str, Dict[str, float]] = {}
+
+    def add(self, phase: str, seconds: float, pair: Optional[str] = None) -> None:
+        timing = self.phases.setdefault(phase, {'calls': 0, 'seconds': 0.0})
+        timing['calls'] += 1
+        timing['seconds'] += seconds
+        if pair is not None:
+            pair_timings = self.pairs.setdefault(pair, {})
+            pair_timings[phase] = pair_timings.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, phase: str, pair: Optional[str] = None) -> Iterator[None]:
+        """
+        Time the enclosed block as `phase` (and for `pair`, if given).
+        """
+        if not self.enabled:
+            yield
+            return
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_counter() - start, pair)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Timings in the format stored in backtest results and hyperopt epochs.
+        """
+        return {'phases': deepcopy(self.phases), 'pairs': deepcopy(self.pairs)}
+
+
+def merge_profiles(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Sum the timings of multiple profiles (e.g. of all hyperopt epochs).
+    """
+    merged = Profiler(enabled=True)
+    for profile in profiles:
+        for phase, timing in profile.get('phases', {}).items():
+            merged_timing = merged.phases.setdefault(phase, {'calls': 0, 'seconds': 0.0})
+            merged_timing['calls'] += timing['calls']
+            merged_timing['seconds'] += timing['seconds']
+        for pair, pair_timings in profile.get('pairs', {}).items():
+            for phase, seconds in pair_timings.items():
+                merged_pair = merged.pairs.setdefault(pair, {})
+                merged_pair[phase] = merged_pair.get(phase, 0.0) + seconds
+    return merged.to_dict()
+
+
+def text_table_profile(profile: Dict[str, Any]) -> str:
+    """
+    Generates and returns a text table with the timings per phase
+    """
+    headers = ['Phase', 'Calls', 'Total (s)', 'Avg (ms)']
+    output = [[phase, timing['calls'], timing['seconds'],
+               timing['seconds'] / timing['calls'] * 1000 if timing['calls'] else 0]
+              for phase, timing in profile['phases'].items()]
+    return tabulate(output, headers=headers, tablefmt='orgtbl', stralign='right',
+                    floatfmt=('', 'd', '.3f', '.2f'))
+
+
+def text_table_profile_pairs(profile: Dict[str, Any]) -> str:
+    """
+    Generates and returns a text table with the timings per pair, slowest pairs first
+    """
+    phases = sorted({phase for timings in profile['pairs'].values() for phase in timings})
+    headers = ['Pair'] + [f'{phase} (s)' for phase in phases] + ['Total (s)']
+    output = [[pair] + [timings.get(phase, 0.0) for phase in phases] + [sum(timings.values())]
+              for pair, timings in profile['pairs'].items()]
+    output.sort(key=lambda line: line[-1], reverse=True)
+    return tabulate(output, headers=headers, tablefmt='orgtbl', stralign='right',
+                    floatfmt='.3f')
+
+
+def show_profile(profile: Dict[str, Any], title: str) -> None:
+    """
+    Print the timings per phase and per pair
+    """
+    table = text_table_profile(profile)
+    print(f' {title} '.center(len(table.splitlines()[0]), '='))
+    print(table)
+    if profile['pairs']:
+        table = text_table_profile_pairs(profile)
+        print(' TIMINGS PER PAIR '.center(len(table.splitlines()[0]), '='))
+        print(table)
+    print()
+
+
+@contextmanager
+def cprofile(config: Dict[str, Any], results_dir: str, prefix: str) -> Iterator[None]:
+    """
+    Record the enclosed block with cProfile if `--profile cprofile` is used.
+    Statistics are stored in `user_data_dir/<results_dir>` (for use with e.g. snakeviz)
+    and the most expensive functions are printed.
+    """
+    if config.get('profile') != 'cprofile':
+        yield
+        return
+    time_now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    filename = Path(config['user_data_dir']) / results_dir / f'{prefix}_profile_{time_now}.prof'
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(filename))
+        logger.info(f"cProfile statistics stored to {filename}")
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(CPROFILE_TOP_FUNCTIONS)
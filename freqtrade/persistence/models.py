@@ -2,6 +2,7 @@
 This module contains the class to persist trades into SQLite
 """
 import logging
+from bisect import bisect_right
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
@@ -195,6 +196,48 @@ class Order(_DECL_BASE):
         return Order.query.filter(Order.ft_is_open.is_(True)).all()
 
 
+class ClosedTrades():
+    """
+    Closed backtest trades.
+    Keeps the trades in insertion order, and additionally sorted by close date,
+    so trades closed after a date can be found by binary search.
+    """
+
+    def __init__(self) -> None:
+        self.trades: List['LocalTrade'] = []
+        # Trades with close date, sorted by close date
+        self.by_date: List['LocalTrade'] = []
+        self._dates: List[datetime] = []
+        # Number of trades not added at the end of by_date
+        self.inserts = 0
+
+    def add(self, trade: 'LocalTrade') -> None:
+        self.trades.append(trade)
+        if not trade.close_date:
+            return
+        if not self._dates or trade.close_date >= self._dates[-1]:
+            # Backtesting closes trades in chronological order
+            self._dates.append(trade.close_date)
+            self.by_date.append(trade)
+        else:
+            idx = bisect_right(self._dates, trade.close_date)
+            self._dates.insert(idx, trade.close_date)
+            self.by_date.insert(idx, trade)
+            self.inserts += 1
+
+    def index_after(self, close_date: datetime) -> int:
+        """
+        :return: Position of the first trade in by_date with close_date > close_date
+        """
+        return bisect_right(self._dates, close_date)
+
+    def closed_after(self, close_date: datetime) -> List['LocalTrade']:
+        """
+        :return: Trades with close_date > close_date, sorted by close date
+        """
+        return self.by_date[self.index_after(close_date):]
+
+
 class LocalTrade():
     """
     Trade database model.
@@ -203,7 +246,9 @@ class LocalTrade():
     """
     use_db: bool = False
     # Trades container for backtesting
-    trades: List['LocalTrade'] = []
+    trades_closed: ClosedTrades = ClosedTrades()
+    trades_closed_pair: Dict[str, ClosedTrades] = {}
+    trades: List['LocalTrade'] = trades_closed.trades
     trades_open: List['LocalTrade'] = []
     total_profit: float = 0
 
@@ -344,7 +389,9 @@ class LocalTrade():
         """
         Resets all trades. Only active for backtesting mode.
         """
-        LocalTrade.trades = []
+        LocalTrade.trades_closed = ClosedTrades()
+        LocalTrade.trades_closed_pair = {}
+        LocalTrade.trades = LocalTrade.trades_closed.trades
         LocalTrade.trades_open = []
         LocalTrade.total_profit = 0
 
@@ -581,6 +628,19 @@ class LocalTrade():
         """
 
         # Offline mode - without database
+        if is_open is False:
+            # Closed trades are indexed by pair and close date
+            if pair:
+                closed = LocalTrade.trades_closed_pair.get(pair) or ClosedTrades()
+            else:
+                closed = LocalTrade.trades_closed
+            # Always a new list - callers must not modify the index
+            sel_trades = (closed.closed_after(close_date) if close_date
+                          else list(closed.trades))
+            if open_date:
+                sel_trades = [trade for trade in sel_trades if trade.open_date > open_date]
+            return sel_trades
+
         if is_open is not None:
             if is_open:
                 sel_trades = LocalTrade.trades_open
@@ -603,8 +663,9 @@ class LocalTrade():
 
     @staticmethod
     def close_bt_trade(trade):
+        # Open trades are limited by max_open_trades - so removing from the list is cheap
         LocalTrade.trades_open.remove(trade)
-        LocalTrade.trades.append(trade)
+        LocalTrade._add_closed_trade(trade)
         LocalTrade.total_profit += trade.close_profit_abs
 
     @staticmethod
@@ -612,7 +673,14 @@ class LocalTrade():
         if trade.is_open:
             LocalTrade.trades_open.append(trade)
         else:
-            LocalTrade.trades.append(trade)
+            LocalTrade._add_closed_trade(trade)
+
+    @staticmethod
+    def _add_closed_trade(trade):
+        LocalTrade.trades_closed.add(trade)
+        if trade.pair not in LocalTrade.trades_closed_pair:
+            LocalTrade.trades_closed_pair[trade.pair] = ClosedTrades()
+        LocalTrade.trades_closed_pair[trade.pair].add(trade)
 
     @staticmethod
     def get_open_trades() -> List[Any]:
@@ -1,6 +1,7 @@
 import logging
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from freqtrade.exchange import timeframe_to_next_date
 from freqtrade.persistence.models import PairLock
@@ -9,6 +10,41 @@ from freqtrade.persistence.models import PairLock
 logger = logging.getLogger(__name__)
 
 
+class PairLockIndex():
+    """
+    Locks of one pair, sorted by lock_end_time.
+    Used instead of the database in backtesting, so looking up locks doesn't
+    require scanning all locks created so far.
+    """
+
+    def __init__(self) -> None:
+        self.end_times: List[datetime] = []
+        self.locks: List[PairLock] = []
+
+    def add(self, lock: PairLock) -> None:
+        idx = bisect_right(self.end_times, lock.lock_end_time)
+        self.end_times.insert(idx, lock.lock_end_time)
+        self.locks.insert(idx, lock)
+
+    def get(self, now: datetime) -> List[PairLock]:
+        """
+        :return: Active locks with lock_end_time >= now
+        """
+        # The last lock is the "locked until" horizon of the pair
+        if not self.end_times or self.end_times[-1] < now:
+            return []
+        idx = bisect_left(self.end_times, now)
+        return [lock for lock in self.locks[idx:] if lock.active]
+
+    def compact(self, now: Optional[datetime] = None) -> None:
+        """
+        Remove released locks, and locks which expired before now.
+        """
+        idx = bisect_left(self.end_times, now) if now else 0
+        self.locks = [lock for lock in self.locks[idx:] if lock.active]
+        self.end_times = [lock.lock_end_time for lock in self.locks]
+
+
 class PairLocks():
     """
     Pairlocks middleware class
@@ -17,7 +53,9 @@ class PairLocks():
     """
 
     use_db = True
+    # All locks, and active locks by pair - without database only
     locks: List[PairLock] = []
+    locks_by_pair: Dict[str, PairLockIndex] = {}
 
     timeframe: str = ''
 
@@ -28,13 +66,16 @@ class PairLocks():
         """
         if not PairLocks.use_db:
             PairLocks.locks = []
+            PairLocks.locks_by_pair = {}
 
     @staticmethod
     def lock_pair(pair: str, until: datetime, reason: str = None, *, now: datetime = None) -> None:
         """
         Create PairLock from now to "until".
         Uses database by default, unless PairLocks.use_db is set to False,
-        in which case a list is maintained.
+        in which case a list and an index by pair is maintained.
+        Locks are assumed to be created in chronological order (as in backtesting) - so locks of
+        this pair which expired before `now` are removed from the index.
         :param pair: pair to lock. use '*' to lock all pairs
         :param until: End time of the lock. Will be rounded up to the next candle.
         :param reason: Reason string that will be shown as reason for the lock
@@ -52,6 +93,12 @@ class PairLocks():
             PairLock.query.session.flush()
         else:
             PairLocks.locks.append(lock)
+            if pair not in PairLocks.locks_by_pair:
+                PairLocks.locks_by_pair[pair] = PairLockIndex()
+            index = PairLocks.locks_by_pair[pair]
+            if now:
+                index.compact(now)
+            index.add(lock)
 
     @staticmethod
     def get_pair_locks(pair: Optional[str], now: Optional[datetime] = None) -> List[PairLock]:
@@ -66,13 +113,11 @@ class PairLocks():
 
         if PairLocks.use_db:
             return PairLock.query_pair_locks(pair, now).all()
+        elif pair is None:
+            return [lock for index in PairLocks.locks_by_pair.values() for lock in index.get(now)]
         else:
-            locks = [lock for lock in PairLocks.locks if (
-                lock.lock_end_time >= now
-                and lock.active is True
-                and (pair is None or lock.pair == pair)
-            )]
-            return locks
+            index = PairLocks.locks_by_pair.get(pair)
+            return index.get(now) if index else []
 
     @staticmethod
     def get_pair_longest_lock(pair: str, now: Optional[datetime] = None) -> Optional[PairLock]:
@@ -100,6 +145,8 @@ class PairLocks():
             lock.active = False
         if PairLocks.use_db:
             PairLock.query.session.flush()
+        elif pair in PairLocks.locks_by_pair:
+            PairLocks.locks_by_pair[pair].compact()
 
     @staticmethod
     def is_global_lock(now: Optional[datetime] = None) -> bool:
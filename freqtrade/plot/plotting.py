@@ -51,6 +51,7 @@ def init_plotscript(config, markets: List, startup_candles: int = 0):
         timerange=timerange,
         startup_candles=startup_candles,
         data_format=config.get('dataformat_ohlcv', 'json'),
+        workers=config.get('dataload_workers', 1),
     )
 
     if startup_candles and data:
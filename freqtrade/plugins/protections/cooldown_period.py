@@ -1,8 +1,7 @@
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from freqtrade.persistence import Trade
 from freqtrade.plugins.protections import IProtection, ProtectionReturn
 
 
@@ -30,18 +29,10 @@ class CooldownPeriod(IProtection):
         """
         Get last trade for this pair
         """
-        look_back_until = date_now - timedelta(minutes=self._stop_duration)
-        # filters = [
-        #     Trade.is_open.is_(False),
-        #     Trade.close_date > look_back_until,
-        #     Trade.pair == pair,
-        # ]
-        # trade = Trade.get_trades(filters).first()
-        trades = Trade.get_trades_proxy(pair=pair, is_open=False, close_date=look_back_until)
-        if trades:
-            # Get latest trade
-            # Ignore type error as we know we only get closed trades.
-            trade = sorted(trades, key=lambda t: t.close_date)[-1]  # type: ignore
+        window = self.get_trade_window(date_now, self._stop_duration, pair)
+        if window.trades:
+            # Trades are sorted by close date
+            trade = window.trades[-1]
             self.log_once(f"Cooldown for {pair} for {self.stop_duration_str}.", logger.info)
             until = self.calculate_lock_end([trade], self._stop_duration)
 
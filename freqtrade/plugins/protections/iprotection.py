@@ -1,19 +1,74 @@
 
 import logging
 from abc import ABC, abstractmethod
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from freqtrade.exchange import timeframe_to_minutes
 from freqtrade.misc import plural
 from freqtrade.mixins import LoggingMixin
-from freqtrade.persistence import LocalTrade
+from freqtrade.persistence import LocalTrade, Trade
+from freqtrade.persistence.models import ClosedTrades
+from freqtrade.strategy.interface import SellType
 
 
 logger = logging.getLogger(__name__)
 
 ProtectionReturn = Tuple[bool, Optional[datetime], Optional[str]]
 
+STOPLOSS_SELL_REASONS = (SellType.TRAILING_STOP_LOSS.value, SellType.STOP_LOSS.value,
+                         SellType.STOPLOSS_ON_EXCHANGE.value)
+
+
+class TradeWindow():
+    """
+    Closed trades of a lookback period, sorted by close date,
+    together with stoploss counts which are updated with every trade added or removed.
+    """
+
+    def __init__(self, source: Optional[ClosedTrades] = None) -> None:
+        self.trades: Deque[LocalTrade] = deque()
+        # Losing trades sold by stoploss, and the latest of them
+        self.stoplosses = 0
+        self.last_stoploss: Optional[LocalTrade] = None
+
+        # Backtesting only - trades are taken from source.by_date
+        self.source = source
+        self.inserts = source.inserts if source else 0
+        self.position = 0
+        self.look_back_until: Optional[datetime] = None
+
+    @property
+    def profit(self) -> float:
+        """
+        Sum of close_profit - summed up on every call, so it doesn't depend on the trades
+        added and removed before.
+        """
+        return sum(trade.close_profit for trade in self.trades if trade.close_profit)
+
+    @staticmethod
+    def is_stoploss(trade: LocalTrade) -> bool:
+        return bool(str(trade.sell_reason) in STOPLOSS_SELL_REASONS
+                    and trade.close_profit and trade.close_profit < 0)
+
+    def add(self, trade: LocalTrade) -> None:
+        self.trades.append(trade)
+        if self.is_stoploss(trade):
+            self.stoplosses += 1
+            self.last_stoploss = trade
+
+    def remove_until(self, look_back_until: datetime) -> None:
+        """
+        Remove trades closed at or before look_back_until.
+        """
+        while self.trades and self.trades[0].close_date <= look_back_until:  # type: ignore
+            trade = self.trades.popleft()
+            if self.is_stoploss(trade):
+                self.stoplosses -= 1
+        if not self.stoplosses:
+            self.last_stoploss = None
+
 
 class IProtection(LoggingMixin, ABC):
 
@@ -39,6 +94,9 @@ class IProtection(LoggingMixin, ABC):
             self._lookback_period_candles = None
             self._lookback_period = protection_config.get('lookback_period', 60)
 
+        # Trade windows per pair (None for all pairs) - kept between calls in backtesting
+        self._trade_windows: Dict[Optional[str], TradeWindow] = {}
+
         LoggingMixin.__init__(self, logger)
 
     @property
@@ -92,6 +150,47 @@ class IProtection(LoggingMixin, ABC):
             If true, this pair will be locked with <reason> until <until>
         """
 
+    def get_trade_window(self, date_now: datetime, lookback: int,
+                         pair: Optional[str] = None) -> TradeWindow:
+        """
+        Get the trades closed within the last `lookback` minutes.
+        In backtesting, the window of the previous call is moved forward - so only trades
+        closed since then are added, and only trades leaving the lookback period are removed.
+        :param date_now: Current date
+        :param lookback: Lookback period in minutes
+        :param pair: Only trades of this pair, all trades if None
+        """
+        look_back_until = date_now - timedelta(minutes=lookback)
+        if Trade.use_db:
+            window = TradeWindow()
+            trades = Trade.get_trades_proxy(pair=pair, is_open=False, close_date=look_back_until)
+            for trade in sorted(trades, key=lambda t: t.close_date):  # type: ignore
+                window.add(trade)
+            return window
+
+        if pair:
+            source = LocalTrade.trades_closed_pair.get(pair)
+        else:
+            source = LocalTrade.trades_closed
+        previous = self._trade_windows.get(pair)
+        if (previous and previous.source is source
+                and (not source or previous.inserts == source.inserts)
+                and (not previous.look_back_until or look_back_until >= previous.look_back_until)):
+            window = previous
+        else:
+            # First call, reset trades, trades added out of order or time moving backwards
+            window = TradeWindow(source)
+            window.position = source.index_after(look_back_until) if source else 0
+            self._trade_windows[pair] = window
+
+        if source:
+            for trade in source.by_date[window.position:]:
+                window.add(trade)
+            window.position = len(source.by_date)
+        window.remove_until(look_back_until)
+        window.look_back_until = look_back_until
+        return window
+
     @staticmethod
     def calculate_lock_end(trades: List[LocalTrade], stop_minutes: int) -> datetime:
         """
@@ -1,9 +1,8 @@
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict
 
-from freqtrade.persistence import Trade
 from freqtrade.plugins.protections import IProtection, ProtectionReturn
 
 
@@ -39,26 +38,16 @@ class LowProfitPairs(IProtection):
         """
         Evaluate recent trades for pair
         """
-        look_back_until = date_now - timedelta(minutes=self._lookback_period)
-        # filters = [
-        #     Trade.is_open.is_(False),
-        #     Trade.close_date > look_back_until,
-        # ]
-        # if pair:
-        #     filters.append(Trade.pair == pair)
-
-        trades = Trade.get_trades_proxy(pair=pair, is_open=False, close_date=look_back_until)
-        # trades = Trade.get_trades(filters).all()
-        if len(trades) < self._trade_limit:
-            # Not enough trades in the relevant period
+        window = self.get_trade_window(date_now, self._lookback_period, pair)
+        if len(window.trades) < self._trade_limit:
             return False, None, None
 
-        profit = sum(trade.close_profit for trade in trades if trade.close_profit)
+        profit = window.profit
         if profit < self._required_profit:
             self.log_once(
                 f"Trading for {pair} stopped due to {profit:.2f} < {self._required_profit} "
                 f"within {self._lookback_period} minutes.", logger.info)
-            until = self.calculate_lock_end(trades, self._stop_duration)
+            until = self.calculate_lock_end([window.trades[-1]], self._stop_duration)
 
             return True, until, self._reason(profit)
 
@@ -1,12 +1,9 @@
 
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Dict, Iterable
 
-import pandas as pd
-
-from freqtrade.data.btanalysis import calculate_max_drawdown
-from freqtrade.persistence import Trade
+from freqtrade.persistence import LocalTrade
 from freqtrade.plugins.protections import IProtection, ProtectionReturn
 
 
@@ -39,31 +36,39 @@ class MaxDrawdown(IProtection):
         return (f'{drawdown} > {self._max_allowed_drawdown} in {self.lookback_period_str}, '
                 f'locking for {self.stop_duration_str}.')
 
+    @staticmethod
+    def _calculate_drawdown(trades: Iterable[LocalTrade]) -> float:
+        """
+        Max drawdown of the cumulative close_profit of trades (sorted by close date).
+        Same result as calculate_max_drawdown(), without creating dataframes.
+        """
+        cumulative = high = drawdown = 0.0
+        for i, trade in enumerate(trades):
+            cumulative += trade.close_profit or 0.0
+            high = cumulative if i == 0 else max(high, cumulative)
+            drawdown = max(drawdown, high - cumulative)
+        return drawdown
+
     def _max_drawdown(self, date_now: datetime) -> ProtectionReturn:
         """
         Evaluate recent trades for drawdown ...
         """
-        look_back_until = date_now - timedelta(minutes=self._lookback_period)
-
-        trades = Trade.get_trades_proxy(is_open=False, close_date=look_back_until)
-
-        trades_df = pd.DataFrame([trade.to_json() for trade in trades])
-
-        if len(trades) < self._trade_limit:
+        window = self.get_trade_window(date_now, self._lookback_period)
+        if len(window.trades) < self._trade_limit:
             # Not enough trades in the relevant period
             return False, None, None
 
         # Drawdown is always positive
-        try:
-            drawdown, _, _, _, _ = calculate_max_drawdown(trades_df, value_col='close_profit')
-        except ValueError:
+        drawdown = self._calculate_drawdown(window.trades)
+        if not drawdown:
+            # No losing trade, therefore no drawdown
             return False, None, None
 
         if drawdown > self._max_allowed_drawdown:
             self.log_once(
                 f"Trading stopped due to Max Drawdown {drawdown:.2f} > {self._max_allowed_drawdown}"
                 f" within {self.lookback_period_str}.", logger.info)
-            until = self.calculate_lock_end(trades, self._stop_duration)
+            until = self.calculate_lock_end([window.trades[-1]], self._stop_duration)
 
             return True, until, self._reason(drawdown)
 
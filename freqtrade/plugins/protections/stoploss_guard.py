@@ -1,11 +1,9 @@
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict
 
-from freqtrade.persistence import Trade
 from freqtrade.plugins.protections import IProtection, ProtectionReturn
-from freqtrade.strategy.interface import SellType
 
 
 logger = logging.getLogger(__name__)
@@ -40,30 +38,13 @@ class StoplossGuard(IProtection):
         """
         Evaluate recent trades
         """
-        look_back_until = date_now - timedelta(minutes=self._lookback_period)
-        # filters = [
-        #     Trade.is_open.is_(False),
-        #     Trade.close_date > look_back_until,
-        #     or_(Trade.sell_reason == SellType.STOP_LOSS.value,
-        #         and_(Trade.sell_reason == SellType.TRAILING_STOP_LOSS.value,
-        #              Trade.close_profit < 0))
-        # ]
-        # if pair:
-        #     filters.append(Trade.pair == pair)
-        # trades = Trade.get_trades(filters).all()
-
-        trades1 = Trade.get_trades_proxy(pair=pair, is_open=False, close_date=look_back_until)
-        trades = [trade for trade in trades1 if (str(trade.sell_reason) in (
-                    SellType.TRAILING_STOP_LOSS.value, SellType.STOP_LOSS.value,
-                    SellType.STOPLOSS_ON_EXCHANGE.value)
-                      and trade.close_profit and trade.close_profit < 0)]
-
-        if len(trades) < self._trade_limit:
+        window = self.get_trade_window(date_now, self._lookback_period, pair)
+        if window.stoplosses < self._trade_limit or not window.last_stoploss:
             return False, None, None
 
         self.log_once(f"Trading stopped due to {self._trade_limit} "
                       f"stoplosses within {self._lookback_period} minutes.", logger.info)
-        until = self.calculate_lock_end(trades, self._stop_duration)
+        until = self.calculate_lock_end([window.last_stoploss], self._stop_duration)
         return True, until, self._reason()
 
     def global_stop(self, date_now: datetime) -> ProtectionReturn:
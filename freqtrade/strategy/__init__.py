@@ -2,6 +2,8 @@
 from freqtrade.exchange import (timeframe_to_minutes, timeframe_to_msecs, timeframe_to_next_date,
                                 timeframe_to_prev_date, timeframe_to_seconds)
 from freqtrade.strategy.hyper import (CategoricalParameter, DecimalParameter, IntParameter,
-                                      RealParameter)
+                                      RealParameter, parameter_indicator)
 from freqtrade.strategy.interface import IStrategy
 from freqtrade.strategy.strategy_helper import merge_informative_pair, stoploss_from_open
+from freqtrade.strategy.streaming import (StreamingEMA, StreamingIndicator, StreamingMax,
+                                          StreamingMin, StreamingRSI, StreamingSMA)
@@ -2,10 +2,13 @@
 IHyperStrategy interface, hyperoptable Parameter class.
 This module defines a base class for auto-hyperoptable strategies.
 """
+import inspect
 import logging
 from abc import ABC, abstractmethod
 from contextlib import suppress
-from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pandas import DataFrame, concat
 
 from freqtrade.optimize.hyperopt_tools import HyperoptTools
 
@@ -239,6 +242,35 @@ class CategoricalParameter(BaseParameter):
         """
         return Categorical(self.opt_range, name=name, **self._space_params)
 
+    @property
+    def range(self):
+        """
+        Get each value in this space as list.
+        Returns a List of categories in Hyperopt mode.
+        Returns a List with 1 item (`value`) in "non-hyperopt" mode, to avoid
+        calculating 100ds of indicators.
+        """
+        if self.in_space and self.optimize:
+            return self.opt_range
+        else:
+            return [self.value]
+
+
+def parameter_indicator(parameter: str) -> Callable:
+    """
+    Decorator for strategy methods calculating an indicator which depends on a parameter.
+    The method is called as method(dataframe, value) for every value in the parameter's `range`,
+    and must return the indicator for this value.
+    The indicator is available as dataframe[<method name>] in populate_buy_trend() and
+    populate_sell_trend(), calculated with the current value of the parameter.
+    :param parameter: Name of an IntParameter or CategoricalParameter of the strategy.
+    """
+    def decorator(func: Callable) -> Callable:
+        func.ft_parameter = parameter  # type: ignore
+        return func
+
+    return decorator
+
 
 class HyperStrategyMixin(object):
     """
@@ -253,8 +285,11 @@ class HyperStrategyMixin(object):
         self.config = config
         self.ft_buy_params: List[BaseParameter] = []
         self.ft_sell_params: List[BaseParameter] = []
+        self.ft_parameter_indicators: Dict[
+            str, Tuple[Union[IntParameter, CategoricalParameter], Callable]] = {}
 
         self._load_hyper_params(config.get('runmode') == RunMode.HYPEROPT)
+        self._detect_parameter_indicators()
 
     def enumerate_parameters(self, category: str = None) -> Iterator[Tuple[str, BaseParameter]]:
         """
@@ -321,6 +356,46 @@ class HyperStrategyMixin(object):
             else:
                 logger.info(f'Strategy Parameter(default): {attr_name} = {attr.value}')
 
+    def _detect_parameter_indicators(self) -> None:
+        """ Detect all methods decorated with parameter_indicator """
+        for attr_name, func in inspect.getmembers(self.__class__, inspect.isfunction):
+            parameter_name = getattr(func, 'ft_parameter', None)
+            if parameter_name is None:
+                continue
+            parameter = getattr(self, parameter_name, None)
+            if not isinstance(parameter, (IntParameter, CategoricalParameter)):
+                raise OperationalException(
+                    f'Indicator {attr_name} must depend on an IntParameter or '
+                    f'CategoricalParameter, but {parameter_name} is {parameter!r}.')
+            self.ft_parameter_indicators[attr_name] = (parameter, getattr(self, attr_name))
+
+    def populate_parameter_indicators(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Calculate parameter indicators for all values in the parameter's range.
+        In hyperopt, this creates one column per value of the search space (named
+        <indicator>_<value>) - so indicators are calculated once, and not for every epoch.
+        :param dataframe: Dataframe with populated indicators
+        :return: Dataframe including the new columns
+        """
+        if not self.ft_parameter_indicators:
+            return dataframe
+        columns = {}
+        for name, (parameter, indicator) in self.ft_parameter_indicators.items():
+            for value in parameter.range:
+                columns[f'{name}_{value}'] = indicator(dataframe, value)
+        # Adding all columns at once avoids fragmenting the dataframe
+        return concat([dataframe.drop(columns=list(columns), errors='ignore'),
+                       DataFrame(columns, index=dataframe.index)], axis=1)
+
+    def resolve_parameter_indicators(self, dataframe: DataFrame) -> DataFrame:
+        """
+        Select the columns calculated by populate_parameter_indicators() matching
+        the current parameter values.
+        """
+        for name, (parameter, _) in self.ft_parameter_indicators.items():
+            dataframe[name] = dataframe[f'{name}_{parameter.value}']
+        return dataframe
+
     def get_params_dict(self):
         """
         Returns list of Parameters that are not part of the current optimize job
@@ -5,6 +5,8 @@ This module defines the interface to apply for strategies
 import logging
 import warnings
 from abc import ABC, abstractmethod
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Union
@@ -21,6 +23,8 @@ from freqtrade.exchange.exchange import timeframe_to_next_date
 from freqtrade.persistence import PairLocks, Trade
 from freqtrade.strategy.hyper import HyperStrategyMixin
 from freqtrade.strategy.strategy_wrapper import strategy_safe_wrapper
+from freqtrade.strategy.streaming import (StreamingIndicator, StreamingState,
+                                          populate_streaming_indicators)
 from freqtrade.wallets import Wallets
 from freqtrade.state import RunMode
 
@@ -72,6 +76,12 @@ class SellCheckTuple(object):
         return self.sell_type != SellType.NONE
 
 
+# Shared results for sells without custom reason, to avoid creating one object per candle.
+# These instances must not be modified.
+SELL_CHECK_RESULTS: Dict[SellType, SellCheckTuple] = {
+    sell_type: SellCheckTuple(sell_type=sell_type) for sell_type in SellType}
+
+
 class IStrategy(ABC, HyperStrategyMixin):
     """
     Interface for freqtrade strategies
@@ -135,9 +145,16 @@ class IStrategy(ABC, HyperStrategyMixin):
     # Count of candles the strategy requires before producing valid signals
     startup_candle_count: int = 0
 
+    # Indicators calculated before populate_indicators(), only for new candles in dry / live runs
+    streaming_indicators: Dict[str, StreamingIndicator] = {}
+
     # Protections
     protections: List
 
+    # minimal_roi compiled by get_roi_table()
+    _roi_table_source: Optional[Tuple] = None
+    _roi_table: Tuple[List[int], List[float]] = ([], [])
+
     # Class level variables (intentional) containing
     # the dataprovider (dp) (access to other candles, historic data, ...)
     # and wallets - access to the current balance.
@@ -157,6 +174,8 @@ class IStrategy(ABC, HyperStrategyMixin):
             system(f'Title {mode} - {self.get_strategy_name()}')
         # Dict to determine if analysis is necessary
         self._last_candle_seen_per_pair: Dict[str, datetime] = {}
+        # State of streaming indicators per pair
+        self._streaming_state: Dict[str, StreamingState] = {}
         super().__init__(config)
 
     @abstractmethod
@@ -471,10 +490,19 @@ class IStrategy(ABC, HyperStrategyMixin):
     def analyze(self, pairs: List[str]) -> None:
         """
         Analyze all pairs using analyze_pair().
+        With `internals.analysis_workers` > 1, pairs are analyzed in a pool of threads.
         :param pairs: List of pairs to analyze
         """
-        for pair in pairs:
-            self.analyze_pair(pair)
+        workers = self.config.get('internals', {}).get('analysis_workers', 1)
+        if workers > 1 and len(pairs) > 1:
+            with ThreadPoolExecutor(max_workers=workers,
+                                    thread_name_prefix='analyze') as executor:
+                # Consume results to raise exceptions escaping analyze_pair()
+                for _ in executor.map(self.analyze_pair, pairs):
+                    pass
+        else:
+            for pair in pairs:
+                self.analyze_pair(pair)
 
     @staticmethod
     def preserve_df(dataframe: DataFrame) -> Tuple[int, float, datetime]:
@@ -609,7 +637,7 @@ class IStrategy(ABC, HyperStrategyMixin):
         # Stoploss
         if roi_reached and stoplossflag.sell_type != SellType.STOP_LOSS:
             logger.debug(f"{trade.pair} - Required profit reached. sell_type=SellType.ROI")
-            return SellCheckTuple(sell_type=SellType.ROI)
+            return SELL_CHECK_RESULTS[SellType.ROI]
 
         if sell_signal != SellType.NONE:
             logger.debug(f"{trade.pair} - Sell signal received. "
@@ -624,7 +652,7 @@ class IStrategy(ABC, HyperStrategyMixin):
 
         # This one is noisy, commented out...
         # logger.debug(f"{trade.pair} - No sell signal.")
-        return SellCheckTuple(sell_type=SellType.NONE)
+        return SELL_CHECK_RESULTS[SellType.NONE]
 
     def stop_loss_reached(self, dataframe: DataFrame, current_rate: float, trade: Trade,
                           current_time: datetime, current_profit: float,
@@ -689,9 +717,22 @@ class IStrategy(ABC, HyperStrategyMixin):
                 logger.debug(f"{trade.pair} - Trailing stop saved "
                              f"{trade.stop_loss - trade.initial_stop_loss:.6f}")
 
-            return SellCheckTuple(sell_type=sell_type)
+            return SELL_CHECK_RESULTS[sell_type]
+
+        return SELL_CHECK_RESULTS[SellType.NONE]
 
-        return SellCheckTuple(sell_type=SellType.NONE)
+    def get_roi_table(self) -> Tuple[List[int], List[float]]:
+        """
+        ROI table as lists of durations (sorted ascending) and the corresponding ROI values.
+        Compiled again whenever the content of minimal_roi changes (e.g. by hyperopt).
+        :return: Tuple of (durations, values)
+        """
+        source = tuple(self.minimal_roi.items())
+        if self._roi_table_source != source:
+            roi = sorted(source)
+            self._roi_table = ([duration for duration, _ in roi], [value for _, value in roi])
+            self._roi_table_source = source
+        return self._roi_table
 
     def min_roi_reached_entry(self, trade_dur: int) -> Tuple[Optional[int], Optional[float]]:
         """
@@ -700,11 +741,11 @@ class IStrategy(ABC, HyperStrategyMixin):
         :return: minimal ROI entry value or None if none proper ROI entry was found.
         """
         # Get highest entry in ROI dict where key <= trade-duration
-        roi_list = list(filter(lambda x: x <= trade_dur, self.minimal_roi.keys()))
-        if not roi_list:
+        durations, values = self.get_roi_table()
+        idx = bisect_right(durations, trade_dur) - 1
+        if idx < 0:
             return None, None
-        roi_entry = max(roi_list)
-        return roi_entry, self.minimal_roi[roi_entry]
+        return durations[idx], values[idx]
 
     def min_roi_reached(self, trade: Trade, current_profit: float, current_time: datetime) -> bool:
         """
@@ -742,12 +783,33 @@ class IStrategy(ABC, HyperStrategyMixin):
         :return: a Dataframe with all mandatory indicators for the strategies
         """
         logger.debug(f"Populating indicators for pair {metadata.get('pair')}.")
+        if self.streaming_indicators:
+            dataframe = self.advise_streaming_indicators(dataframe, metadata)
         if self._populate_fun_len == 2:
             warnings.warn("deprecated - check out the Sample strategy to see "
                           "the current function headers!", DeprecationWarning)
-            return self.populate_indicators(dataframe)  # type: ignore
+            dataframe = self.populate_indicators(dataframe)  # type: ignore
         else:
-            return self.populate_indicators(dataframe, metadata)
+            dataframe = self.populate_indicators(dataframe, metadata)
+        return self.populate_parameter_indicators(dataframe)
+
+    def advise_streaming_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+        """
+        Populate streaming indicators.
+        In dry / live runs, the state is kept per pair, so only new candles are calculated.
+        This method should not be overridden.
+        :param dataframe: Dataframe with data from the exchange
+        :param metadata: Additional information, like the currently traded pair
+        :return: a Dataframe with the streaming indicators
+        """
+        pair = metadata.get('pair')
+        # Removed while updating - a failed update starts from scratch on the next candle
+        state = self._streaming_state.pop(pair, None) if pair else None
+        dataframe, state = populate_streaming_indicators(self.streaming_indicators, dataframe,
+                                                         state)
+        if pair and self.config.get('runmode') in (RunMode.DRY_RUN, RunMode.LIVE):
+            self._streaming_state[pair] = state
+        return dataframe
 
     def advise_buy(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
@@ -758,6 +820,7 @@ class IStrategy(ABC, HyperStrategyMixin):
         :return: DataFrame with buy column
         """
         logger.debug(f"Populating buy signals for pair {metadata.get('pair')}.")
+        dataframe = self.resolve_parameter_indicators(dataframe)
 
         if self._buy_fun_len == 2:
             warnings.warn("deprecated - check out the Sample strategy to see "
@@ -775,6 +838,7 @@ class IStrategy(ABC, HyperStrategyMixin):
         :return: DataFrame with sell column
         """
         logger.debug(f"Populating sell signals for pair {metadata.get('pair')}.")
+        dataframe = self.resolve_parameter_indicators(dataframe)
         if self._sell_fun_len == 2:
             warnings.warn("deprecated - check out the Sample strategy to see "
                           "the current function headers!", DeprecationWarning)
@@ -0,0 +1,283 @@
+"""
+Streaming indicators - indicators which can be continued with new candles
+without recalculating them over the whole dataframe.
+"""
+import logging
+from abc import ABC, abstractmethod
+from copy import deepcopy
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+logger = logging.getLogger(__name__)
+
+
+def _ewm(last: float, values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Recursive exponentially weighted mean of `values`, continuing from `last`.
+    Pandas' recursive (adjust=False) implementation only carries the last average from one
+    value to the next, so prepending it gives exactly the values of one uninterrupted call.
+    """
+    data = np.concatenate(([last], values))
+    return pd.Series(data).ewm(alpha=alpha, adjust=False, ignore_na=True).mean().to_numpy()[1:]
+
+
+def _ewm_reanchor(means: np.ndarray, values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Convert the recursive exponentially weighted mean `means` of `values` - which continued
+    from earlier values - to the mean of `values` alone (as if started with the first value).
+    Both differ by the contribution of the earlier values, which decays by (1 - alpha) with
+    every (non-NaN) value.
+    """
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return np.full(len(values), np.nan)
+    first = int(np.argmax(valid))
+    with np.errstate(under='ignore'):
+        # Contribution of earlier values is negligible after a while
+        decay = (1 - alpha) ** (np.cumsum(valid) - 1)
+        result = means - decay * (means[first] - values[first])
+    result[:first] = np.nan
+    return result
+
+
+class StreamingIndicator(ABC):
+    """
+    Indicator calculated candle by candle.
+    update() consumes the next values of `column` and keeps the state required to continue
+    with the following candles - so feeding the data in several chunks gives exactly the same
+    result as a single call with all data.
+    trim() drops the oldest candles, so the values match a calculation over the remaining
+    candles only.
+    """
+
+    def __init__(self, column: str = 'close') -> None:
+        self.column = column
+        # Indicator values of all candles since the first (remaining) candle
+        self.values = np.empty(0)
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        """
+        Calculate the indicator for the next values of the source column.
+        :param values: New values of `column`, in candle order
+        :return: Indicator values for these candles
+        """
+        result = self._update(values)
+        self.values = np.concatenate((self.values, result))
+        return result
+
+    @abstractmethod
+    def _update(self, values: np.ndarray) -> np.ndarray:
+        """
+        Calculate the indicator for the next values - self.values contains the previous values.
+        """
+
+    @abstractmethod
+    def trim(self, count: int, values: np.ndarray) -> None:
+        """
+        Drop the first `count` candles, recalculating self.values as if the calculation had
+        started with the remaining candles.
+        :param values: Values of `column` of the remaining candles
+        """
+
+
+class StreamingEMA(StreamingIndicator):
+    """
+    Exponential moving average (recursive form, like `ewm(span=period, adjust=False)`).
+    """
+
+    def __init__(self, period: int, column: str = 'close') -> None:
+        super().__init__(column)
+        self.alpha = 2 / (period + 1)
+        self._last = np.nan
+
+    def _update(self, values: np.ndarray) -> np.ndarray:
+        if len(values) == 0:
+            return np.empty(0)
+        result = _ewm(self._last, values, self.alpha)
+        self._last = result[-1]
+        return result
+
+    def trim(self, count: int, values: np.ndarray) -> None:
+        self.values = _ewm_reanchor(self.values[count:], values, self.alpha)
+        self._last = self.values[-1] if len(self.values) else np.nan
+
+
+class _StreamingWindow(StreamingIndicator):
+    """
+    Base for indicators on a fixed window of the last `period` values.
+    Every result is calculated from its own window, values before are NaN.
+    """
+    _ufunc: np.ufunc
+
+    def __init__(self, period: int, column: str = 'close') -> None:
+        super().__init__(column)
+        self.period = period
+        self._buffer = np.empty(0)
+
+    def _reduce(self, data: np.ndarray) -> np.ndarray:
+        """
+        Reduce every window of `data` - always in the same order, so results don't depend
+        on the position of the window within `data`.
+        """
+        count = len(data) - self.period + 1
+        result = data[:count].copy()
+        for i in range(1, self.period):
+            self._ufunc(result, data[i:i + count], out=result)
+        return result
+
+    def _update(self, values: np.ndarray) -> np.ndarray:
+        data = np.concatenate((self._buffer, values))
+        result = np.full(len(values), np.nan)
+        if len(data) >= self.period:
+            reduced = self._reduce(data)
+            result[len(result) - len(reduced):] = reduced
+        self._buffer = data[max(len(data) - self.period + 1, 0):]
+        return result
+
+    def trim(self, count: int, values: np.ndarray) -> None:
+        # Windows of the remaining candles are unchanged - except for the first candles,
+        # which have no complete window anymore
+        self.values = self.values[count:].copy()
+        self.values[:self.period - 1] = np.nan
+        self._buffer = self._buffer[max(len(self._buffer) - len(self.values), 0):]
+
+
+class StreamingSMA(_StreamingWindow):
+    """
+    Simple moving average over `period` candles.
+    """
+    _ufunc = np.add
+
+    def _reduce(self, data: np.ndarray) -> np.ndarray:
+        return super()._reduce(data) / self.period
+
+
+class StreamingMax(_StreamingWindow):
+    """
+    Highest value of the last `period` candles.
+    """
+    _ufunc = np.maximum
+
+
+class StreamingMin(_StreamingWindow):
+    """
+    Lowest value of the last `period` candles.
+    """
+    _ufunc = np.minimum
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    Relative strength index, using Wilder's smoothing of gains and losses
+    (`ewm(alpha=1 / period, adjust=False)`).
+    The first `period` candles are NaN.
+    """
+
+    def __init__(self, period: int = 14, column: str = 'close') -> None:
+        super().__init__(column)
+        self.period = period
+        self._prev = np.nan
+        # Smoothed gains / losses of all candles
+        self._gains = np.empty(0)
+        self._losses = np.empty(0)
+
+    def _rsi(self, gain: np.ndarray, loss: np.ndarray, start: int) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = 100 - 100 / (1 + gain / loss)
+        result[start + np.arange(len(result)) < self.period] = np.nan
+        return result
+
+    def _update(self, values: np.ndarray) -> np.ndarray:
+        if len(values) == 0:
+            return np.empty(0)
+        delta = np.diff(np.concatenate(([self._prev], values)))
+        last_gain = self._gains[-1] if len(self._gains) else np.nan
+        last_loss = self._losses[-1] if len(self._losses) else np.nan
+        gain = _ewm(last_gain, np.clip(delta, 0, None), 1 / self.period)
+        loss = _ewm(last_loss, np.clip(-delta, 0, None), 1 / self.period)
+
+        self._prev = values[-1]
+        self._gains = np.concatenate((self._gains, gain))
+        self._losses = np.concatenate((self._losses, loss))
+        return self._rsi(gain, loss, len(self.values))
+
+    def trim(self, count: int, values: np.ndarray) -> None:
+        # The first remaining candle has no previous candle anymore
+        delta = np.diff(np.concatenate(([np.nan], values)))
+        alpha = 1 / self.period
+        self._gains = _ewm_reanchor(self._gains[count:], np.clip(delta, 0, None), alpha)
+        self._losses = _ewm_reanchor(self._losses[count:], np.clip(-delta, 0, None), alpha)
+        self.values = self._rsi(self._gains, self._losses, 0)
+
+
+class StreamingState:
+    """
+    State of all streaming indicators of one pair, together with the source values used.
+    """
+
+    def __init__(self, indicators: Dict[str, StreamingIndicator]) -> None:
+        # Declared indicators are used as templates and never updated
+        self.indicators = deepcopy(indicators)
+        self.dates = np.empty(0, dtype='datetime64[ns]')
+        self.inputs: Dict[str, np.ndarray] = {}
+
+    def known_rows(self, dates: np.ndarray) -> Optional[Tuple[int, int]]:
+        """
+        Find the rows of `dates` which were calculated before.
+        :return: Tuple of (first known row in the previous dates, number of known rows) -
+            or None if the new dates don't continue the previous dates.
+        """
+        if len(self.dates) == 0 or len(dates) == 0:
+            return None
+        start = int(np.searchsorted(self.dates, dates[0]))
+        known = int(np.searchsorted(dates, self.dates[-1], side='right'))
+        if (known == 0 or start + known != len(self.dates)
+                or not np.array_equal(self.dates[start:], dates[:known])):
+            return None
+        return start, known
+
+
+def populate_streaming_indicators(
+        indicators: Dict[str, StreamingIndicator], dataframe: DataFrame,
+        state: Optional[StreamingState] = None) -> Tuple[DataFrame, StreamingState]:
+    """
+    Add streaming indicators to dataframe.
+    Candles already seen by `state` are taken from the state, only new candles are calculated.
+    Candles dropped from the start of the dataframe are removed from the state - so the result
+    matches calculating the indicators over the dataframe at once.
+    Indicators are calculated in order, so they can use columns of previous indicators.
+    :param indicators: Dict of column name -> indicator
+    :param dataframe: Dataframe with candle data
+    :param state: State returned by the previous call for this pair - or None
+    :return: Tuple of (dataframe with indicator columns, state for the next call)
+    """
+    dates = dataframe['date'].to_numpy(dtype='datetime64[ns]')
+    known_rows = state.known_rows(dates) if state else None
+    if state is None or known_rows is None:
+        state = StreamingState(indicators)
+        start, known = 0, 0
+    else:
+        start, known = known_rows
+        logger.debug(f"Calculating streaming indicators for {len(dates) - known} new candles.")
+
+    for name, indicator in state.indicators.items():
+        inputs = dataframe[indicator.column].to_numpy(dtype='float64')
+        if known and not np.array_equal(state.inputs[name][start:], inputs[:known],
+                                        equal_nan=True):
+            # Source values of known candles changed (e.g. a candle was updated, or the source
+            # column is an indicator which was re-anchored) - recalculate all candles
+            indicator = state.indicators[name] = deepcopy(indicators[name])
+            indicator.update(inputs)
+        else:
+            if start:
+                indicator.trim(start, inputs[:known])
+            indicator.update(inputs[known:])
+        state.inputs[name] = inputs
+        dataframe[name] = indicator.values.copy()
+
+    state.dates = dates
+    return dataframe, state
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the backtesting exit path.
+
+Evaluates the sell logic for one open trade on every candle of a random walk,
+once with IStrategy.should_sell() (as done for strategies overriding the sell logic)
+and once with BacktestExitEvaluator, and prints the time per candle.
+
+Usage: python scripts/benchmark_exit.py [--candles 100000] [--trailing]
+"""
+import argparse
+import timeit
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from freqtrade.optimize.backtest_exit import BacktestExitEvaluator
+from freqtrade.persistence import LocalTrade
+from freqtrade.state import RunMode
+from freqtrade.strategy import IStrategy
+
+
+class BenchmarkStrategy(IStrategy):
+    minimal_roi = {0: 10, 1440: 5}
+    stoploss = -0.99
+
+    def populate_indicators(self, dataframe, metadata):
+        return dataframe
+
+    def populate_buy_trend(self, dataframe, metadata):
+        return dataframe
+
+    def populate_sell_trend(self, dataframe, metadata):
+        return dataframe
+
+
+def make_rows(candles: int) -> list:
+    """
+    Rows as used by the candle loop: date, buy, open, close, sell, low, high
+    """
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, candles)))
+    dates = pd.date_range('2021-01-01', periods=candles, freq='5min', tz='UTC')
+    return [[date, 0, price, price, 0, price * 0.999, price * 1.001]
+            for date, price in zip(dates, close)]
+
+
+def make_trade() -> LocalTrade:
+    return LocalTrade(pair='BENCH/USDT', open_rate=100, stake_amount=100, amount=1,
+                      open_date=datetime(2021, 1, 1, tzinfo=timezone.utc),
+                      fee_open=0.001, fee_close=0.001, is_open=True, exchange='backtesting')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--candles', type=int, default=100000)
+    parser.add_argument('--trailing', action='store_true', help='Enable trailing stoploss.')
+    args = parser.parse_args()
+
+    strategy = BenchmarkStrategy({'runmode': RunMode.BACKTEST, 'dry_run': True,
+                                  'ask_strategy': {}})
+    strategy.order_types['stoploss_on_exchange'] = False
+    strategy.trailing_stop = args.trailing
+    rows = make_rows(args.candles)
+    dataframe = pd.DataFrame()
+
+    def run_strategy():
+        trade = make_trade()
+        for row in rows:
+            strategy.should_sell(dataframe, trade, row[2], row[0].to_pydatetime(), row[1], row[4],
+                                 low=row[5], high=row[6])
+
+    def run_evaluator():
+        trade = make_trade()
+        evaluator = BacktestExitEvaluator(strategy)
+        for row in rows:
+            evaluator.should_sell(dataframe, trade, row[0], row[2], row[1], row[4],
+                                  low=row[5], high=row[6])
+
+    times = {}
+    for name, function in [('should_sell', run_strategy), ('evaluator', run_evaluator)]:
+        times[name] = min(timeit.repeat(function, number=1, repeat=3)) / len(rows)
+        print(f"{name:>12}: {times[name] * 1e6:.2f} us per candle")
+    print(f"     speedup: {times['should_sell'] / times['evaluator']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -705,6 +705,7 @@ def test_download_data_timerange(mocker, caplog, markets):
     ]
     start_download_data(get_args(args))
     assert dl_mock.call_count == 1
+    assert dl_mock.call_args_list[0][1]['concurrency'] == 4
     # 20days ago
     days_ago = arrow.get(arrow.now().shift(days=-20).date()).int_timestamp
     assert dl_mock.call_args_list[0][1]['timerange'].startts == days_ago
@@ -794,10 +795,12 @@ def test_download_data_trades(mocker, caplog):
         "--exchange", "kraken",
         "--pairs", "ETH/BTC", "XRP/BTC",
         "--days", "20",
-        "--dl-trades"
+        "--dl-trades",
+        "--dl-concurrency", "8",
     ]
     start_download_data(get_args(args))
     assert dl_mock.call_args[1]['timerange'].starttype == "date"
+    assert dl_mock.call_args[1]['concurrency'] == 8
     assert dl_mock.call_count == 1
     assert convert_mock.call_count == 1
 
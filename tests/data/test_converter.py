@@ -1,15 +1,19 @@
 # pragma pylint: disable=missing-docstring, C0103
 import logging
+from datetime import datetime, timezone
 
 import pytest
+from pandas.testing import assert_frame_equal
 
 from freqtrade.configuration.timerange import TimeRange
-from freqtrade.data.converter import (convert_ohlcv_format, convert_trades_format,
-                                      ohlcv_fill_up_missing_data, ohlcv_to_dataframe,
-                                      trades_dict_to_list, trades_remove_duplicates,
-                                      trades_to_ohlcv, trim_dataframe)
+from freqtrade.data.converter import (TradesOhlcvAggregator, convert_ohlcv_format,
+                                      convert_trades_format, ohlcv_fill_up_missing_data,
+                                      ohlcv_to_dataframe, trades_dict_to_list,
+                                      trades_remove_duplicates, trades_to_ohlcv, trim_dataframe)
 from freqtrade.data.history import (get_timerange, load_data, load_pair_history,
                                     validate_backtest_data)
+from freqtrade.data.history.jsondatahandler import JsonGzDataHandler
+from freqtrade.exchange import timeframe_to_prev_date
 from tests.conftest import log_has
 from tests.data.test_history import _backup_file, _clean_test_file
 
@@ -51,6 +55,41 @@ def test_trades_to_ohlcv(ohlcv_history_list, caplog):
     assert df.loc[:, 'low'][0] == 0.00141266
 
 
+@pytest.mark.parametrize('chunk_size', [100, 1000, 20000])
+def test_trades_ohlcv_aggregator(testdatadir, chunk_size):
+    trades = JsonGzDataHandler(testdatadir).trades_load('XRP/ETH')
+    timeframes = ['1m', '5m', '1h', '1d']
+    aggregator = TradesOhlcvAggregator(timeframes)
+    with pytest.raises(ValueError, match="Trade-list empty."):
+        aggregator.get_ohlcv('1m')
+
+    for start in range(0, len(trades), chunk_size):
+        aggregator.add_trades(trades[start:start + chunk_size])
+    aggregator.add_trades([])
+    # Identical to converting all trades at once
+    for timeframe in timeframes:
+        assert_frame_equal(aggregator.get_ohlcv(timeframe), trades_to_ohlcv(trades, timeframe))
+
+
+def test_trades_ohlcv_aggregator_long_timeframes():
+    # Trades every 2 hours for 40 days, starting mid-day
+    start = int(datetime(2021, 1, 5, 13, tzinfo=timezone.utc).timestamp() * 1000)
+    trades = [[start + i * 7_200_000, str(i), None, 'buy', 1 + (i % 7) / 10, 1.0, 1.0]
+              for i in range(480)]
+    timeframes = ['1d', '3d', '1w']
+    aggregator = TradesOhlcvAggregator(timeframes)
+    # Chunks starting on different days
+    for chunk in range(0, len(trades), 50):
+        aggregator.add_trades(trades[chunk:chunk + 50])
+
+    for timeframe in timeframes:
+        ohlcv = aggregator.get_ohlcv(timeframe)
+        assert_frame_equal(ohlcv, trades_to_ohlcv(trades, timeframe))
+        # Candles are aligned like exchange candles, independent of the first trade
+        assert all(date == timeframe_to_prev_date(timeframe, date) for date in ohlcv['date'])
+        assert ohlcv['volume'].sum() == len(trades)
+
+
 def test_ohlcv_fill_up_missing_data(testdatadir, caplog):
     data = load_pair_history(datadir=testdatadir,
                              timeframe='1m',
@@ -324,3 +363,22 @@ def test_convert_ohlcv_format(mocker, default_conf, testdatadir):
         file1_new.unlink()
     if file2_new.exists():
         file2_new.unlink()
+
+
+def test_convert_ohlcv_format_npy(default_conf, testdatadir):
+    file = testdatadir / "XRP_ETH-5m.json"
+    file_new = testdatadir / "XRP_ETH-5m.npy"
+    default_conf['datadir'] = testdatadir
+    default_conf['pairs'] = ['XRP_ETH']
+    default_conf['timeframes'] = ['5m']
+
+    assert not file_new.exists()
+    convert_ohlcv_format(default_conf, convert_from='json', convert_to='npy', erase=False)
+    assert file_new.exists()
+    assert file.exists()
+
+    data = load_pair_history(pair='XRP/ETH', timeframe='5m', datadir=testdatadir)
+    data_new = load_pair_history(pair='XRP/ETH', timeframe='5m', datadir=testdatadir,
+                                 data_format='npy')
+    assert data.equals(data_new)
+    file_new.unlink()
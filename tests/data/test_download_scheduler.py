@@ -0,0 +1,168 @@
+import asyncio
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import arrow
+
+from freqtrade.data.history import refresh_backtest_ohlcv_data, refresh_backtest_trades_data
+from freqtrade.data.history.download_scheduler import DOWNLOAD_STATE_FN, DownloadScheduler
+from freqtrade.data.history.jsondatahandler import JsonDataHandler, JsonGzDataHandler
+from freqtrade.exchange import timeframe_to_msecs
+from freqtrade.misc import file_dump_json, file_load_json
+from tests.conftest import get_patched_exchange, log_has, log_has_re
+
+
+class FakeExchangeApi:
+    """
+    Local exchange serving synthetic candles and trades, recording all requests.
+    """
+    name = 'Fake'
+    rateLimit = 5
+    has = {'fetchOHLCV': True, 'fetchTrades': True}
+
+    def __init__(self, latency: float = 0.02) -> None:
+        self.latency = latency
+        self.requests: List[Tuple[float, str, str]] = []
+        self.running = 0
+        self.max_running = 0
+        # One trade every 10 minutes during the last 2 days
+        now = arrow.utcnow().int_timestamp * 1000
+        self.trades = [{'timestamp': now - 2 * 86400000 + i * 600000, 'id': str(i),
+                        'type': None, 'side': 'buy', 'price': 1.0, 'amount': 2.0, 'cost': 2.0}
+                       for i in range(288)]
+
+    async def _request(self, pair: str, kind: str) -> None:
+        self.requests.append((asyncio.get_event_loop().time(), pair, kind))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.latency)
+        self.running -= 1
+
+    async def fetch_ohlcv(self, pair, timeframe, since, limit, params) -> List:
+        await self._request(pair, timeframe)
+        tf_ms = timeframe_to_msecs(timeframe)
+        start = since - since % tf_ms
+        stop = min(start + limit * tf_ms, arrow.utcnow().int_timestamp * 1000)
+        return [[date, 1.0, 2.0, 0.5, 1.5, 10.0] for date in range(start, stop, tf_ms)]
+
+    async def fetch_trades(self, pair, since=None, params=None, limit=1000) -> List[Dict]:
+        await self._request(pair, 'trades')
+        if params:
+            start = int(params['fromId'])
+        else:
+            start = next((i for i, t in enumerate(self.trades) if t['timestamp'] >= since),
+                         len(self.trades))
+        return self.trades[start:start + limit]
+
+    def load_markets(self) -> Dict:
+        return {}
+
+    async def close(self) -> None:
+        pass
+
+
+def test_download_scheduler(mocker, default_conf, tmpdir, caplog):
+    exchange = get_patched_exchange(mocker, default_conf, api_mock=FakeExchangeApi())
+    state_file = Path(tmpdir) / DOWNLOAD_STATE_FN
+    calls = []
+
+    def job(name, success=True):
+        async def download():
+            calls.append(name)
+            await asyncio.sleep(0.01)
+            return success
+        return download
+
+    scheduler = DownloadScheduler(exchange, state_file, concurrency=2,
+                                  parameters={'timerange': None})
+    for name in ['a', 'b', 'c']:
+        scheduler.add_job(name, job(name, success=name != 'b'))
+    assert scheduler.run() == ['b']
+    assert calls == ['a', 'b', 'c']
+    assert log_has('Total number of downloads: 3', caplog)
+    assert log_has_re(r'Download progress: 3/3 \(100.0 %\), ETA: 0:00:00', caplog)
+    # Rate limiter is only used while downloading
+    assert exchange._rate_limiter is None
+    assert file_load_json(state_file) == {'jobs': ['a', 'b', 'c'],
+                                          'parameters': {'timerange': None},
+                                          'completed': ['a', 'c']}
+
+    # Different parameters - nothing is skipped
+    calls.clear()
+    scheduler = DownloadScheduler(exchange, state_file, parameters={'timerange': 'x'})
+    for name in ['a', 'b', 'c']:
+        scheduler.add_job(name, job(name, success=name != 'b'))
+    scheduler.run()
+    assert calls == ['a', 'b', 'c']
+
+    # Resume - only the failed job runs
+    calls.clear()
+    caplog.clear()
+    scheduler = DownloadScheduler(exchange, state_file, parameters={'timerange': 'x'})
+    for name in ['a', 'b', 'c']:
+        scheduler.add_job(name, job(name))
+    assert scheduler.run() == []
+    assert calls == ['b']
+    assert log_has('Resuming interrupted download - skipping 2 completed downloads.', caplog)
+    assert log_has('Total number of downloads: 1', caplog)
+    assert not state_file.exists()
+
+
+def test_refresh_backtest_ohlcv_data_concurrent(mocker, default_conf, tmpdir):
+    api = FakeExchangeApi()
+    exchange = get_patched_exchange(mocker, default_conf, api_mock=api)
+    datadir = Path(tmpdir)
+    # ETH/BTC 1m was completed by an interrupted run
+    file_dump_json(datadir / DOWNLOAD_STATE_FN, {
+        'jobs': sorted(f'{pair} {tf}' for pair in ['ETH/BTC', 'LTC/BTC', 'XRP/BTC']
+                       for tf in ['1m', '5m']),
+        'parameters': {'type': 'ohlcv', 'timerange': None, 'new_pairs_days': 2,
+                       'erase': False, 'data_format': 'json'},
+        'completed': ['ETH/BTC 1m'],
+    })
+
+    store_threads = set()
+    ohlcv_store = JsonDataHandler.ohlcv_store
+
+    def _ohlcv_store(self, *args, **kwargs):
+        store_threads.add(threading.current_thread().name)
+        ohlcv_store(self, *args, **kwargs)
+
+    mocker.patch.object(JsonDataHandler, 'ohlcv_store', _ohlcv_store)
+
+    refresh_backtest_ohlcv_data(exchange, pairs=['ETH/BTC', 'LTC/BTC', 'XRP/BTC'],
+                                timeframes=['1m', '5m'], datadir=datadir, new_pairs_days=2,
+                                data_format='json', concurrency=3)
+
+    # Data is stored outside of the event loop
+    assert store_threads and all(name.startswith('download-io') for name in store_threads)
+
+    assert not (datadir / DOWNLOAD_STATE_FN).exists()
+    assert ('ETH/BTC', '1m') not in {(pair, tf) for _, pair, tf in api.requests}
+    # 3 requests for 2 days of 1m candles, 1 request for 5m candles
+    assert len(api.requests) == 2 * 3 + 3
+    # Requests ran concurrently - but never faster than the rate limit
+    assert api.max_running > 1
+    times = [t for t, _, _ in api.requests]
+    assert all(b - a >= 0.004 for a, b in zip(times, times[1:]))
+
+    dh = JsonDataHandler(datadir)
+    assert sorted(dh.ohlcv_get_available_data(datadir)) == [
+        ('ETH/BTC', '5m'), ('LTC/BTC', '1m'), ('LTC/BTC', '5m'), ('XRP/BTC', '1m'),
+        ('XRP/BTC', '5m')]
+    assert len(dh.ohlcv_load('LTC/BTC', '1m', fill_missing=False)) >= 2878
+    assert len(dh.ohlcv_load('XRP/BTC', '5m', fill_missing=False)) >= 574
+
+
+def test_refresh_backtest_trades_data_concurrent(mocker, default_conf, tmpdir, caplog):
+    api = FakeExchangeApi()
+    exchange = get_patched_exchange(mocker, default_conf, api_mock=api)
+    datadir = Path(tmpdir)
+
+    refresh_backtest_trades_data(exchange, pairs=['ETH/BTC', 'XRP/BTC'], datadir=datadir,
+                                 timerange=None, new_pairs_days=3, concurrency=2)
+
+    assert api.max_running > 1
+    assert log_has('New Amount of trades: 288', caplog)
+    assert len(JsonGzDataHandler(datadir).trades_load('XRP/BTC')) == 288
@@ -7,26 +7,29 @@ from shutil import copyfile
 from unittest.mock import MagicMock, PropertyMock
 
 import arrow
+import numpy as np
 import pytest
-from pandas import DataFrame
+from pandas import DataFrame, Timestamp
 from pandas.testing import assert_frame_equal
 
 from freqtrade.configuration import TimeRange
 from freqtrade.constants import AVAILABLE_DATAHANDLERS
-from freqtrade.data.converter import ohlcv_to_dataframe
+from freqtrade.data.converter import ohlcv_to_dataframe, trades_to_ohlcv
 from freqtrade.data.history.hdf5datahandler import HDF5DataHandler
 from freqtrade.data.history.history_utils import (_download_pair_history, _download_trades_history,
                                                   _load_cached_data_for_updating,
-                                                  convert_trades_to_ohlcv, get_timerange, load_data,
-                                                  load_pair_history, refresh_backtest_ohlcv_data,
+                                                  _trades_array_chunks, convert_trades_to_ohlcv,
+                                                  get_timerange, load_data, load_pair_history,
+                                                  refresh_backtest_ohlcv_data,
                                                   refresh_backtest_trades_data, refresh_data,
                                                   validate_backtest_data)
 from freqtrade.data.history.idatahandler import IDataHandler, get_datahandler, get_datahandlerclass
 from freqtrade.data.history.jsondatahandler import JsonDataHandler, JsonGzDataHandler
+from freqtrade.data.history.npydatahandler import NpyDataHandler
 from freqtrade.exchange import timeframe_to_minutes
 from freqtrade.misc import file_dump_json
 from freqtrade.resolvers import StrategyResolver
-from tests.conftest import get_patched_exchange, log_has, log_has_re, patch_exchange
+from tests.conftest import get_mock_coro, get_patched_exchange, log_has, log_has_re, patch_exchange
 
 
 # Change this if modifying UNITTEST/BTC testdatafile
@@ -195,39 +198,57 @@ def test_load_cached_data_for_updating(mocker, testdatadir) -> None:
     now_ts = test_data[-1][0] / 1000 + 60 * 60
     mocker.patch('arrow.utcnow', return_value=arrow.get(now_ts))
 
+    first_date = test_data_df.iloc[0]['date']
+    last_date = test_data_df.iloc[-1]['date']
     # timeframe starts earlier than the cached data
     # should fully update data
     timerange = TimeRange('date', None, test_data[0][0] / 1000 - 1, 0)
-    data, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', timerange, data_handler)
-    assert data.empty
+    cached, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', timerange,
+                                                      data_handler)
+    assert cached is None
     assert start_ts == test_data[0][0] - 1000
 
     # timeframe starts in the center of the cached data
-    # should return the chached data w/o the last item
+    # should continue after the cached data
     timerange = TimeRange('date', None, test_data[0][0] / 1000 + 1, 0)
-    data, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', timerange, data_handler)
-
-    assert_frame_equal(data, test_data_df.iloc[:-1])
-    assert test_data[-2][0] <= start_ts < test_data[-1][0]
+    cached, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', timerange,
+                                                      data_handler)
+    assert cached == (first_date, last_date)
+    assert start_ts == test_data[-1][0]
 
     # timeframe starts after the chached data
-    # should return the chached data w/o the last item
+    # should continue after the cached data
     timerange = TimeRange('date', None, test_data[-1][0] / 1000 + 100, 0)
-    data, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', timerange, data_handler)
-    assert_frame_equal(data, test_data_df.iloc[:-1])
-    assert test_data[-2][0] <= start_ts < test_data[-1][0]
+    cached, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', timerange,
+                                                      data_handler)
+    assert cached == (first_date, last_date)
+    assert start_ts == test_data[-1][0]
+
+    # Only the first and last date are read
+    load_mock = mocker.spy(data_handler, '_ohlcv_load')
+    cached, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', None, data_handler)
+    assert cached == (first_date, last_date)
+    assert load_mock.call_count == 0
+
+    # Datahandlers not supporting this load all data
+    mocker.patch.object(data_handler, 'ohlcv_data_min_max', side_effect=NotImplementedError)
+    cached, start_ts = _load_cached_data_for_updating('UNITTEST/BTC', '1m', None, data_handler)
+    assert cached == (first_date, last_date)
+    assert start_ts == test_data[-1][0]
+    assert load_mock.call_count == 1
 
     # no datafile exist
     # should return timestamp start time
     timerange = TimeRange('date', None, now_ts - 10000, 0)
-    data, start_ts = _load_cached_data_for_updating('NONEXIST/BTC', '1m', timerange, data_handler)
-    assert data.empty
+    cached, start_ts = _load_cached_data_for_updating('NONEXIST/BTC', '1m', timerange,
+                                                      data_handler)
+    assert cached is None
     assert start_ts == (now_ts - 10000) * 1000
 
     # no datafile exist, no timeframe is set
-    # should return an empty array and None
-    data, start_ts = _load_cached_data_for_updating('NONEXIST/BTC', '1m', None, data_handler)
-    assert data.empty
+    # should return None
+    cached, start_ts = _load_cached_data_for_updating('NONEXIST/BTC', '1m', None, data_handler)
+    assert cached is None
     assert start_ts is None
 
 
@@ -287,11 +308,34 @@ def test_download_pair_history2(mocker, default_conf, testdatadir) -> None:
     json_dump_mock = mocker.patch(
         'freqtrade.data.history.jsondatahandler.JsonDataHandler.ohlcv_store',
         return_value=None)
+    json_append_mock = mocker.patch(
+        'freqtrade.data.history.jsondatahandler.JsonDataHandler.ohlcv_append',
+        return_value=None)
     mocker.patch('freqtrade.exchange.Exchange.get_historic_ohlcv', return_value=tick)
     exchange = get_patched_exchange(mocker, default_conf)
+    # Existing data is appended to
     _download_pair_history(testdatadir, exchange, pair="UNITTEST/BTC", timeframe='1m')
+    assert json_dump_mock.call_count == 0
+    assert json_append_mock.call_count == 1
     _download_pair_history(testdatadir, exchange, pair="UNITTEST/BTC", timeframe='3m')
-    assert json_dump_mock.call_count == 2
+    assert json_dump_mock.call_count == 1
+    assert json_append_mock.call_count == 1
+
+    # Datahandlers without append support rewrite all data
+    npy_store_mock = mocker.patch(
+        'freqtrade.data.history.npydatahandler.NpyDataHandler.ohlcv_store', return_value=None)
+    mocker.patch('freqtrade.data.history.npydatahandler.NpyDataHandler.ohlcv_append',
+                 side_effect=NotImplementedError)
+    mocker.patch('freqtrade.data.history.npydatahandler.NpyDataHandler.ohlcv_data_min_max',
+                 side_effect=NotImplementedError)
+    mocker.patch('freqtrade.data.history.npydatahandler.NpyDataHandler._ohlcv_load',
+                 return_value=ohlcv_to_dataframe([[1509836460000, 1, 1, 1, 1, 1]] + tick, '1m',
+                                                 'UNITTEST/BTC', fill_missing=False,
+                                                 drop_incomplete=False))
+    _download_pair_history(testdatadir, exchange, pair="UNITTEST/BTC", timeframe='1m',
+                           data_handler=NpyDataHandler(testdatadir))
+    assert npy_store_mock.call_count == 1
+    assert len(npy_store_mock.call_args[1]['data']) == 2
 
 
 def test_download_backtesting_data_exception(ohlcv_history, mocker, caplog,
@@ -348,6 +392,22 @@ def test_load_partial_missing(testdatadir, caplog) -> None:
                    caplog)
 
 
+def test_load_data_workers(testdatadir, caplog) -> None:
+    pairs = ['UNITTEST/BTC', 'NONEXIST/BTC', 'XRP/ETH', 'UNITTEST/USDT']
+    timerange = TimeRange.parse_timerange('20180110-20180120')
+    expected = load_data(testdatadir, '5m', pairs, timerange=timerange)
+    expected_logs = [r.getMessage() for r in caplog.records]
+    assert len(expected_logs) >= 3
+    caplog.clear()
+
+    data = load_data(testdatadir, '5m', pairs, timerange=timerange, workers=2)
+    assert list(data) == list(expected)
+    for pair, df in expected.items():
+        assert df.equals(data[pair])
+    # Warnings from worker processes are logged once, and in the order of pairs
+    assert [r.getMessage() for r in caplog.records] == expected_logs
+
+
 def test_init(default_conf, mocker) -> None:
     assert {} == load_data(
         datadir=Path(''),
@@ -460,32 +520,42 @@ def test_validate_backtest_data(default_conf, mocker, caplog, testdatadir) -> No
     assert len(caplog.record_tuples) == 0
 
 
-def test_refresh_backtest_ohlcv_data(mocker, default_conf, markets, caplog, testdatadir):
-    dl_mock = mocker.patch('freqtrade.data.history.history_utils._download_pair_history',
-                           MagicMock())
+def test_refresh_backtest_ohlcv_data(mocker, default_conf, markets, caplog, tmpdir):
+    dl_mock = mocker.patch('freqtrade.data.history.history_utils._async_download_pair_history',
+                           get_mock_coro(True))
     mocker.patch(
         'freqtrade.exchange.Exchange.markets', PropertyMock(return_value=markets)
     )
-    mocker.patch.object(Path, "exists", MagicMock(return_value=True))
-    mocker.patch.object(Path, "unlink", MagicMock())
 
+    mocker.patch('freqtrade.exchange.Exchange.rate_limit', PropertyMock(return_value=50))
     ex = get_patched_exchange(mocker, default_conf)
     timerange = TimeRange.parse_timerange("20190101-20190102")
     refresh_backtest_ohlcv_data(exchange=ex, pairs=["ETH/BTC", "XRP/BTC"],
-                                timeframes=["1m", "5m"], datadir=testdatadir,
+                                timeframes=["1m", "5m"], datadir=Path(tmpdir),
                                 timerange=timerange, erase=True
                                 )
 
     assert dl_mock.call_count == 4
     assert dl_mock.call_args[1]['timerange'].starttype == 'date'
+    assert dl_mock.call_args[1]['erase'] is True
+    assert {(c[1]['pair'], c[1]['timeframe']) for c in dl_mock.call_args_list} == {
+        ('ETH/BTC', '1m'), ('ETH/BTC', '5m'), ('XRP/BTC', '1m'), ('XRP/BTC', '5m')}
+    # All downloads share one executor for disk I/O, shut down after the download
+    io_executors = {c[1]['io_executor'] for c in dl_mock.call_args_list}
+    assert len(io_executors) == 1
+    assert io_executors.pop()._shutdown
 
-    assert log_has("Downloading pair ETH/BTC, interval 1m.", caplog)
+    assert log_has("Total number of downloads: 4", caplog)
+    assert log_has_re(r"Download progress: 4/4 \(100.0 %\).*", caplog)
+    # All downloads completed - nothing to resume
+    assert not (Path(tmpdir) / '.download_state.json').exists()
 
 
-def test_download_data_no_markets(mocker, default_conf, caplog, testdatadir):
-    dl_mock = mocker.patch('freqtrade.data.history.history_utils._download_pair_history',
-                           MagicMock())
+def test_download_data_no_markets(mocker, default_conf, caplog, tmpdir):
+    dl_mock = mocker.patch('freqtrade.data.history.history_utils._async_download_pair_history',
+                           get_mock_coro(True))
 
+    mocker.patch('freqtrade.exchange.Exchange.rate_limit', PropertyMock(return_value=50))
     ex = get_patched_exchange(mocker, default_conf)
     mocker.patch(
         'freqtrade.exchange.Exchange.markets', PropertyMock(return_value={})
@@ -493,7 +563,7 @@ def test_download_data_no_markets(mocker, default_conf, caplog, testdatadir):
     timerange = TimeRange.parse_timerange("20190101-20190102")
     unav_pairs = refresh_backtest_ohlcv_data(exchange=ex, pairs=["BTT/BTC", "LTC/USDT"],
                                              timeframes=["1m", "5m"],
-                                             datadir=testdatadir,
+                                             datadir=Path(tmpdir),
                                              timerange=timerange, erase=False
                                              )
 
@@ -503,40 +573,50 @@ def test_download_data_no_markets(mocker, default_conf, caplog, testdatadir):
     assert log_has("Skipping pair BTT/BTC...", caplog)
 
 
-def test_refresh_backtest_trades_data(mocker, default_conf, markets, caplog, testdatadir):
-    dl_mock = mocker.patch('freqtrade.data.history.history_utils._download_trades_history',
-                           MagicMock())
+def test_refresh_backtest_trades_data(mocker, default_conf, markets, caplog, tmpdir):
+    dl_mock = mocker.patch('freqtrade.data.history.history_utils._async_download_trades_history',
+                           get_mock_coro(True))
     mocker.patch(
         'freqtrade.exchange.Exchange.markets', PropertyMock(return_value=markets)
     )
-    mocker.patch.object(Path, "exists", MagicMock(return_value=True))
-    mocker.patch.object(Path, "unlink", MagicMock())
 
+    mocker.patch('freqtrade.exchange.Exchange.rate_limit', PropertyMock(return_value=50))
     ex = get_patched_exchange(mocker, default_conf)
     timerange = TimeRange.parse_timerange("20190101-20190102")
     unavailable_pairs = refresh_backtest_trades_data(exchange=ex,
                                                      pairs=["ETH/BTC", "XRP/BTC", "XRP/ETH"],
-                                                     datadir=testdatadir,
+                                                     datadir=Path(tmpdir),
                                                      timerange=timerange, erase=True
                                                      )
 
     assert dl_mock.call_count == 2
     assert dl_mock.call_args[1]['timerange'].starttype == 'date'
+    assert dl_mock.call_args[1]['erase'] is True
 
-    assert log_has("Downloading trades for pair ETH/BTC.", caplog)
+    assert log_has("Total number of downloads: 2", caplog)
     assert unavailable_pairs == ["XRP/ETH"]
     assert log_has("Skipping pair XRP/ETH...", caplog)
 
 
-def test_download_trades_history(trades_history, mocker, default_conf, testdatadir, caplog) -> None:
+def _trade_ids(trades):
+    return [(t[0], t[1]) for t in trades]
 
-    ght_mock = MagicMock(side_effect=lambda pair, *args, **kwargs: (pair, trades_history))
-    mocker.patch('freqtrade.exchange.Exchange.get_historic_trades',
-                 ght_mock)
+
+def _iter_trades_mock(*pages):
+    async def iter_trades(*args, **kwargs):
+        for page in pages:
+            yield page
+    return MagicMock(side_effect=iter_trades)
+
+
+def test_download_trades_history(trades_history, mocker, default_conf, testdatadir, tmpdir,
+                                 caplog) -> None:
+    tmpdir1 = Path(tmpdir)
+    ght_mock = _iter_trades_mock(trades_history)
+    mocker.patch('freqtrade.exchange.Exchange._async_iter_trade_history', ght_mock)
     exchange = get_patched_exchange(mocker, default_conf)
-    file1 = testdatadir / 'ETH_BTC-trades.json.gz'
-    data_handler = get_datahandler(testdatadir, data_format='jsongz')
-    _backup_file(file1)
+    file1 = tmpdir1 / 'ETH_BTC-trades.json.gz'
+    data_handler = get_datahandler(tmpdir1, data_format='jsongz')
 
     assert not file1.is_file()
 
@@ -544,6 +624,9 @@ def test_download_trades_history(trades_history, mocker, default_conf, testdatad
                                     pair='ETH/BTC')
     assert log_has("New Amount of trades: 5", caplog)
     assert file1.is_file()
+    assert data_handler.trades_checkpoint_load('ETH/BTC') == {
+        'first_timestamp': trades_history[0][0], 'timestamp': trades_history[-1][0],
+        'id': trades_history[-1][1], 'ids': [trades_history[-1][1]], 'trades': 5}
 
     ght_mock.reset_mock()
     since_time = int(trades_history[-3][0] // 1000)
@@ -556,24 +639,22 @@ def test_download_trades_history(trades_history, mocker, default_conf, testdatad
     # Check this in seconds - since we had to convert to seconds above too.
     assert int(ght_mock.call_args_list[0][1]['since'] // 1000) == since_time2 - 5
     assert ght_mock.call_args_list[0][1]['from_id'] is not None
+    # Trades downloaded again are not stored twice
+    assert log_has("New Amount of trades: 5", caplog)
+    assert len(data_handler.trades_load('ETH/BTC')) == 5
 
-    # clean files freshly downloaded
-    _clean_test_file(file1)
-
-    mocker.patch('freqtrade.exchange.Exchange.get_historic_trades',
+    mocker.patch('freqtrade.exchange.Exchange._async_iter_trade_history',
                  MagicMock(side_effect=ValueError))
 
     assert not _download_trades_history(data_handler=data_handler, exchange=exchange,
                                         pair='ETH/BTC')
     assert log_has_re('Failed to download historic trades for pair: "ETH/BTC".*', caplog)
 
-    file2 = testdatadir / 'XRP_ETH-trades.json.gz'
-
-    _backup_file(file2, True)
+    file2 = tmpdir1 / 'XRP_ETH-trades.json.gz'
+    copyfile(testdatadir / 'XRP_ETH-trades.json.gz', file2)
 
     ght_mock.reset_mock()
-    mocker.patch('freqtrade.exchange.Exchange.get_historic_trades',
-                 ght_mock)
+    mocker.patch('freqtrade.exchange.Exchange._async_iter_trade_history', ght_mock)
     # Since before first start date
     since_time = int(trades_history[0][0] // 1000) - 500
     timerange = TimeRange('date', None, since_time, 0)
@@ -586,11 +667,63 @@ def test_download_trades_history(trades_history, mocker, default_conf, testdatad
     assert int(ght_mock.call_args_list[0][1]['since'] // 1000) == since_time
     assert ght_mock.call_args_list[0][1]['from_id'] is None
     assert log_has_re(r'Start earlier than available data. Redownloading trades for.*', caplog)
-    _clean_test_file(file2)
+    # Existing data was replaced
+    assert _trade_ids(data_handler.trades_load('XRP/ETH')) == _trade_ids(trades_history)
+
+
+@pytest.mark.parametrize('datahandler', ['jsongz', 'hdf5', 'npy'])
+def test_download_trades_history_chunks(trades_history, mocker, default_conf, tmpdir, caplog,
+                                        datahandler) -> None:
+    mocker.patch('freqtrade.data.history.history_utils.TRADES_CHUNK_SIZE', 2)
+    exchange = get_patched_exchange(mocker, default_conf)
+    data_handler = get_datahandler(Path(tmpdir), data_format=datahandler)
+    # Pages overlap by one trade, as with id based pagination
+    pages = [trades_history[:2], trades_history[1:4], trades_history[3:]]
+
+    append_mock = mocker.spy(data_handler, 'trades_append')
+    mocker.patch('freqtrade.exchange.Exchange._async_iter_trade_history', _iter_trades_mock())
+    assert _download_trades_history(data_handler=data_handler, exchange=exchange, pair='ETH/BTC')
+    assert log_has("New Amount of trades: 0", caplog)
+
+    mocker.patch('freqtrade.exchange.Exchange._async_iter_trade_history',
+                 _iter_trades_mock(*pages))
+    assert _download_trades_history(data_handler=data_handler, exchange=exchange, pair='ETH/BTC')
+    assert log_has("New Amount of trades: 5", caplog)
+    # First chunk is stored, later chunks are appended
+    assert append_mock.call_count == 2
+    assert _trade_ids(data_handler.trades_load('ETH/BTC')) == _trade_ids(trades_history)
+
+    # Download crashes after storing the first chunk
+    data_handler.trades_purge('ETH/BTC')
+    data_handler.trades_checkpoint_purge('ETH/BTC')
+
+    async def crash(*args, **kwargs):
+        yield pages[0]
+        raise ValueError('Connection lost')
+    mocker.patch('freqtrade.exchange.Exchange._async_iter_trade_history',
+                 MagicMock(side_effect=crash))
+    assert not _download_trades_history(data_handler=data_handler, exchange=exchange,
+                                        pair='ETH/BTC')
+    assert _trade_ids(data_handler.trades_load('ETH/BTC')) == _trade_ids(trades_history[:2])
+
+    # Resume from the checkpoint
+    caplog.clear()
+    ght_mock = _iter_trades_mock(*pages[1:])
+    mocker.patch('freqtrade.exchange.Exchange._async_iter_trade_history', ght_mock)
+    timerange = TimeRange('date', None, trades_history[0][0] // 1000 + 1, 0)
+    assert _download_trades_history(data_handler=data_handler, exchange=exchange,
+                                    pair='ETH/BTC', timerange=timerange)
+    assert log_has("Current Amount of trades: 2", caplog)
+    assert ght_mock.call_args[1]['from_id'] == trades_history[1][1]
+    assert ght_mock.call_args[1]['since'] == trades_history[1][0] - 5000
+    assert log_has("New Amount of trades: 5", caplog)
+    assert _trade_ids(data_handler.trades_load('ETH/BTC')) == _trade_ids(trades_history)
 
 
 def test_convert_trades_to_ohlcv(mocker, default_conf, testdatadir, caplog):
 
+    # Read trades in chunks, with candles continuing across chunks
+    mocker.patch('freqtrade.data.history.history_utils.TRADES_CHUNK_SIZE', 1001)
     pair = 'XRP/ETH'
     file1 = testdatadir / 'XRP_ETH-1m.json'
     file5 = testdatadir / 'XRP_ETH-5m.json'
@@ -624,6 +757,31 @@ def test_convert_trades_to_ohlcv(mocker, default_conf, testdatadir, caplog):
     assert log_has('Could not convert NoDatapair to OHLCV.', caplog)
 
 
+def test_convert_trades_to_ohlcv_npy(mocker, testdatadir, tmpdir):
+    mocker.patch('freqtrade.data.history.history_utils.TRADES_CHUNK_SIZE', 1001)
+    trades = JsonGzDataHandler(testdatadir).trades_load('XRP/ETH')
+    datadir = Path(tmpdir)
+    # Duplicate trades within a chunk and across chunks
+    NpyDataHandler(datadir).trades_store('XRP/ETH',
+                                         trades[:6] + trades[5:1001] + trades[1000:])
+    chunks_mock = mocker.spy(NpyDataHandler, '_trades_load_chunks')
+
+    convert_trades_to_ohlcv(['XRP/ETH'], timeframes=['1m', '5m'], datadir=datadir,
+                            timerange=None, data_format_trades='npy')
+    # Slices of the array are converted
+    assert chunks_mock.call_count == 0
+    for timeframe in ['1m', '5m']:
+        ohlcv = JsonDataHandler(datadir).ohlcv_load('XRP/ETH', timeframe, fill_missing=False,
+                                                    drop_incomplete=False)
+        assert_frame_equal(ohlcv, trades_to_ohlcv(trades, timeframe).reset_index(drop=True))
+
+    trades_arr = NpyDataHandler(datadir).trades_load_array('XRP/ETH')
+    chunks = list(_trades_array_chunks(trades_arr, 1001))
+    # One duplicate removed from each of the first 2 chunks
+    assert [len(chunk) for chunk in chunks[:3]] == [1000, 1000, 1001]
+    assert list(np.concatenate(chunks)['timestamp']) == [t[0] for t in trades]
+
+
 def test_datahandler_ohlcv_get_pairs(testdatadir):
     pairs = JsonDataHandler.ohlcv_get_pairs(testdatadir, '5m')
     # Convert to set to avoid failures due to sorting
@@ -708,17 +866,120 @@ def test_jsondatahandler_trades_purge(mocker, testdatadir):
 
 
 @pytest.mark.parametrize('datahandler', AVAILABLE_DATAHANDLERS)
-def test_datahandler_ohlcv_append(datahandler, testdatadir, ):
-    dh = get_datahandler(testdatadir, datahandler)
-    with pytest.raises(NotImplementedError):
-        dh.ohlcv_append('UNITTEST/ETH', '5m', DataFrame())
+def test_datahandler_ohlcv_append(datahandler, testdatadir, tmpdir):
+    ohlcv = JsonDataHandler(testdatadir).ohlcv_load('UNITTEST/BTC', '5m', fill_missing=False)
+    dh = get_datahandler(Path(tmpdir), datahandler)
+
+    # Appending without existing data stores the data
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[:1000])
+    assert_frame_equal(dh.ohlcv_load('UNITTEST/BTC', '5m', fill_missing=False,
+                                     drop_incomplete=False), ohlcv.iloc[:1000])
+    # Overlapping candles are skipped
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[900:2000])
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[1990:2000])
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[1999:])
+    loaded = dh.ohlcv_load('UNITTEST/BTC', '5m', fill_missing=False, drop_incomplete=False)
+    assert_frame_equal(loaded, ohlcv.reset_index(drop=True))
+
+    dh.ohlcv_store('UNITTEST/BTC', '5m', ohlcv.iloc[:10])
+    assert len(dh.ohlcv_load('UNITTEST/BTC', '5m', fill_missing=False,
+                             drop_incomplete=False)) == 10
+    assert dh.ohlcv_get_available_data(Path(tmpdir)) == [('UNITTEST/BTC', '5m')]
+    assert dh.ohlcv_purge('UNITTEST/BTC', '5m')
+    assert list(Path(tmpdir).iterdir()) == []
 
 
 @pytest.mark.parametrize('datahandler', AVAILABLE_DATAHANDLERS)
-def test_datahandler_trades_append(datahandler, testdatadir):
+def test_datahandler_ohlcv_data_min_max(datahandler, testdatadir, tmpdir):
+    ohlcv = JsonDataHandler(testdatadir).ohlcv_load('UNITTEST/BTC', '5m', fill_missing=False)
+    dh = get_datahandler(Path(tmpdir), datahandler)
+    assert dh.ohlcv_data_min_max('UNITTEST/BTC', '5m') is None
+
+    dh.ohlcv_store('UNITTEST/BTC', '5m', ohlcv.iloc[:1000])
+    assert dh.ohlcv_data_min_max('UNITTEST/BTC', '5m') == (ohlcv.iloc[0]['date'],
+                                                           ohlcv.iloc[999]['date'])
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[1000:])
+    assert dh.ohlcv_data_min_max('UNITTEST/BTC', '5m') == (ohlcv.iloc[0]['date'],
+                                                           ohlcv.iloc[-1]['date'])
+
+    dh.ohlcv_purge('UNITTEST/BTC', '5m')
+    assert dh.ohlcv_data_min_max('UNITTEST/BTC', '5m') is None
+
+
+def test_jsondatahandler_ohlcv_append_segments(testdatadir, tmpdir, mocker):
+    ohlcv = JsonDataHandler(testdatadir).ohlcv_load('UNITTEST/BTC', '5m', fill_missing=False)
+    dh = JsonGzDataHandler(Path(tmpdir))
+    mocker.patch.object(JsonGzDataHandler, '_max_segments', 2)
+    file = Path(tmpdir) / 'UNITTEST_BTC-5m.json.gz'
+    segments_dir = Path(tmpdir) / 'UNITTEST_BTC-5m.json.gz.parts'
+
+    dh.ohlcv_store('UNITTEST/BTC', '5m', ohlcv.iloc[:1000])
+    size = file.stat().st_size
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[1000:2000])
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[2000:3000])
+    # The main file is not rewritten
+    assert file.stat().st_size == size
+    assert [f.name for f in sorted(segments_dir.iterdir())] == ['000001.json.gz',
+                                                                '000002.json.gz']
+    # Nothing new to append
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[2000:3000])
+    assert len(list(segments_dir.iterdir())) == 2
+
+    # Segments are merged into the main file
+    dh.ohlcv_append('UNITTEST/BTC', '5m', ohlcv.iloc[3000:])
+    assert not segments_dir.exists()
+    assert file.stat().st_size > size
+    assert_frame_equal(dh.ohlcv_load('UNITTEST/BTC', '5m', fill_missing=False,
+                                     drop_incomplete=False), ohlcv.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('datahandler', AVAILABLE_DATAHANDLERS)
+def test_datahandler_trades_append(datahandler, trades_history, tmpdir):
+    dh = get_datahandler(Path(tmpdir), datahandler)
+    # Appending without existing data stores the trades
+    dh.trades_append('UNITTEST/ETH', trades_history[:2])
+    dh.trades_append('UNITTEST/ETH', trades_history[2:4])
+    dh.trades_append('UNITTEST/ETH', trades_history[4:])
+    assert _trade_ids(dh.trades_load('UNITTEST/ETH')) == _trade_ids(trades_history)
+
+    dh.trades_store('UNITTEST/ETH', trades_history[:3])
+    assert _trade_ids(dh.trades_load('UNITTEST/ETH')) == _trade_ids(trades_history[:3])
+    assert dh.trades_purge('UNITTEST/ETH')
+    assert dh.trades_load('UNITTEST/ETH') == []
+
+
+@pytest.mark.parametrize('datahandler', ['jsongz', 'hdf5'])
+def test_datahandler_trades_load_chunks(datahandler, testdatadir, tmpdir):
     dh = get_datahandler(testdatadir, datahandler)
-    with pytest.raises(NotImplementedError):
-        dh.trades_append('UNITTEST/ETH', [])
+    trades = dh.trades_load('XRP/ETH')
+    chunks = list(dh.trades_load_chunks('XRP/ETH', 1000))
+    assert len(chunks) == 13
+    assert max(len(chunk) for chunk in chunks) == 1000
+    assert [t for chunk in chunks for t in chunk] == trades
+    assert list(dh.trades_load_chunks('UNITTEST/NONEXIST', 1000)) == []
+
+    # Duplicates across chunks are removed
+    dh = get_datahandler(Path(tmpdir), datahandler)
+    dh.trades_store('XRP/ETH', trades[:600] + trades[599:1000])
+    chunks = list(dh.trades_load_chunks('XRP/ETH', 300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 299, 101]
+    assert [t for chunk in chunks for t in chunk] == trades[:1000]
+
+
+def test_datahandler_trades_checkpoint(tmpdir):
+    dh = JsonGzDataHandler(Path(tmpdir))
+    checkpoint = {'first_timestamp': 1, 'timestamp': 2, 'id': '2', 'ids': ['2'], 'trades': 2}
+    dh.trades_checkpoint_store('XRP/ETH', checkpoint)
+    assert (Path(tmpdir) / 'XRP_ETH-trades.checkpoint.json').is_file()
+    # Checkpoint without trades data is ignored
+    assert dh.trades_checkpoint_load('XRP/ETH') is None
+    dh.trades_store('XRP/ETH', [[1, '1', None, 'buy', 1.0, 1.0, 1.0]])
+    assert dh.trades_checkpoint_load('XRP/ETH') == checkpoint
+    assert dh.trades_get_pairs(Path(tmpdir)) == ['XRP/ETH']
+
+    assert dh.trades_checkpoint_purge('XRP/ETH')
+    assert dh.trades_checkpoint_load('XRP/ETH') is None
+    assert not dh.trades_checkpoint_purge('XRP/ETH')
 
 
 def test_hdf5datahandler_trades_get_pairs(testdatadir):
@@ -837,6 +1098,94 @@ def test_hdf5datahandler_ohlcv_purge(mocker, testdatadir):
     assert unlinkmock.call_count == 1
 
 
+def test_npydatahandler_ohlcv_load_and_resave(testdatadir):
+    dh = JsonDataHandler(testdatadir)
+    ohlcv = dh._ohlcv_load('UNITTEST/BTC', '5m')
+    assert len(ohlcv) > 0
+
+    file = testdatadir / 'UNITTEST_NEW-5m.npy'
+    assert not file.is_file()
+
+    dh_npy = NpyDataHandler(testdatadir)
+    dh_npy.ohlcv_store('UNITTEST/NEW', '5m', ohlcv)
+    assert file.is_file()
+    assert dh_npy.ohlcv_get_pairs(testdatadir, '5m') == ['UNITTEST/NEW']
+    assert dh_npy.ohlcv_get_available_data(testdatadir) == [('UNITTEST/NEW', '5m')]
+
+    ohlcv1 = dh_npy._ohlcv_load('UNITTEST/NEW', '5m')
+    assert ohlcv.equals(ohlcv1)
+
+    # Data goes from 2018-01-10 - 2018-01-30
+    timerange = TimeRange.parse_timerange('20180115-20180119')
+
+    # Call private function to ensure timerange is filtered while loading
+    ohlcv = dh._ohlcv_load('UNITTEST/BTC', '5m', timerange)
+    ohlcv = ohlcv[(ohlcv['date'] >= '2018-01-15') & (ohlcv['date'] <= '2018-01-19')]
+    ohlcv1 = dh_npy._ohlcv_load('UNITTEST/NEW', '5m', timerange)
+    assert ohlcv.reset_index(drop=True).equals(ohlcv1)
+    assert ohlcv1.iloc[0]['date'] == Timestamp('2018-01-15', tz='UTC')
+    assert ohlcv1.iloc[-1]['date'] == Timestamp('2018-01-19', tz='UTC')
+
+    assert dh_npy.ohlcv_purge('UNITTEST/NEW', '5m')
+    assert not file.is_file()
+    assert not dh_npy.ohlcv_purge('UNITTEST/NEW', '5m')
+
+    # Try loading inexisting file
+    ohlcv = dh_npy.ohlcv_load('UNITTEST/NONEXIST', '5m')
+    assert ohlcv.empty
+
+
+def test_npydatahandler_trades_load_and_resave(testdatadir, tmpdir):
+    trades = JsonGzDataHandler(testdatadir).trades_load('XRP/ETH')
+    tmpdir1 = Path(tmpdir)
+    file = tmpdir1 / 'XRP_ETH-trades.npy'
+
+    dh = NpyDataHandler(tmpdir1)
+    dh.trades_store('XRP/ETH', trades[:5000])
+    assert file.is_file()
+    assert dh.trades_get_pairs(tmpdir1) == ['XRP/ETH']
+    # Trades are appended to the end of the file
+    size = file.stat().st_size
+    dh.trades_append('XRP/ETH', trades[5000:])
+    assert file.stat().st_size == size + (len(trades) - 5000) * 44
+    assert dh.trades_load('XRP/ETH') == trades
+
+    # Structured array, loaded without copy
+    trades_arr = dh.trades_load_array('XRP/ETH')
+    assert isinstance(trades_arr, np.memmap)
+    assert len(trades_arr) == len(trades)
+    assert trades_arr['id'][0] == int(trades[0][1])
+    assert_frame_equal(trades_to_ohlcv(trades_arr, '5m'), trades_to_ohlcv(trades, '5m'))
+
+    # data goes from 2019-10-11 - 2019-10-13
+    timerange = TimeRange.parse_timerange('20191011-20191012')
+    trades2 = dh.trades_load('XRP/ETH', timerange)
+    assert trades2 == [t for t in trades
+                       if timerange.startts * 1000 <= t[0] < timerange.stopts * 1000]
+    chunks = list(dh.trades_load_chunks('XRP/ETH', 1000, timerange))
+    assert [t for chunk in chunks for t in chunk] == trades2
+
+    # Ids which are no integers are dictionary-encoded
+    dh.trades_store('ETH/BTC', [[1, '123', None, 'buy', 1.0, 1.0, 1.0],
+                                [2, None, 'limit', 'sell', 1.0, 1.0, 1.0]])
+    # Interrupted append left data behind
+    with (tmpdir1 / 'ETH_BTC-trades.npy').open('ab') as fp:
+        fp.write(b'\x00' * 20)
+    dh.trades_append('ETH/BTC', [[3, '0012', 'market', 'buy', 1.0, 2.0, 2.0],
+                                 [4, 'abc', None, 'buy', 1.0, 1.0, 1.0]])
+    assert dh.trades_load('ETH/BTC') == [[1, '123', None, 'buy', 1.0, 1.0, 1.0],
+                                         [2, None, 'limit', 'sell', 1.0, 1.0, 1.0],
+                                         [3, '0012', 'market', 'buy', 1.0, 2.0, 2.0],
+                                         [4, 'abc', None, 'buy', 1.0, 1.0, 1.0]]
+    assert list(dh.trades_load_array('ETH/BTC')['id']) == [123, -1, -2, -3]
+
+    assert dh.trades_purge('XRP/ETH')
+    assert not file.is_file()
+    assert not (tmpdir1 / 'XRP_ETH-trades.dict.json').is_file()
+    assert not dh.trades_purge('XRP/ETH')
+    assert dh.trades_load('XRP/ETH') == []
+
+
 def test_gethandlerclass():
     cl = get_datahandlerclass('json')
     assert cl == JsonDataHandler
@@ -848,6 +1197,9 @@ def test_gethandlerclass():
     cl = get_datahandlerclass('hdf5')
     assert cl == HDF5DataHandler
     assert issubclass(cl, IDataHandler)
+    cl = get_datahandlerclass('npy')
+    assert cl == NpyDataHandler
+    assert issubclass(cl, IDataHandler)
     with pytest.raises(ValueError, match=r"No datahandler for .*"):
         get_datahandlerclass('DeadBeef')
 
@@ -10,6 +10,7 @@ import ccxt
 import pytest
 from pandas import DataFrame
 
+from freqtrade.data.converter import ohlcv_to_dataframe
 from freqtrade.exceptions import (DDosProtection, DependencyException, InvalidOrderException,
                                   OperationalException, TemporaryError)
 from freqtrade.exchange import Binance, Bittrex, Exchange, Kraken
@@ -1520,6 +1521,52 @@ def test_refresh_latest_ohlcv(mocker, default_conf, caplog) -> None:
                    caplog)
 
 
+def test_refresh_latest_ohlcv_incremental(mocker, default_conf) -> None:
+    start = timeframe_to_prev_date('5m').replace(tzinfo=timezone.utc) - timedelta(minutes=500)
+    start_ms = int(start.timestamp()) * 1000
+    ohlcv = [[start_ms + i * 300000, i, i + 2, i - 1, i + 1, 10] for i in range(101)]
+
+    exchange = get_patched_exchange(mocker, default_conf)
+    exchange._api_async.fetch_ohlcv = get_mock_coro(ohlcv[:90])
+    pair = ('IOTA/ETH', '5m')
+    exchange.refresh_latest_ohlcv([pair])
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['since'] is None
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['limit'] == 1000
+    # Last candle is incomplete and dropped
+    assert len(exchange.klines(pair)) == 89
+
+    # Only fetch candles after the last cached candle, with some overlap
+    exchange._pairs_last_refresh_time[pair] = 0
+    exchange._api_async.fetch_ohlcv = get_mock_coro(ohlcv[85:])
+    res = exchange.refresh_latest_ohlcv([pair])
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['since'] == ohlcv[85][0]
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['limit'] == 16
+    expected = ohlcv_to_dataframe(ohlcv, '5m', 'IOTA/ETH')
+    assert exchange.klines(pair).equals(expected)
+    assert res[pair] is exchange.klines(pair, copy=False)
+
+    # Window is limited to ohlcv_candle_limit candles
+    exchange._ft_has['ohlcv_candle_limit'] = 50
+    exchange._pairs_last_refresh_time[pair] = 0
+    exchange.refresh_latest_ohlcv([pair])
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['since'] == ohlcv[96][0]
+    assert exchange.klines(pair).equals(expected.tail(50).reset_index(drop=True))
+
+    # Gap too large for one call - fetch everything
+    exchange._klines[pair] = expected.head(10)
+    exchange._pairs_last_refresh_time[pair] = 0
+    exchange.refresh_latest_ohlcv([pair])
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['since'] is None
+
+    # No incremental refresh without cache or with since_ms
+    exchange._pairs_last_refresh_time[pair] = 0
+    exchange.refresh_latest_ohlcv([pair], cache=False)
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['since'] is None
+    exchange._pairs_last_refresh_time[pair] = 0
+    exchange.refresh_latest_ohlcv([pair], since_ms=start_ms)
+    assert exchange._api_async.fetch_ohlcv.call_args[1]['since'] == start_ms
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("exchange_name", EXCHANGES)
 async def test__async_get_candle_history(default_conf, mocker, caplog, exchange_name):
@@ -1932,6 +1979,39 @@ async def test__async_get_trade_history_time_empty(default_conf, mocker, caplog,
     assert fetch_trades_cal[0][1]['since'] == trades_history[0][0]
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("exchange_name", EXCHANGES)
+async def test__async_iter_trade_history(default_conf, mocker, exchange_name,
+                                         trades_history):
+    mocker.patch('freqtrade.exchange.Exchange.exchange_has', return_value=True)
+    exchange = get_patched_exchange(mocker, default_conf, id=exchange_name)
+
+    async def mock_fetch_trades(pair, *args, **kwargs):
+        if 'since' in kwargs and kwargs['since'] == trades_history[0][0]:
+            return trades_history[:3]
+        elif kwargs.get('params', {}).get(exchange._trades_pagination_arg) == trades_history[2][1]:
+            return trades_history[2:]
+        # time based pagination continues from the last timestamp
+        return trades_history[2:]
+    exchange._async_fetch_trades = MagicMock(side_effect=mock_fetch_trades)
+
+    pages = [page async for page in exchange._async_iter_trade_history(
+        'ETH/BTC', since=trades_history[0][0], until=trades_history[-1][0] - 1)]
+    # Trades are returned page by page
+    assert len(pages) == 2
+    trades = [t for page in pages for t in page]
+    if exchange._trades_pagination == 'id':
+        # Last trade of a page is the first trade of the next page
+        assert trades == trades_history
+    else:
+        assert len(trades) == len(trades_history) + 1
+
+    mocker.patch('freqtrade.exchange.Exchange.exchange_has', return_value=False)
+    with pytest.raises(OperationalException,
+                       match="This exchange does not suport downloading Trades."):
+        exchange._async_iter_trade_history('ETH/BTC', since=trades_history[0][0])
+
+
 @pytest.mark.parametrize("exchange_name", EXCHANGES)
 def test_get_historic_trades(default_conf, mocker, caplog, exchange_name, trades_history):
     mocker.patch('freqtrade.exchange.Exchange.exchange_has', return_value=True)
@@ -0,0 +1,40 @@
+import asyncio
+
+from freqtrade.exchange.rate_limiter import TokenBucket
+
+
+def test_token_bucket():
+    bucket = TokenBucket.from_rate_limit(200)
+    assert bucket.rate == 5
+    assert bucket.capacity == 1
+
+    async def acquire_all(bucket, count):
+        loop = asyncio.get_event_loop()
+        times = []
+        for _ in range(count):
+            await bucket.acquire()
+            times.append(loop.time())
+        return times
+
+    loop = asyncio.get_event_loop()
+    # Burst of 3 requests, then 1 request every 10ms
+    bucket = TokenBucket(rate=100, capacity=3)
+    start = loop.time()
+    times = loop.run_until_complete(acquire_all(bucket, 6))
+    assert times[2] - start < 0.01
+    assert times[5] - start >= 0.029
+    assert all(b - a >= 0.009 for a, b in zip(times[2:], times[3:]))
+
+
+def test_token_bucket_concurrent():
+    loop = asyncio.get_event_loop()
+    bucket = TokenBucket(rate=200)
+    times = []
+
+    async def request():
+        await bucket.acquire()
+        times.append(loop.time())
+
+    loop.run_until_complete(asyncio.gather(*(request() for _ in range(5))))
+    times.sort()
+    assert all(b - a >= 0.004 for a, b in zip(times, times[1:]))
@@ -472,11 +472,13 @@ TESTS = [
 ]
 
 
+@pytest.mark.parametrize("engine", ['loop', 'vectorized'])
 @pytest.mark.parametrize("data", TESTS)
-def test_backtest_results(default_conf, fee, mocker, caplog, data) -> None:
+def test_backtest_results(default_conf, fee, mocker, caplog, data, engine) -> None:
     """
     run functional tests
     """
+    default_conf["backtest_engine"] = engine
     default_conf["stoploss"] = data.stop_loss
     default_conf["minimal_roi"] = data.roi
     default_conf["timeframe"] = tests_timeframe
@@ -497,6 +499,8 @@ def test_backtest_results(default_conf, fee, mocker, caplog, data) -> None:
     backtesting.strategy.advise_sell = lambda a, m: frame
     caplog.set_level(logging.DEBUG)
 
+    loop_mock = mocker.spy(Backtesting, '_backtest_loop') if engine == 'vectorized' else None
+
     pair = "UNITTEST/BTC"
     # Dummy data as we mock the analyze functions
     data_processed = {pair: frame.copy()}
@@ -507,6 +511,8 @@ def test_backtest_results(default_conf, fee, mocker, caplog, data) -> None:
         end_date=max_date,
         max_open_trades=10,
     )
+    if loop_mock:
+        assert loop_mock.call_count == 0
 
     results = result['results']
     assert len(results) == len(data.trades)
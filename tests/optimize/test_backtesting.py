@@ -1,6 +1,7 @@
 # pragma pylint: disable=missing-docstring, W0212, line-too-long, C0103, unused-argument
 
 import random
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, PropertyMock
 
@@ -8,6 +9,7 @@ import numpy as np
 import pandas as pd
 import pytest
 from arrow import Arrow
+from cachetools import LRUCache
 
 from freqtrade.commands.optimize_commands import setup_optimize_configuration, start_backtesting
 from freqtrade.configuration import TimeRange
@@ -17,7 +19,8 @@ from freqtrade.data.converter import clean_ohlcv_dataframe
 from freqtrade.data.dataprovider import DataProvider
 from freqtrade.data.history import get_timerange
 from freqtrade.exceptions import DependencyException, OperationalException
-from freqtrade.optimize.backtesting import Backtesting
+from freqtrade.optimize.backtest_shards import ShardRun, ShardWindow, get_shard_windows
+from freqtrade.optimize.backtesting import HEADERS, Backtesting, PairRows, _signals_size
 from freqtrade.persistence import LocalTrade
 from freqtrade.resolvers import StrategyResolver
 from freqtrade.state import RunMode
@@ -146,6 +149,14 @@ def _trend_alternate(dataframe=None, metadata=None):
     return dataframe
 
 
+def _random_signals(dataframe=None, metadata=None):
+    # Reproducible per pair and dataframe length
+    rng = np.random.default_rng(len(metadata['pair']) + len(dataframe))
+    dataframe['buy'] = (rng.random(len(dataframe)) > 0.9).astype(int)
+    dataframe['sell'] = (rng.random(len(dataframe)) > 0.95).astype(int)
+    return dataframe
+
+
 # Unit tests
 def test_setup_optimize_configuration_without_arguments(mocker, default_conf, caplog) -> None:
     patched_configuration_load_config_file(mocker, default_conf)
@@ -195,6 +206,7 @@ def test_setup_bt_configuration_with_arguments(mocker, default_conf, caplog) ->
         '--export', '/bar/foo',
         '--export-filename', 'foo_bar.json',
         '--fee', '0',
+        '--backtest-engine', 'vectorized',
     ]
 
     config = setup_optimize_configuration(get_args(args), RunMode.BACKTEST)
@@ -230,6 +242,9 @@ def test_setup_bt_configuration_with_arguments(mocker, default_conf, caplog) ->
     assert 'fee' in config
     assert log_has('Parameter --fee detected, setting fee to: {} ...'.format(config['fee']), caplog)
 
+    assert config['backtest_engine'] == 'vectorized'
+    assert log_has('Using backtest engine: vectorized ...', caplog)
+
 
 def test_setup_optimize_configuration_stake_amount(mocker, default_conf, caplog) -> None:
 
@@ -341,6 +356,38 @@ def test_data_to_dataframe_bt(default_conf, mocker, testdatadir) -> None:
     assert processed['UNITTEST/BTC'].equals(processed2['UNITTEST/BTC'])
 
 
+def test_get_ohlcv_as_lists(default_conf, mocker, testdatadir) -> None:
+    patch_exchange(mocker)
+    timerange = TimeRange.parse_timerange('1510694220-1510700340')
+    data = history.load_data(testdatadir, '1m', ['UNITTEST/BTC'], timerange=timerange,
+                             fill_up_missing=True)
+    backtesting = Backtesting(default_conf)
+    processed = backtesting.strategy.ohlcvdata_to_dataframe(data)
+    signals = backtesting._get_signal_dataframes(processed)['UNITTEST/BTC']
+    rows = backtesting._get_ohlcv_as_lists(processed)['UNITTEST/BTC']
+
+    assert isinstance(rows, PairRows)
+    assert rows.dates.dtype == np.int64
+    assert rows.open.dtype == np.float64
+    assert rows.buy.dtype == np.int8
+    assert rows.sell.dtype == np.int8
+    # Rows are identical to the python lists of the dataframe
+    expected = signals.values.tolist()
+    assert len(rows) == len(expected) == 101
+    assert [rows[idx] for idx in range(len(rows))] == expected
+    assert rows[-1] == expected[-1]
+    assert rows.dates[0] == signals['date'].iloc[0].value
+    with pytest.raises(IndexError):
+        rows[len(rows)]
+
+    # Signals other than 0 / 1 are kept as they are
+    signals = signals.copy()
+    signals.loc[signals.index[0], 'sell'] = 2
+    rows = PairRows(signals[HEADERS])
+    assert rows.sell.dtype == np.float64
+    assert rows[0][4] == 2.0
+
+
 def test_backtesting_start(default_conf, mocker, testdatadir, caplog) -> None:
     def get_timerange(input1):
         return Arrow(2017, 11, 14, 21, 17), Arrow(2017, 11, 14, 22, 59)
@@ -762,6 +809,173 @@ def test_backtest_multi_pair(default_conf, fee, mocker, tres, pair, testdatadir)
     assert len(evaluate_result_multi(results['results'], '5m', 1)) == 0
 
 
+@pytest.mark.parametrize('conf', [
+    {},
+    {'trailing_stop': True, 'trailing_stop_positive': 0.01,
+     'trailing_stop_positive_offset': 0.02, 'trailing_only_offset_is_reached': True},
+    {'trailing_stop': True, 'stoploss': -0.02},
+    {'minimal_roi': {"0": 0.02, "20": 0.01, "60": 0}, 'stoploss': -0.05,
+     'ask_strategy': {'sell_profit_only': True, 'ignore_roi_if_buy_signal': True}},
+    {'ask_strategy': {'use_sell_signal': False}, 'enable_protections': True,
+     'protections': [{"method": "StoplossGuard", "lookback_period_candles": 10,
+                      "trade_limit": 1, "stop_duration_candles": 5},
+                     {"method": "CooldownPeriod", "stop_duration_candles": 2}]},
+])
+def test_backtest_vectorized_equals_loop(default_conf, fee, mocker, testdatadir, conf):
+
+    mocker.patch("freqtrade.exchange.Exchange.get_min_pair_stake_amount", return_value=0.00001)
+    mocker.patch('freqtrade.exchange.Exchange.get_fee', fee)
+    patch_exchange(mocker)
+    default_conf.update(conf)
+    default_conf['timeframe'] = '5m'
+
+    pairs = ['ADA/BTC', 'DASH/BTC', 'ETH/BTC', 'LTC/BTC', 'NXT/BTC']
+    data = history.load_data(datadir=testdatadir, timeframe='5m', pairs=pairs)
+    data = trim_dictlist(data, -1000)
+    # Pair starting late
+    data['ETH/BTC'] = data['ETH/BTC'][200:].reset_index(drop=True)
+
+    results = {}
+    for engine in ['loop', 'vectorized']:
+        default_conf['backtest_engine'] = engine
+        backtesting = Backtesting(default_conf)
+        backtesting.strategy.advise_buy = _random_signals
+        backtesting.strategy.advise_sell = _random_signals
+        if engine == 'vectorized':
+            loop_mock = mocker.spy(Backtesting, '_backtest_loop')
+
+        processed = backtesting.strategy.ohlcvdata_to_dataframe(data)
+        min_date, max_date = get_timerange(processed)
+        results[engine] = backtesting.backtest(
+            processed=processed, start_date=min_date, end_date=max_date, max_open_trades=3,
+            enable_protections=default_conf.get('enable_protections', False))
+
+    # No fallback to the candle loop
+    assert loop_mock.call_count == 0
+    assert len(results['loop']['results']) > 10
+    pd.testing.assert_frame_equal(results['loop']['results'], results['vectorized']['results'])
+    assert results['loop']['final_balance'] == results['vectorized']['final_balance']
+    assert len(results['loop']['locks']) == len(results['vectorized']['locks'])
+
+
+def test_backtest_vectorized_fallback(default_conf, fee, mocker, testdatadir, caplog):
+    mocker.patch('freqtrade.exchange.Exchange.get_fee', fee)
+    patch_exchange(mocker)
+    default_conf['backtest_engine'] = 'vectorized'
+    default_conf['timeframe'] = '1m'
+    backtesting = Backtesting(default_conf)
+    assert backtesting.vectorized
+
+    backtesting.strategy.use_custom_stoploss = True
+    backtesting._set_strategy(backtesting.strategy)
+    assert not backtesting.vectorized
+    assert log_has_re(r"Strategy .* uses custom sell logic, falling back to .*", caplog)
+
+    # Position stacking is only supported by the candle loop
+    backtesting.strategy.use_custom_stoploss = False
+    backtesting._set_strategy(backtesting.strategy)
+    assert backtesting.vectorized
+    vectorized_mock = mocker.spy(Backtesting, '_backtest_vectorized')
+    data = history.load_data(datadir=testdatadir, timeframe='1m', pairs=['UNITTEST/BTC'],
+                             timerange=TimeRange.parse_timerange('1510694220-1510700340'))
+    processed = backtesting.strategy.ohlcvdata_to_dataframe(data)
+    min_date, max_date = get_timerange(processed)
+    backtesting.backtest(processed=processed, start_date=min_date, end_date=max_date,
+                         max_open_trades=10, position_stacking=True)
+    assert vectorized_mock.call_count == 0
+
+
+@pytest.mark.parametrize('conf', [
+    {},
+    {'trailing_stop': True, 'trailing_stop_positive': 0.01,
+     'trailing_stop_positive_offset': 0.02, 'trailing_only_offset_is_reached': True},
+    {'minimal_roi': {"0": 0.02, "20": 0.01, "60": 0}, 'stoploss': -0.05,
+     'ask_strategy': {'sell_profit_only': True, 'ignore_roi_if_buy_signal': True}},
+    {'custom_sell': True, 'use_custom_stoploss': True, 'trailing_stop': True},
+])
+def test_backtest_exit_evaluator(default_conf, fee, mocker, testdatadir, conf):
+
+    def _custom_sell(pair, trade, current_time, current_rate, current_profit, **kwargs):
+        if current_profit > 0.005 and current_time.minute % 20 == 0:
+            return 'custom ' + pair
+        return None
+
+    def _custom_stoploss(pair, trade, current_time, current_rate, current_profit, **kwargs):
+        return -0.04 if (current_time - trade.open_date_utc).total_seconds() < 3600 else -0.01
+
+    mocker.patch("freqtrade.exchange.Exchange.get_min_pair_stake_amount", return_value=0.00001)
+    mocker.patch('freqtrade.exchange.Exchange.get_fee', fee)
+    patch_exchange(mocker)
+    custom_sell = conf.pop('custom_sell', False)
+    default_conf.update(conf)
+    default_conf['timeframe'] = '5m'
+
+    data = history.load_data(datadir=testdatadir, timeframe='5m',
+                             pairs=['ADA/BTC', 'ETH/BTC', 'LTC/BTC'])
+    data = trim_dictlist(data, -1000)
+
+    results = {}
+    for use_evaluator in [True, False]:
+        mocker.patch('freqtrade.optimize.backtesting.uses_default_sell_logic',
+                     return_value=use_evaluator)
+        backtesting = Backtesting(default_conf)
+        backtesting.strategy.advise_buy = _random_signals
+        backtesting.strategy.advise_sell = _random_signals
+        if custom_sell:
+            backtesting.strategy.custom_sell = _custom_sell
+            backtesting.strategy.custom_stoploss = _custom_stoploss
+        should_sell = mocker.spy(backtesting.strategy, 'should_sell')
+
+        processed = backtesting.strategy.ohlcvdata_to_dataframe(data)
+        min_date, max_date = get_timerange(processed)
+        results[use_evaluator] = backtesting.backtest(
+            processed=processed, start_date=min_date, end_date=max_date, max_open_trades=3)
+        assert (backtesting.exit_evaluator is not None) == use_evaluator
+        assert (should_sell.call_count == 0) == use_evaluator
+
+    assert len(results[True]['results']) > 10
+    if custom_sell:
+        assert results[True]['results']['sell_reason'].str.startswith('custom ').any()
+    pd.testing.assert_frame_equal(results[True]['results'], results[False]['results'])
+    assert results[True]['final_balance'] == results[False]['final_balance']
+
+
+def test_get_signal_dataframes_cache(default_conf, mocker, testdatadir):
+    patch_exchange(mocker)
+    default_conf['timeframe'] = '1m'
+    backtesting = Backtesting(default_conf)
+    data = history.load_data(datadir=testdatadir, timeframe='1m', pairs=['UNITTEST/BTC'],
+                             timerange=TimeRange.parse_timerange('1510694220-1510700340'))
+    processed = backtesting.strategy.ohlcvdata_to_dataframe(data)
+    advise_buy = mocker.spy(backtesting.strategy, 'advise_buy')
+
+    # No cache without signal_key
+    expected = backtesting._get_signal_dataframes(processed)
+    backtesting._get_signal_dataframes(processed)
+    assert advise_buy.call_count == 2
+    assert len(backtesting.signal_cache) == 0
+
+    backtesting.signal_key = (1, 'a')
+    backtesting._get_signal_dataframes(processed)
+    assert advise_buy.call_count == 3
+    assert len(backtesting.signal_cache) == 1
+
+    processed = backtesting.strategy.ohlcvdata_to_dataframe(data)
+    result = backtesting._get_signal_dataframes(processed)
+    assert advise_buy.call_count == 3
+    pd.testing.assert_frame_equal(result['UNITTEST/BTC'], expected['UNITTEST/BTC'])
+
+    backtesting.signal_key = (2, 'a')
+    backtesting._get_signal_dataframes(processed)
+    assert advise_buy.call_count == 4
+    assert len(backtesting.signal_cache) == 2
+
+    # Signals which don't fit into the cache are not stored
+    backtesting.signal_cache = LRUCache(maxsize=10, getsizeof=_signals_size)
+    backtesting._get_signal_dataframes(processed)
+    assert len(backtesting.signal_cache) == 0
+
+
 def test_backtest_start_timerange(default_conf, mocker, caplog, testdatadir):
 
     patch_exchange(mocker)
@@ -976,3 +1190,240 @@ def test_backtest_start_multi_strat_nomock(default_conf, mocker, caplog, testdat
     assert 'SELL REASON STATS' in captured.out
     assert 'LEFT OPEN TRADES REPORT' in captured.out
     assert 'STRATEGY SUMMARY' in captured.out
+
+
+def test_backtest_start_profile(default_conf, fee, mocker, testdatadir, tmpdir, capsys):
+    patch_exchange(mocker)
+    mocker.patch('freqtrade.exchange.Exchange.get_fee', fee)
+    mocker.patch('freqtrade.plugins.pairlistmanager.PairListManager.whitelist',
+                 PropertyMock(return_value=['LTC/BTC', 'ETH/BTC']))
+    store_mock = mocker.patch('freqtrade.optimize.backtesting.store_backtest_stats')
+    patched_configuration_load_config_file(mocker, default_conf)
+
+    args = [
+        'backtesting',
+        '--config', 'config.json',
+        '--strategy', 'DefaultStrategy',
+        '--datadir', str(testdatadir),
+        '--userdir', str(tmpdir),
+        '--timeframe', '5m',
+        '--timerange', '20180110-20180112',
+        '--export', 'trades',
+        '--profile', 'cprofile',
+    ]
+    args = get_args(args)
+    start_backtesting(args)
+
+    stats = store_mock.call_args[0][1]
+    assert set(stats['profile']['phases']) == {'load_data', 'generate_stats'}
+    profile = stats['strategy']['DefaultStrategy']['profile']
+    assert set(profile['phases']) == {'populate_indicators', 'advise_buy', 'advise_sell',
+                                      'backtest_loop'}
+    assert profile['phases']['advise_buy']['calls'] == 2
+    assert profile['phases']['backtest_loop']['calls'] == 1
+    assert set(profile['pairs']) == {'LTC/BTC', 'ETH/BTC'}
+    assert set(profile['pairs']['ETH/BTC']) == {'populate_indicators', 'advise_buy',
+                                                'advise_sell'}
+
+    captured = capsys.readouterr()
+    assert 'TIMINGS DefaultStrategy' in captured.out
+    assert 'TIMINGS PER PAIR' in captured.out
+    assert len(list(Path(tmpdir / 'backtest_results').glob('backtest_profile_*.prof'))) == 1
+
+
+def test_backtest_start_multi_strat_parallel(default_conf, fee, mocker, testdatadir, caplog):
+    patch_exchange(mocker)
+    mocker.patch('freqtrade.exchange.Exchange.get_fee', fee)
+    mocker.patch('freqtrade.plugins.pairlistmanager.PairListManager.whitelist',
+                 PropertyMock(return_value=['LTC/BTC', 'ETH/BTC']))
+    store_mock = mocker.patch('freqtrade.optimize.backtesting.store_backtest_stats')
+    mocker.patch('freqtrade.optimize.backtesting.show_backtest_results')
+    patched_configuration_load_config_file(mocker, default_conf)
+
+    args = [
+        'backtesting',
+        '--config', 'config.json',
+        '--datadir', str(testdatadir),
+        '--strategy-path', str(Path(__file__).parents[1] / 'strategy/strats'),
+        '--timeframe', '5m',
+        '--timerange', '20180110-20180112',
+        '--export', 'trades',
+        '--strategy-list',
+        'DefaultStrategy',
+        'TestStrategyLegacy',
+    ]
+    start_backtesting(get_args(args))
+    sequential = store_mock.call_args[0][1]
+
+    start_backtesting(get_args(args + ['--backtest-workers', '2']))
+    parallel = store_mock.call_args[0][1]
+
+    assert log_has('Backtesting 2 strategies using 2 worker processes.', caplog)
+    assert log_has_re(r'Backtesting of strategy TestStrategyLegacy finished \(\d/2\)\.', caplog)
+    # Log messages of the workers are emitted by the main process
+    assert log_has('Running backtesting for Strategy TestStrategyLegacy', caplog)
+
+    assert list(parallel['strategy']) == ['DefaultStrategy', 'TestStrategyLegacy']
+    assert parallel['strategy_comparison'] == sequential['strategy_comparison']
+    for strategy in ['DefaultStrategy', 'TestStrategyLegacy']:
+        assert (parallel['strategy'][strategy]['trades']
+                == sequential['strategy'][strategy]['trades'])
+        assert parallel['strategy'][strategy]['total_trades'] > 0
+
+
+@pytest.mark.parametrize('max_open_trades,dry_run_wallet,shards,pairs,amend', [
+    (3, 1000, 4, ['LTC/BTC', 'ETH/BTC'], False),
+    (1, 1000, 12, ['LTC/BTC', 'ETH/BTC'], False),
+    # Balance allows only one trade at the same time
+    (3, 0.0015, 12, ['LTC/BTC', 'ETH/BTC'], False),
+    # Stake amounts depend on the balance - backtests the complete timerange at once
+    (3, 0.0018, 12, ['LTC/BTC', 'ETH/BTC', 'ADA/BTC', 'XLM/BTC'], True),
+])
+def test_backtest_start_sharded(default_conf, fee, mocker, testdatadir, caplog,
+                                max_open_trades, dry_run_wallet, shards, pairs, amend):
+    default_conf.update({
+        'max_open_trades': max_open_trades,
+        'dry_run_wallet': dry_run_wallet,
+        'amend_last_stake_amount': amend,
+        # Recursive indicators (RSI, ADX) need a long warm-up to match the complete timerange
+        'startup_candle_count': 300,
+    })
+    patch_exchange(mocker)
+    mocker.patch("freqtrade.exchange.Exchange.get_min_pair_stake_amount", return_value=0.00001)
+    mocker.patch('freqtrade.exchange.Exchange.get_fee', fee)
+    mocker.patch('freqtrade.plugins.pairlistmanager.PairListManager.whitelist',
+                 PropertyMock(return_value=pairs))
+    store_mock = mocker.patch('freqtrade.optimize.backtesting.store_backtest_stats')
+    mocker.patch('freqtrade.optimize.backtesting.show_backtest_results')
+    patched_configuration_load_config_file(mocker, default_conf)
+
+    args = [
+        'backtesting',
+        '--config', 'config.json',
+        '--datadir', str(testdatadir),
+        '--timeframe', '5m',
+        '--timerange', '20180111-20180118',
+        '--export', 'trades',
+    ]
+    start_backtesting(get_args(args))
+    sequential = store_mock.call_args[0][1]['strategy']['DefaultStrategy']
+
+    start_backtesting(get_args(args + ['--backtest-shards', str(shards)]))
+    sharded = store_mock.call_args[0][1]['strategy']['DefaultStrategy']
+
+    if amend:
+        assert log_has_re(r"Sharded backtesting is not supported with amend_last_stake_amount.*",
+                          caplog)
+    else:
+        assert log_has_re(rf'Backtesting with data from .* in {shards} windows '
+                          rf'using {shards} worker processes\.\.', caplog)
+        assert log_has_re(rf'Stitched {shards} windows, \d+ of them were continued .*', caplog)
+    assert sequential['total_trades'] > 0
+    assert sharded['trades'] == sequential['trades']
+    assert sharded['final_balance'] == sequential['final_balance']
+
+
+def test_get_shard_windows():
+    start = datetime(2018, 1, 10, tzinfo=timezone.utc)
+    windows = get_shard_windows(start, start + timedelta(minutes=50), 5, 3)
+    assert windows == [
+        ShardWindow(start + timedelta(minutes=5), start + timedelta(minutes=15)),
+        ShardWindow(start + timedelta(minutes=20), start + timedelta(minutes=30)),
+        ShardWindow(start + timedelta(minutes=35), start + timedelta(minutes=50)),
+    ]
+    # Never more windows than candles
+    assert len(get_shard_windows(start, start + timedelta(minutes=10), 5, 4)) == 2
+
+
+def test_shard_run_matches():
+    start = datetime(2018, 1, 10, tzinfo=timezone.utc)
+
+    def trade(pair, open_minutes, close_minutes=None):
+        trade = LocalTrade(pair=pair, open_rate=1, stake_amount=1, amount=1, fee_open=0,
+                           fee_close=0, open_date=start + timedelta(minutes=open_minutes),
+                           is_open=close_minutes is None)
+        if close_minutes is not None:
+            trade.close_date = start + timedelta(minutes=close_minutes)
+            trade.close_profit_abs = 0.5
+        return trade
+
+    closed = trade('ETH/BTC', 5, 20)
+    still_open = trade('LTC/BTC', 15)
+    run = ShardRun([closed], [still_open], [(start + timedelta(minutes=15), 0.2)], 1.0)
+
+    def at(minutes):
+        return start + timedelta(minutes=minutes)
+
+    assert run.matches(at(5), {}, 0.0)
+    # ETH/BTC trade is open at the start of these candles
+    assert not run.matches(at(10), {}, 0.0)
+    assert run.matches(at(10), {'ETH/BTC': [trade('ETH/BTC', 5)]}, 0.0)
+    assert not run.matches(at(10), {'ETH/BTC': [trade('ETH/BTC', 0)]}, 0.0)
+    assert run.matches(at(20), {'ETH/BTC': [trade('ETH/BTC', 5)], 'LTC/BTC': [still_open]},
+                       0.0)
+    assert run.matches(at(25), {'LTC/BTC': [still_open]}, 0.5)
+    # The LTC/BTC entry is rejected with a lower balance
+    assert not run.matches(at(10), {'ETH/BTC': [trade('ETH/BTC', 5)]}, -0.5)
+    assert run.matches(at(25), {'LTC/BTC': [still_open]}, -0.5)
+
+    assert run.trades_from(at(20)) == [closed]
+    assert run.trades_from(at(25)) == []
+
+
+def test_handle_left_open_sequence(default_conf, fee, mocker):
+    patch_exchange(mocker)
+    backtesting = Backtesting(default_conf)
+    backtesting.prepare_backtest(False)
+    start = datetime(2021, 5, 1, tzinfo=timezone.utc)
+
+    def trade(pair, minutes):
+        trade = LocalTrade(pair=pair, stake_amount=0.001, amount=1, open_rate=0.1,
+                           fee_open=fee.return_value, fee_close=fee.return_value,
+                           exchange='binance', is_open=True,
+                           open_date=start + timedelta(minutes=minutes))
+        LocalTrade.add_bt_trade(trade)
+        return trade
+
+    ltc_late = trade('LTC/BTC', 20)
+    eth = trade('ETH/BTC', 5)
+    ltc = trade('LTC/BTC', 5)
+    xrp = trade('XRP/BTC', 0)
+    last_row = [pd.Timestamp(start + timedelta(minutes=30)), 0, 0.11, 0.11, 0, 0.1, 0.12]
+    data = {pair: [last_row] for pair in ['XRP/BTC', 'ETH/BTC', 'LTC/BTC']}
+    # Closed by open date, then by the sequence of the pairs in the backtest loop -
+    # independent of the grouping
+    closed = backtesting.handle_left_open({'LTC/BTC': [ltc, ltc_late], 'ETH/BTC': [eth],
+                                           'XRP/BTC': [xrp]}, data)
+    assert [(t.pair, t.open_date) for t in closed] == [
+        (t.pair, t.open_date) for t in [xrp, eth, ltc, ltc_late]]
+    assert all(t.sell_reason == SellType.FORCE_SELL.value for t in closed)
+    assert LocalTrade.trades_open == []
+    LocalTrade.reset_trades()
+
+
+def test_backtest_sharded_unsupported(default_conf, mocker, caplog):
+    patch_exchange(mocker)
+    default_conf.update({'backtest_shards': 2})
+    backtesting = Backtesting(default_conf)
+    assert not backtesting._supports_sharding()
+    assert log_has_re(r"Sharded backtesting is not supported with startup_candle_count below "
+                      r"300 .*", caplog)
+
+    default_conf.update({'startup_candle_count': 300, 'enable_protections': True})
+    backtesting = Backtesting(default_conf)
+    assert not backtesting._supports_sharding()
+    assert log_has("Sharded backtesting is not supported with protections, "
+                   "backtesting the complete timerange at once.", caplog)
+
+    default_conf.update({'enable_protections': False, 'stake_amount': 'unlimited'})
+    assert not backtesting._supports_sharding()
+    assert log_has_re(r"Sharded backtesting is not supported with unlimited stake amount.*",
+                      caplog)
+
+    default_conf.update({'stake_amount': 0.001, 'amend_last_stake_amount': True})
+    assert not backtesting._supports_sharding()
+    assert log_has_re(r"Sharded backtesting is not supported with amend_last_stake_amount.*",
+                      caplog)
+
+    default_conf['amend_last_stake_amount'] = False
+    assert backtesting._supports_sharding()
@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import rapidjson
+
+from freqtrade.commands.optimize_commands import start_benchmark
+from freqtrade.exceptions import OperationalException
+from freqtrade.optimize.benchmark import (BENCHMARK_RANDOM_STATE, Benchmark, compare_to_baseline,
+                                          generate_ohlcv, get_benchmark_config, synthetic_markets,
+                                          synthetic_pairs)
+from tests.conftest import get_args, log_has
+
+
+def test_synthetic_pairs():
+    pairs = synthetic_pairs(30)
+    assert pairs[:3] == ['AAA/USDT', 'AAB/USDT', 'AAC/USDT']
+    assert len(set(pairs)) == 30
+    assert synthetic_pairs(1, 'BTC') == ['AAA/BTC']
+
+    markets = synthetic_markets(pairs[:2])
+    assert list(markets) == pairs[:2]
+    assert markets['AAB/USDT']['base'] == 'AAB'
+    assert markets['AAB/USDT']['quote'] == 'USDT'
+
+
+def test_generate_ohlcv():
+    data = generate_ohlcv(500, '1h', seed=3)
+    assert len(data) == 500
+    assert list(data.columns) == ['date', 'open', 'high', 'low', 'close', 'volume']
+    assert data['date'].iloc[0].isoformat() == '2020-01-01T00:00:00+00:00'
+    assert (data['date'].diff().iloc[1:].dt.total_seconds() == 3600).all()
+    assert (data['high'] >= data[['open', 'close']].max(axis=1)).all()
+    assert (data['low'] <= data[['open', 'close']].min(axis=1)).all()
+    assert (data['low'] > 0).all()
+    assert np.array_equal(data['open'].iloc[1:], data['close'].iloc[:-1])
+
+    # Deterministic
+    assert data.equals(generate_ohlcv(500, '1h', seed=3))
+    assert not data.equals(generate_ohlcv(500, '1h', seed=4))
+
+
+def test_get_benchmark_config():
+    config = get_benchmark_config({})
+    assert len(config['exchange']['pair_whitelist']) == 10
+    assert config['benchmark_candles'] == 10000
+    assert config['epochs'] == 10
+    assert config['timeframe'] == '5m'
+    assert config['strategy'] == 'SampleStrategy'
+    assert config['hyperopt_random_state'] == BENCHMARK_RANDOM_STATE
+
+    config = get_benchmark_config({'benchmark_pairs': 3, 'benchmark_epochs': 0,
+                                   'hyperopt_random_state': 0,
+                                   'timeframe': '1h', 'dataformat_ohlcv': 'npy'})
+    assert config['hyperopt_random_state'] == 0
+    assert config['exchange']['pair_whitelist'] == synthetic_pairs(3)
+    assert config['epochs'] == 0
+    assert config['timeframe'] == '1h'
+    assert config['dataformat_ohlcv'] == 'npy'
+
+    with pytest.raises(OperationalException, match=r"Number of epochs must not be negative."):
+        get_benchmark_config({'benchmark_epochs': -1})
+
+
+def test_compare_to_baseline():
+    baseline = {'candles_per_second': 1000, 'epochs_per_second': None,
+                'timings': {'backtest': 1.0, 'hyperopt_epochs': 2.0}}
+    report = {'candles_per_second': 900, 'epochs_per_second': 10,
+              'timings': {'backtest': 1.1}}
+    assert compare_to_baseline(report, baseline) == []
+
+    report = {'candles_per_second': 700, 'epochs_per_second': 10,
+              'timings': {'backtest': 1.5}}
+    assert compare_to_baseline(report, baseline) == [
+        'candles_per_second: 700.00 (baseline: 1000.00)',
+        'backtest: 1.500s (baseline: 1.000s)',
+    ]
+    assert compare_to_baseline(report, baseline, tolerance=0.6) == []
+
+
+def test_benchmark_start(tmpdir, capsys):
+    report_file = tmpdir / 'report.json'
+    config = get_benchmark_config({'benchmark_pairs': 2, 'benchmark_candles': 800,
+                                   'benchmark_epochs': 2,
+                                   'benchmark_exportfilename': str(report_file)})
+    report = Benchmark(config).start()
+
+    assert report['parameters']['pairs'] == 2
+    assert report['parameters']['candles'] == 800
+    assert set(report['timings']) == {'generate_data', 'backtest_setup', 'load_data', 'analyze',
+                                      'backtest', 'backtest_stats', 'hyperopt_setup',
+                                      'hyperopt_epochs'}
+    # Startup candles are removed
+    assert 0 < report['candles'] < 1600
+    assert report['trades'] > 0
+    assert report['candles_per_second'] > 0
+    assert report['epochs_per_second'] > 0
+    assert report['peak_rss_mb'] > 0
+
+    assert 'candles_per_second' in capsys.readouterr().out
+    with report_file.open() as f:
+        assert rapidjson.load(f)['trades'] == report['trades']
+
+    # Same data and trades in every run
+    config = get_benchmark_config({'benchmark_pairs': 2, 'benchmark_candles': 800,
+                                   'benchmark_epochs': 0, 'benchmark_baseline': str(report_file)})
+    benchmark = Benchmark(config)
+    benchmark.show_report = MagicMock()
+    report2 = benchmark.start()
+    assert report2['trades'] == report['trades']
+    assert report2['epochs_per_second'] is None
+    assert 'hyperopt_epochs' not in report2['timings']
+
+
+def test_benchmark_baseline(tmpdir):
+    baseline_file = tmpdir / 'baseline.json'
+    baseline_file.write_text(rapidjson.dumps({'candles_per_second': 1000, 'timings': {}}),
+                             encoding='utf-8')
+    benchmark = Benchmark(get_benchmark_config({'benchmark_baseline': str(baseline_file)}))
+
+    benchmark.show_report({'candles_per_second': 1000, 'timings': {}})
+    with pytest.raises(OperationalException, match=r"Benchmark is slower than the baseline.*"):
+        benchmark.show_report({'candles_per_second': 500, 'timings': {}})
+
+
+def test_start_benchmark(mocker, caplog):
+    start_mock = mocker.patch('freqtrade.optimize.benchmark.Benchmark.start')
+    args = [
+        'benchmark',
+        '--pairs', '3',
+        '--candles', '1000',
+        '--epochs', '0',
+        '--timeframe', '1h',
+    ]
+    pargs = get_args(args)
+    assert 'config' not in pargs
+    start_benchmark(pargs)
+    assert log_has('Starting freqtrade in Benchmark mode', caplog)
+    assert start_mock.call_count == 1
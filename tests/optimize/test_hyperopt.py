@@ -5,18 +5,21 @@ import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
-from unittest.mock import ANY, MagicMock
+from unittest.mock import ANY, MagicMock, PropertyMock
 
+import numpy as np
 import pandas as pd
 import pytest
 from arrow import Arrow
 from filelock import Timeout
+from joblib import Parallel
 
 from freqtrade.commands.optimize_commands import setup_optimize_configuration, start_hyperopt
 from freqtrade.data.history import load_data
 from freqtrade.exceptions import OperationalException
 from freqtrade.optimize.hyperopt import Hyperopt
 from freqtrade.optimize.hyperopt_auto import HyperOptAuto
+from freqtrade.optimize.hyperopt_data import dump_preprocessed, load_preprocessed
 from freqtrade.optimize.hyperopt_tools import HyperoptTools
 from freqtrade.optimize.optimize_reports import generate_strategy_stats
 from freqtrade.optimize.space import SKDecimal
@@ -387,6 +390,7 @@ def test_roi_table_generation(hyperopt) -> None:
 
 def test_start_calls_optimizer(mocker, hyperopt_conf, capsys) -> None:
     dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    dumper2 = mocker.patch('freqtrade.optimize.hyperopt.dump_preprocessed', MagicMock())
     mocker.patch('freqtrade.optimize.hyperopt.file_dump_json')
 
     mocker.patch('freqtrade.optimize.backtesting.Backtesting.load_bt_data',
@@ -426,8 +430,9 @@ def test_start_calls_optimizer(mocker, hyperopt_conf, capsys) -> None:
     out, err = capsys.readouterr()
     assert 'Best result:\n\n*    1/1: foo result Objective: 1.00000\n' in out
     assert dumper.called
-    # Should be called twice, once for historical candle data, once to save evaluations
-    assert dumper.call_count == 2
+    # Should be called once to save evaluations, candle data is stored by dump_preprocessed
+    assert dumper.call_count == 1
+    assert dumper2.call_count == 1
     assert hasattr(hyperopt.backtesting.strategy, "advise_sell")
     assert hasattr(hyperopt.backtesting.strategy, "advise_buy")
     assert hasattr(hyperopt, "max_open_trades")
@@ -620,7 +625,7 @@ def test_generate_optimizer(mocker, hyperopt_conf) -> None:
     mocker.patch('freqtrade.optimize.hyperopt.get_timerange',
                  return_value=(Arrow(2017, 12, 10), Arrow(2017, 12, 13)))
     patch_exchange(mocker)
-    mocker.patch('freqtrade.optimize.hyperopt.load', return_value={'XRP/BTC': None})
+    mocker.patch('freqtrade.optimize.hyperopt.load_preprocessed', return_value={'XRP/BTC': None})
 
     optimizer_param = {
         'adx-value': 0,
@@ -700,21 +705,87 @@ def test_generate_optimizer(mocker, hyperopt_conf) -> None:
     hyperopt.dimensions = hyperopt.dimensions
     generate_optimizer_value = hyperopt.generate_optimizer(list(optimizer_param.values()))
     assert generate_optimizer_value == response_expected
+    # Signals are cached by buy and sell parameters
+    assert hyperopt.backtesting.signal_key == tuple(optimizer_param.values())[:18]
+
+
+def test_run_optimizer_parallel(mocker, hyperopt_conf) -> None:
+    patch_exchange(mocker)
+    dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    worker_hyperopt = MagicMock()
+    worker_hyperopt.generate_optimizer = lambda params, i: {'loss': sum(params), 'iteration': i}
+    loader = mocker.patch('freqtrade.optimize.hyperopt.load', return_value=worker_hyperopt)
+
+    hyperopt = Hyperopt(hyperopt_conf)
+    hyperopt.opt = MagicMock()
+    assert hyperopt.worker_state_id is None
+    with Parallel(n_jobs=1) as parallel:
+        res = hyperopt.run_optimizer_parallel(parallel, [[1, 2], [3, 4]], 0)
+        assert res == [{'loss': 3, 'iteration': 0}, {'loss': 7, 'iteration': 0}]
+        res = hyperopt.run_optimizer_parallel(parallel, [[5, 6]], 1)
+        assert res == [{'loss': 11, 'iteration': 1}]
+
+    # State is stored and loaded only once - without optimizer
+    assert dumper.call_count == 1
+    assert dumper.call_args[0][1] == hyperopt.worker_state_file
+    assert loader.call_count == 1
+    assert hyperopt.worker_state_id is not None
+    assert hyperopt.opt is not None
+
+    # A new run stores the state again
+    hyperopt.worker_state_id = None
+    with Parallel(n_jobs=1) as parallel:
+        hyperopt.run_optimizer_parallel(parallel, [[1, 2]], 0)
+    assert dumper.call_count == 2
+    assert loader.call_count == 2
 
 
 def test_clean_hyperopt(mocker, hyperopt_conf, caplog):
     patch_exchange(mocker)
 
     mocker.patch("freqtrade.optimize.hyperopt.Path.is_file", MagicMock(return_value=True))
+    mocker.patch("freqtrade.optimize.hyperopt.Path.is_dir", MagicMock(return_value=True))
     unlinkmock = mocker.patch("freqtrade.optimize.hyperopt.Path.unlink", MagicMock())
+    rmtreemock = mocker.patch("freqtrade.optimize.hyperopt.shutil.rmtree", MagicMock())
     h = Hyperopt(hyperopt_conf)
 
-    assert unlinkmock.call_count == 2
-    assert log_has(f"Removing `{h.data_pickle_file}`.", caplog)
+    assert unlinkmock.call_count == 1
+    assert rmtreemock.call_count == 1
+    assert log_has(f"Removing `{h.data_directory}`.", caplog)
+
+
+def test_dump_load_preprocessed(testdatadir, tmpdir):
+    data = load_data(testdatadir, '5m', ['UNITTEST/BTC', 'ETH/BTC'])
+    # Trimmed dataframes keep their index
+    data['UNITTEST/BTC'] = data['UNITTEST/BTC'].iloc[30:].copy()
+    data['UNITTEST/BTC']['trend'] = data['UNITTEST/BTC']['close'] > data['UNITTEST/BTC']['open']
+    data['UNITTEST/BTC']['int_ind'] = 5
+    data['UNITTEST/BTC']['name'] = 'foo'
+
+    directory = Path(tmpdir) / 'tickerdata'
+    dump_preprocessed(data, directory)
+    assert (directory / 'metadata.pkl').is_file()
+
+    loaded = load_preprocessed(directory)
+    assert list(loaded.keys()) == ['UNITTEST/BTC', 'ETH/BTC']
+    for pair, df in data.items():
+        pd.testing.assert_frame_equal(loaded[pair], df)
+    # Numeric columns are memory-mapped
+    assert isinstance(loaded['UNITTEST/BTC']['close'].values, np.memmap)
+
+    # Modifications don't change the stored data
+    loaded['UNITTEST/BTC'].loc[:, 'close'] = 0.0
+    assert load_preprocessed(directory)['UNITTEST/BTC']['close'].iloc[-1] > 0
+
+    # Dumping again replaces the previous data
+    dump_preprocessed({'ETH/BTC': data['ETH/BTC']}, directory)
+    assert list(load_preprocessed(directory).keys()) == ['ETH/BTC']
+    assert not (directory / '1_0.npy').exists()
 
 
 def test_print_json_spaces_all(mocker, hyperopt_conf, capsys) -> None:
     dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    dumper2 = mocker.patch('freqtrade.optimize.hyperopt.dump_preprocessed', MagicMock())
     mocker.patch('freqtrade.optimize.hyperopt.file_dump_json')
 
     mocker.patch('freqtrade.optimize.backtesting.Backtesting.load_bt_data',
@@ -766,12 +837,14 @@ def test_print_json_spaces_all(mocker, hyperopt_conf, capsys) -> None:
     )
     assert result_str in out  # noqa: E501
     assert dumper.called
-    # Should be called twice, once for historical candle data, once to save evaluations
-    assert dumper.call_count == 2
+    # Should be called once to save evaluations, candle data is stored by dump_preprocessed
+    assert dumper.call_count == 1
+    assert dumper2.call_count == 1
 
 
 def test_print_json_spaces_default(mocker, hyperopt_conf, capsys) -> None:
     dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    dumper2 = mocker.patch('freqtrade.optimize.hyperopt.dump_preprocessed', MagicMock())
     mocker.patch('freqtrade.optimize.hyperopt.file_dump_json')
     mocker.patch('freqtrade.optimize.backtesting.Backtesting.load_bt_data',
                  MagicMock(return_value=(MagicMock(), None)))
@@ -814,12 +887,14 @@ def test_print_json_spaces_default(mocker, hyperopt_conf, capsys) -> None:
     out, err = capsys.readouterr()
     assert '{"params":{"mfi-value":null,"sell-mfi-value":null},"minimal_roi":{},"stoploss":null}' in out  # noqa: E501
     assert dumper.called
-    # Should be called twice, once for historical candle data, once to save evaluations
-    assert dumper.call_count == 2
+    # Should be called once to save evaluations, candle data is stored by dump_preprocessed
+    assert dumper.call_count == 1
+    assert dumper2.call_count == 1
 
 
 def test_print_json_spaces_roi_stoploss(mocker, hyperopt_conf, capsys) -> None:
     dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    dumper2 = mocker.patch('freqtrade.optimize.hyperopt.dump_preprocessed', MagicMock())
     mocker.patch('freqtrade.optimize.hyperopt.file_dump_json')
     mocker.patch('freqtrade.optimize.backtesting.Backtesting.load_bt_data',
                  MagicMock(return_value=(MagicMock(), None)))
@@ -861,12 +936,14 @@ def test_print_json_spaces_roi_stoploss(mocker, hyperopt_conf, capsys) -> None:
     out, err = capsys.readouterr()
     assert '{"minimal_roi":{},"stoploss":null}' in out
     assert dumper.called
-    # Should be called twice, once for historical candle data, once to save evaluations
-    assert dumper.call_count == 2
+    # Should be called once to save evaluations, candle data is stored by dump_preprocessed
+    assert dumper.call_count == 1
+    assert dumper2.call_count == 1
 
 
 def test_simplified_interface_roi_stoploss(mocker, hyperopt_conf, capsys) -> None:
     dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    dumper2 = mocker.patch('freqtrade.optimize.hyperopt.dump_preprocessed', MagicMock())
     mocker.patch('freqtrade.optimize.hyperopt.file_dump_json')
     mocker.patch('freqtrade.optimize.backtesting.Backtesting.load_bt_data',
                  MagicMock(return_value=(MagicMock(), None)))
@@ -909,8 +986,9 @@ def test_simplified_interface_roi_stoploss(mocker, hyperopt_conf, capsys) -> Non
     out, err = capsys.readouterr()
     assert 'Best result:\n\n*    1/1: foo result Objective: 1.00000\n' in out
     assert dumper.called
-    # Should be called twice, once for historical candle data, once to save evaluations
-    assert dumper.call_count == 2
+    # Should be called once to save evaluations, candle data is stored by dump_preprocessed
+    assert dumper.call_count == 1
+    assert dumper2.call_count == 1
     assert hasattr(hyperopt.backtesting.strategy, "advise_sell")
     assert hasattr(hyperopt.backtesting.strategy, "advise_buy")
     assert hasattr(hyperopt, "max_open_trades")
@@ -947,6 +1025,7 @@ def test_simplified_interface_all_failed(mocker, hyperopt_conf) -> None:
 
 def test_simplified_interface_buy(mocker, hyperopt_conf, capsys) -> None:
     dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    dumper2 = mocker.patch('freqtrade.optimize.hyperopt.dump_preprocessed', MagicMock())
     mocker.patch('freqtrade.optimize.hyperopt.file_dump_json')
     mocker.patch('freqtrade.optimize.backtesting.Backtesting.load_bt_data',
                  MagicMock(return_value=(MagicMock(), None)))
@@ -989,8 +1068,9 @@ def test_simplified_interface_buy(mocker, hyperopt_conf, capsys) -> None:
     out, err = capsys.readouterr()
     assert 'Best result:\n\n*    1/1: foo result Objective: 1.00000\n' in out
     assert dumper.called
-    # Should be called twice, once for historical candle data, once to save evaluations
-    assert dumper.call_count == 2
+    # Should be called once to save evaluations, candle data is stored by dump_preprocessed
+    assert dumper.call_count == 1
+    assert dumper2.call_count == 1
     assert hasattr(hyperopt.backtesting.strategy, "advise_sell")
     assert hasattr(hyperopt.backtesting.strategy, "advise_buy")
     assert hasattr(hyperopt, "max_open_trades")
@@ -1000,6 +1080,7 @@ def test_simplified_interface_buy(mocker, hyperopt_conf, capsys) -> None:
 
 def test_simplified_interface_sell(mocker, hyperopt_conf, capsys) -> None:
     dumper = mocker.patch('freqtrade.optimize.hyperopt.dump', MagicMock())
+    dumper2 = mocker.patch('freqtrade.optimize.hyperopt.dump_preprocessed', MagicMock())
     mocker.patch('freqtrade.optimize.hyperopt.file_dump_json')
     mocker.patch('freqtrade.optimize.backtesting.Backtesting.load_bt_data',
                  MagicMock(return_value=(MagicMock(), None)))
@@ -1042,8 +1123,9 @@ def test_simplified_interface_sell(mocker, hyperopt_conf, capsys) -> None:
     out, err = capsys.readouterr()
     assert 'Best result:\n\n*    1/1: foo result Objective: 1.00000\n' in out
     assert dumper.called
-    # Should be called twice, once for historical candle data, once to save evaluations
-    assert dumper.call_count == 2
+    # Should be called once to save evaluations, candle data is stored by dump_preprocessed
+    assert dumper.call_count == 1
+    assert dumper2.call_count == 1
     assert hasattr(hyperopt.backtesting.strategy, "advise_sell")
     assert hasattr(hyperopt.backtesting.strategy, "advise_buy")
     assert hasattr(hyperopt, "max_open_trades")
@@ -1141,6 +1223,38 @@ def test_in_strategy_auto_hyperopt(mocker, hyperopt_conf, tmpdir, fee) -> None:
     hyperopt.start()
 
 
+def test_start_profile(mocker, hyperopt_conf, tmpdir, fee, capsys) -> None:
+    patch_exchange(mocker)
+    mocker.patch('freqtrade.exchange.Exchange.get_fee', fee)
+    mocker.patch('freqtrade.plugins.pairlistmanager.PairListManager.whitelist',
+                 PropertyMock(return_value=['ETH/BTC', 'LTC/BTC']))
+    # Evaluate epochs in this process
+    mocker.patch('freqtrade.optimize.hyperopt.Hyperopt.run_optimizer_parallel',
+                 lambda self, parallel, asked, i: [self.generate_optimizer(v, i) for v in asked])
+    mocker.patch('freqtrade.optimize.hyperopt.progressbar.ProgressBar')
+    (Path(tmpdir) / 'hyperopt_results').mkdir(parents=True)
+    hyperopt_conf.update({
+        'user_data_dir': Path(tmpdir),
+        'timerange': '20180110-20180112',
+        'epochs': 2,
+        'hyperopt_random_state': 1,
+        'profile': 'timers',
+    })
+    hyperopt = Hyperopt(hyperopt_conf)
+    hyperopt.start()
+
+    assert len(hyperopt.epochs) == 2
+    profile = hyperopt.epochs[0]['profile']
+    assert {'load_preprocessed', 'backtest', 'advise_buy', 'advise_sell', 'backtest_loop',
+            'generate_stats'} <= set(profile['phases'])
+    assert profile['phases']['backtest']['calls'] == 1
+    assert set(profile['pairs']) == {'ETH/BTC', 'LTC/BTC'}
+
+    captured = capsys.readouterr()
+    assert 'STARTUP TIMINGS' in captured.out
+    assert 'TIMINGS OF 2 EPOCHS' in captured.out
+
+
 def test_SKDecimal():
     space = SKDecimal(1, 2, decimals=2)
     assert 1.5 in space
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+from freqtrade.optimize.profiling import (Profiler, cprofile, merge_profiles, show_profile,
+                                          text_table_profile, text_table_profile_pairs)
+from tests.conftest import log_has_re
+
+
+def test_profiler():
+    profiler = Profiler(enabled=True)
+    with profiler.phase('load_data'):
+        pass
+    for _ in range(2):
+        with profiler.phase('advise_buy', 'ETH/BTC'):
+            pass
+    with profiler.phase('advise_buy', 'LTC/BTC'):
+        pass
+
+    profile = profiler.to_dict()
+    assert set(profile['phases']) == {'load_data', 'advise_buy'}
+    assert profile['phases']['load_data']['calls'] == 1
+    assert profile['phases']['advise_buy']['calls'] == 3
+    assert profile['phases']['advise_buy']['seconds'] >= 0
+    assert set(profile['pairs']) == {'ETH/BTC', 'LTC/BTC'}
+    assert list(profile['pairs']['ETH/BTC']) == ['advise_buy']
+
+    # Snapshot is not modified by further timings
+    profiler.add('load_data', 1.5)
+    assert profile['phases']['load_data']['calls'] == 1
+
+    profiler.reset()
+    assert profiler.to_dict() == {'phases': {}, 'pairs': {}}
+
+
+def test_profiler_disabled():
+    profiler = Profiler()
+    with profiler.phase('load_data', 'ETH/BTC'):
+        pass
+    assert profiler.to_dict() == {'phases': {}, 'pairs': {}}
+
+
+def test_merge_profiles():
+    profile1 = {'phases': {'backtest': {'calls': 1, 'seconds': 1.0}},
+                'pairs': {'ETH/BTC': {'advise_buy': 0.25}}}
+    profile2 = {'phases': {'backtest': {'calls': 2, 'seconds': 0.5},
+                           'loss': {'calls': 1, 'seconds': 0.1}},
+                'pairs': {'ETH/BTC': {'advise_buy': 0.5}, 'LTC/BTC': {'advise_sell': 0.1}}}
+    merged = merge_profiles([profile1, profile2, {}])
+    assert merged == {
+        'phases': {'backtest': {'calls': 3, 'seconds': 1.5},
+                   'loss': {'calls': 1, 'seconds': 0.1}},
+        'pairs': {'ETH/BTC': {'advise_buy': 0.75}, 'LTC/BTC': {'advise_sell': 0.1}},
+    }
+    # Inputs are not modified
+    assert profile1['phases']['backtest'] == {'calls': 1, 'seconds': 1.0}
+
+
+def test_text_table_profile(capsys):
+    profile = {'phases': {'backtest': {'calls': 4, 'seconds': 2.0}},
+               'pairs': {'ETH/BTC': {'advise_buy': 0.25, 'advise_sell': 0.5},
+                         'LTC/BTC': {'advise_buy': 1.0}}}
+    assert text_table_profile(profile) == (
+        '|    Phase |   Calls |   Total (s) |   Avg (ms) |\n'
+        '|----------+---------+-------------+------------|\n'
+        '| backtest |       4 |       2.000 |     500.00 |'
+    )
+    assert text_table_profile_pairs(profile) == (
+        '|    Pair |   advise_buy (s) |   advise_sell (s) |   Total (s) |\n'
+        '|---------+------------------+-------------------+-------------|\n'
+        '| LTC/BTC |            1.000 |             0.000 |       1.000 |\n'
+        '| ETH/BTC |            0.250 |             0.500 |       0.750 |'
+    )
+
+    show_profile(profile, 'TIMINGS')
+    captured = capsys.readouterr()
+    assert ' TIMINGS ' in captured.out
+    assert 'TIMINGS PER PAIR' in captured.out
+
+    show_profile({'phases': profile['phases'], 'pairs': {}}, 'TIMINGS')
+    assert 'TIMINGS PER PAIR' not in capsys.readouterr().out
+
+
+def test_cprofile(tmpdir, caplog, capsys):
+    config = {'user_data_dir': Path(tmpdir)}
+    with cprofile(config, 'backtest_results', 'backtest'):
+        sum(range(10))
+    assert not (Path(tmpdir) / 'backtest_results').exists()
+
+    config['profile'] = 'cprofile'
+    with cprofile(config, 'backtest_results', 'backtest'):
+        sum(range(10))
+    files = list((Path(tmpdir) / 'backtest_results').glob('backtest_profile_*.prof'))
+    assert len(files) == 1
+    assert log_has_re(r'cProfile statistics stored to .*\.prof', caplog)
+    assert 'function calls' in capsys.readouterr().out
@@ -116,3 +116,43 @@ def test_PairLocks_getlongestlock(use_db):
 
     PairLocks.reset_locks()
     PairLocks.use_db = True
+
+
+@pytest.mark.usefixtures("init_persistence")
+def test_PairLocks_index():
+    PairLocks.timeframe = '5m'
+    PairLocks.use_db = False
+    start = datetime(2021, 5, 1, tzinfo=timezone.utc)
+    pairs = ['ETH/BTC', 'XRP/BTC', '*']
+
+    for i in range(60):
+        now = start + timedelta(minutes=i * 5)
+        pair = pairs[i % 3]
+        # Lock durations shorter and longer than the time between locks
+        PairLocks.lock_pair(pair, now + timedelta(minutes=(i % 4) * 20), now=now)
+
+        for query in [now, now + timedelta(minutes=12), now + timedelta(minutes=60)]:
+            for p in pairs:
+                expected = [lock for lock in PairLocks.locks
+                            if lock.pair == p and lock.lock_end_time >= query]
+                assert PairLocks.get_pair_locks(p, query) == sorted(
+                    expected, key=lambda lock: lock.lock_end_time)
+            assert PairLocks.is_global_lock(query) == any(
+                lock.pair == '*' and lock.lock_end_time >= query for lock in PairLocks.locks)
+            assert len(PairLocks.get_pair_locks(None, query)) == len(
+                [lock for lock in PairLocks.locks if lock.lock_end_time >= query])
+
+    # All locks are kept for the backtest results, expired locks are removed from the index
+    assert len(PairLocks.get_all_locks()) == 60
+    assert sum(len(index.locks) for index in PairLocks.locks_by_pair.values()) < 20
+    assert all(lock.lock_end_time >= start + timedelta(minutes=55 * 5)
+               for index in PairLocks.locks_by_pair.values() for lock in index.locks)
+
+    PairLocks.unlock_pair('ETH/BTC', now)
+    assert not PairLocks.get_pair_locks('ETH/BTC', now)
+    assert PairLocks.locks_by_pair['ETH/BTC'].locks == []
+
+    PairLocks.reset_locks()
+    assert PairLocks.locks_by_pair == {}
+    assert not PairLocks.is_pair_locked('XRP/BTC', now)
+    PairLocks.use_db = True
@@ -1,10 +1,10 @@
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
 from freqtrade import constants
-from freqtrade.persistence import PairLocks, Trade
+from freqtrade.persistence import LocalTrade, PairLocks, Trade
 from freqtrade.plugins.protectionmanager import ProtectionManager
 from freqtrade.strategy.interface import SellType
 from tests.conftest import get_patched_freqtradebot, log_has_re
@@ -130,6 +130,54 @@ def test_stoploss_guard(mocker, default_conf, fee, caplog):
     assert not PairLocks.is_global_lock(end_time)
 
 
+def test_get_trade_window_backtest(default_conf, fee):
+    Trade.use_db = False
+    LocalTrade.reset_trades()
+    default_conf['protections'] = [{"method": "StoplossGuard", "lookback_period": 60}]
+    protection = ProtectionManager(default_conf)._protection_handlers[0]
+    start = datetime(2021, 5, 1, tzinfo=timezone.utc)
+
+    def close_trade(pair, minutes, profit, sell_reason):
+        trade = LocalTrade(
+            pair=pair, stake_amount=0.01, amount=1, open_rate=1, fee_open=fee.return_value,
+            fee_close=fee.return_value, exchange='binance', is_open=False,
+            open_date=start + timedelta(minutes=minutes - 30),
+            close_date=start + timedelta(minutes=minutes), close_profit=profit,
+            sell_reason=sell_reason)
+        LocalTrade.add_bt_trade(trade)
+
+    def check_window(minutes, pair):
+        date_now = start + timedelta(minutes=minutes)
+        window = protection.get_trade_window(date_now, 60, pair)
+        expected = Trade.get_trades_proxy(pair=pair, is_open=False,
+                                          close_date=date_now - timedelta(minutes=60))
+        stoplosses = [t for t in expected if t.sell_reason == SellType.STOP_LOSS.value
+                      and t.close_profit < 0]
+        assert list(window.trades) == expected
+        assert window.profit == sum(t.close_profit for t in expected if t.close_profit)
+        assert window.stoplosses == len(stoplosses)
+        assert window.last_stoploss is (stoplosses[-1] if stoplosses else None)
+        return window
+
+    for i in range(100):
+        close_trade(['ETH/BTC', 'XRP/BTC'][i % 2], i * 5, (i % 7 - 3) / 100,
+                    SellType.STOP_LOSS.value if i % 3 else SellType.ROI.value)
+        for pair in ['ETH/BTC', 'XRP/BTC', 'LTC/BTC', None]:
+            window = check_window(i * 5, pair)
+    # Windows are kept between calls
+    assert protection.get_trade_window(start + timedelta(minutes=495), 60) is window
+
+    # Trade closed before the latest trade and time moving backwards rebuild the window
+    close_trade('ETH/BTC', 480, -0.05, SellType.STOP_LOSS.value)
+    assert check_window(495, None) is not window
+    check_window(300, 'ETH/BTC')
+    check_window(305, 'ETH/BTC')
+
+    LocalTrade.reset_trades()
+    assert not check_window(305, 'ETH/BTC').trades
+    Trade.use_db = True
+
+
 @pytest.mark.parametrize('only_per_pair', [False, True])
 @pytest.mark.usefixtures("init_persistence")
 def test_stoploss_guard_perpair(mocker, default_conf, fee, caplog, only_per_pair):
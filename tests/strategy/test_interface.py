@@ -1,5 +1,6 @@
 # pragma pylint: disable=missing-docstring, C0103
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock
 
@@ -13,8 +14,9 @@ from freqtrade.data.history import load_data
 from freqtrade.exceptions import OperationalException, StrategyError
 from freqtrade.persistence import PairLocks, Trade
 from freqtrade.resolvers import StrategyResolver
+from freqtrade.state import RunMode
 from freqtrade.strategy.hyper import (BaseParameter, CategoricalParameter, DecimalParameter,
-                                      IntParameter, RealParameter)
+                                      IntParameter, RealParameter, parameter_indicator)
 from freqtrade.strategy.interface import SellCheckTuple, SellType
 from freqtrade.strategy.strategy_wrapper import strategy_safe_wrapper
 from tests.conftest import log_has, log_has_re
@@ -59,6 +61,36 @@ def test_analyze_pair_empty(default_conf, mocker, caplog, ohlcv_history):
     assert log_has('Empty dataframe for pair ETH/BTC', caplog)
 
 
+@pytest.mark.parametrize('workers', [1, 3])
+def test_analyze_workers(default_conf, mocker, caplog, ohlcv_history, workers):
+    default_conf['internals'] = {'analysis_workers': workers}
+    strategy = DefaultStrategy(default_conf)
+    strategy.dp = DataProvider(default_conf, None, None)
+    # Like the exchange, return a copy for every call
+    mocker.patch.object(strategy.dp, 'ohlcv', side_effect=lambda *args: ohlcv_history.copy())
+    threads = set()
+    analyze_internal = strategy._analyze_ticker_internal
+
+    def analyze(dataframe, metadata):
+        threads.add(threading.current_thread().name)
+        if metadata['pair'] == 'XRP/BTC':
+            raise ValueError('Something went wrong')
+        return analyze_internal(dataframe, metadata)
+
+    mocker.patch.object(strategy, '_analyze_ticker_internal', side_effect=analyze)
+    pairs = ['ETH/BTC', 'XRP/BTC', 'LTC/BTC', 'NEO/BTC']
+    strategy.analyze(pairs)
+
+    # Failing pair doesn't affect the other pairs
+    assert log_has_re(r'Unable to analyze candle \(OHLCV\) data for pair XRP/BTC.*', caplog)
+    for pair in pairs:
+        df, _ = strategy.dp.get_analyzed_dataframe(pair, strategy.timeframe)
+        assert df.empty == (pair == 'XRP/BTC')
+        if pair != 'XRP/BTC':
+            assert 'buy' in df.columns
+    assert all(name.startswith('analyze') for name in threads) == (workers > 1)
+
+
 def test_get_signal_empty(default_conf, mocker, caplog):
     assert (False, False) == _STRATEGY.get_signal('foo', default_conf['timeframe'], DataFrame())
     assert log_has('Empty candle (OHLCV) data for pair foo', caplog)
@@ -233,6 +265,37 @@ def test_min_roi_reached(default_conf, fee) -> None:
         assert strategy.min_roi_reached(trade, 0.02, arrow.utcnow().shift(minutes=-1).datetime)
 
 
+def test_min_roi_reached_entry(default_conf) -> None:
+    default_conf.update({'strategy': 'DefaultStrategy'})
+    strategy = StrategyResolver.load_strategy(default_conf)
+    strategy.minimal_roi = {20: 0.05, 55: 0.01, 0: 0.1}
+    assert strategy.get_roi_table() == ([0, 20, 55], [0.1, 0.05, 0.01])
+    # Compiled once
+    assert strategy.get_roi_table() is strategy.get_roi_table()
+
+    assert strategy.min_roi_reached_entry(-1) == (None, None)
+    assert strategy.min_roi_reached_entry(0) == (0, 0.1)
+    assert strategy.min_roi_reached_entry(19) == (0, 0.1)
+    assert strategy.min_roi_reached_entry(20) == (20, 0.05)
+    assert strategy.min_roi_reached_entry(1000) == (55, 0.01)
+
+    # Assigning a new table (as hyperopt does) recompiles it
+    strategy.minimal_roi = {10: 0.02}
+    assert strategy.get_roi_table() == ([10], [0.02])
+    assert strategy.min_roi_reached_entry(5) == (None, None)
+    assert strategy.min_roi_reached_entry(10) == (10, 0.02)
+
+    # Modifying the table in place recompiles it as well
+    strategy.minimal_roi[0] = 0.03
+    assert strategy.get_roi_table() == ([0, 10], [0.03, 0.02])
+    assert strategy.min_roi_reached_entry(5) == (0, 0.03)
+    strategy.minimal_roi[10] = 0.01
+    assert strategy.min_roi_reached_entry(10) == (10, 0.01)
+
+    strategy.minimal_roi = {}
+    assert strategy.min_roi_reached_entry(10) == (None, None)
+
+
 def test_min_roi_reached2(default_conf, fee) -> None:
 
     # test with ROI raising after last interval
@@ -653,6 +716,9 @@ def test_hyperopt_parameters():
                                   default='buy_macd', space='buy')
     assert isinstance(catpar.get_space(''), Categorical)
     assert catpar.value == 'buy_macd'
+    assert catpar.range == ['buy_macd']
+    catpar.in_space = True
+    assert catpar.range == ['buy_rsi', 'buy_macd', 'buy_none']
 
 
 def test_auto_hyperopt_interface(default_conf):
@@ -672,3 +738,53 @@ def test_auto_hyperopt_interface(default_conf):
 
     with pytest.raises(OperationalException, match=r"Inconclusive parameter.*"):
         [x for x in strategy._detect_parameters('sell')]
+
+
+class ParameterIndicatorStrategy(DefaultStrategy):
+    buy_period = IntParameter(2, 5, default=3, space='buy')
+    sell_source = CategoricalParameter(['open', 'close'], default='close', space='sell')
+
+    @parameter_indicator('buy_period')
+    def sma(self, dataframe: DataFrame, value: int):
+        return dataframe['close'].rolling(value).mean()
+
+    @parameter_indicator('sell_source')
+    def source(self, dataframe: DataFrame, value: str):
+        return dataframe[value]
+
+
+@pytest.mark.parametrize('runmode,columns', [
+    (RunMode.BACKTEST, ['sma_3', 'source_close']),
+    (RunMode.HYPEROPT, ['sma_2', 'sma_3', 'sma_4', 'sma_5', 'source_open', 'source_close']),
+])
+def test_parameter_indicators(default_conf, ohlcv_history, runmode, columns):
+    default_conf.update({'runmode': runmode, 'spaces': ['buy', 'sell']})
+    strategy = ParameterIndicatorStrategy(default_conf)
+    assert list(strategy.ft_parameter_indicators) == ['sma', 'source']
+
+    dataframe = strategy.populate_parameter_indicators(ohlcv_history.copy())
+    assert list(dataframe.columns) == list(ohlcv_history.columns) + columns
+
+    dataframe = strategy.resolve_parameter_indicators(dataframe)
+    assert dataframe['sma'].equals(ohlcv_history['close'].rolling(3).mean())
+    assert dataframe['source'].equals(ohlcv_history['close'])
+
+    if runmode == RunMode.HYPEROPT:
+        strategy.buy_period.value = 5
+        strategy.sell_source.value = 'open'
+        dataframe = strategy.resolve_parameter_indicators(dataframe)
+        assert dataframe['sma'].equals(ohlcv_history['close'].rolling(5).mean())
+        assert dataframe['source'].equals(ohlcv_history['open'])
+
+
+def test_parameter_indicators_invalid(default_conf):
+    class InvalidStrategy(DefaultStrategy):
+        buy_value = RealParameter(0, 1, default=0.5, space='buy')
+
+        @parameter_indicator('buy_value')
+        def indicator(self, dataframe: DataFrame, value: float):
+            return dataframe['close'] * value
+
+    with pytest.raises(OperationalException,
+                       match=r'Indicator indicator must depend on an IntParameter.*'):
+        InvalidStrategy(default_conf)
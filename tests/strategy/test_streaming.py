@@ -0,0 +1,149 @@
+from copy import deepcopy
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+from freqtrade.data.history import load_pair_history
+from freqtrade.state import RunMode
+from freqtrade.strategy import StreamingEMA, StreamingMax, StreamingMin, StreamingRSI, StreamingSMA
+from freqtrade.strategy.streaming import populate_streaming_indicators
+from tests.strategy.strats.default_strategy import DefaultStrategy
+
+
+@pytest.fixture
+def ohlcv(testdatadir):
+    return load_pair_history(pair='UNITTEST/BTC', timeframe='5m', datadir=testdatadir)
+
+
+@pytest.mark.parametrize('indicator,expected', [
+    (StreamingEMA(10), lambda s: s.ewm(span=10, adjust=False).mean()),
+    (StreamingSMA(10), lambda s: s.rolling(10).mean()),
+    (StreamingMax(10), lambda s: s.rolling(10).max()),
+    (StreamingMin(1), lambda s: s),
+    (StreamingRSI(14), None),
+])
+def test_streaming_indicator(ohlcv, indicator, expected):
+    close = ohlcv['close'].to_numpy()
+    template = deepcopy(indicator)
+    result = deepcopy(indicator).update(close)
+    assert len(result) == len(close)
+    if expected:
+        assert np.allclose(result, expected(ohlcv['close']), equal_nan=True)
+
+    # Any split into chunks gives exactly the same result
+    chunks = [indicator.update(close[start:stop])
+              for start, stop in [(0, 5), (5, 5), (5, 6), (6, 300), (300, len(close))]]
+    assert np.array_equal(np.concatenate(chunks), result, equal_nan=True)
+    assert np.array_equal(indicator.values, result, equal_nan=True)
+
+    # Trimmed values match a calculation over the remaining candles
+    for count in [0, 3, 100]:
+        trimmed = deepcopy(indicator)
+        trimmed.trim(count, close[count:])
+        fresh = deepcopy(template)
+        assert np.allclose(trimmed.values, fresh.update(close[count:]), equal_nan=True,
+                           rtol=1e-10)
+        # ... and continue like it
+        assert np.allclose(trimmed.update(close[:50]), fresh.update(close[:50]),
+                           equal_nan=True, rtol=1e-10)
+
+
+def test_streaming_rsi(ohlcv):
+    close = ohlcv['close']
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    expected = 100 - 100 / (1 + gain / loss)
+
+    result = StreamingRSI(14).update(close.to_numpy())
+    assert np.isnan(result[:14]).all()
+    assert np.allclose(result[14:], expected[14:])
+    assert ((result[14:] >= 0) & (result[14:] <= 100)).all()
+
+
+def test_populate_streaming_indicators(ohlcv, mocker):
+    indicators = {
+        'ema': StreamingEMA(20),
+        'ema_high': StreamingEMA(5, column='high'),
+        'rsi_ema': StreamingRSI(7, column='ema'),
+    }
+    dataframe, _ = populate_streaming_indicators(indicators, ohlcv.copy())
+    assert list(dataframe.columns) == list(ohlcv.columns) + ['ema', 'ema_high', 'rsi_ema']
+    # Templates are not updated
+    assert np.isnan(indicators['ema']._last)
+
+    # Window moving forward - only new candles are calculated, values match a full recalculation
+    # of the current window
+    update_mock = mocker.spy(StreamingEMA, 'update')
+    dataframe, state = populate_streaming_indicators(indicators, ohlcv.iloc[:200].copy())
+    previous = 200
+    for start, stop in [(0, 200), (10, 201), (15, 220), (30, 300), (150, len(ohlcv))]:
+        update_mock.reset_mock()
+        dataframe, state2 = populate_streaming_indicators(
+            indicators, ohlcv.iloc[start:stop].copy(), state)
+        assert state2 is state
+        assert len(update_mock.call_args_list[0][0][1]) == stop - previous
+        previous = stop
+        expected, _ = populate_streaming_indicators(indicators, ohlcv.iloc[start:stop].copy())
+        assert_frame_equal(dataframe, expected, check_exact=False, rtol=1e-10)
+
+    # Data which doesn't continue the state is calculated from scratch
+    dataframe, state2 = populate_streaming_indicators(indicators, ohlcv.iloc[50:].copy(), state)
+    assert state2 is not state
+    expected2, _ = populate_streaming_indicators(indicators, ohlcv.iloc[50:].copy())
+    assert dataframe.equals(expected2)
+    _, state2 = populate_streaming_indicators(indicators, ohlcv.iloc[:10].copy(), state)
+    assert state2 is not state
+
+
+def test_populate_streaming_indicators_changed_candle(ohlcv):
+    indicators = {
+        'ema': StreamingEMA(20),
+        'sma_high': StreamingSMA(5, column='high'),
+        'rsi_ema': StreamingRSI(7, column='ema'),
+    }
+    _, state = populate_streaming_indicators(indicators, ohlcv.iloc[:200].copy())
+    state_ema = state.indicators['ema']
+    state_sma = state.indicators['sma_high']
+
+    # Last known candle updated (e.g. incomplete candle) - affected indicators are recalculated
+    changed = ohlcv.iloc[5:201].copy()
+    changed.loc[changed.index[-2], 'close'] *= 1.01
+    dataframe, state2 = populate_streaming_indicators(indicators, changed.copy(), state)
+    assert state2 is state
+    assert state.indicators['ema'] is not state_ema
+    assert state.indicators['sma_high'] is state_sma
+    expected, _ = populate_streaming_indicators(indicators, changed.copy())
+    assert_frame_equal(dataframe, expected, check_exact=False, rtol=1e-10)
+
+
+class StreamingStrategy(DefaultStrategy):
+    streaming_indicators = {
+        'ema5': StreamingEMA(5),
+        'sma5': StreamingSMA(5),
+    }
+
+
+@pytest.mark.parametrize('runmode,keep_state', [
+    (RunMode.DRY_RUN, True),
+    (RunMode.LIVE, True),
+    (RunMode.BACKTEST, False),
+])
+def test_advise_streaming_indicators(default_conf, ohlcv, mocker, runmode, keep_state):
+    default_conf['runmode'] = runmode
+    strategy = StreamingStrategy(default_conf)
+    update_mock = mocker.spy(strategy.streaming_indicators['ema5'].__class__, 'update')
+
+    dataframe = strategy.advise_indicators(ohlcv.iloc[:100].copy(), {'pair': 'UNITTEST/BTC'})
+    assert 'ema5' in dataframe.columns
+    assert 'sma5' in dataframe.columns
+    assert 'ema10' in dataframe.columns
+    assert ('UNITTEST/BTC' in strategy._streaming_state) == keep_state
+    assert len(update_mock.call_args[0][1]) == 100
+
+    dataframe = strategy.advise_indicators(ohlcv.iloc[1:101].copy(), {'pair': 'UNITTEST/BTC'})
+    assert len(update_mock.call_args[0][1]) == (1 if keep_state else 100)
+    # Streamed values match a calculation over the current dataframe
+    expected = ohlcv.iloc[1:101]['close'].ewm(span=5, adjust=False).mean()
+    assert np.allclose(dataframe['ema5'], expected, rtol=1e-10)
@@ -1088,6 +1088,62 @@ def test_get_trades_proxy(fee, use_db):
     Trade.use_db = True
 
 
+def test_get_trades_proxy_backtest_index(fee):
+    Trade.use_db = False
+    Trade.reset_trades()
+    start = datetime(2021, 5, 1, tzinfo=timezone.utc)
+    trades = []
+    for i in range(40):
+        # Mostly chronological, some trades closed out of order
+        minutes = i * 10 if i % 7 else i * 10 - 35
+        trade = LocalTrade(
+            pair=['ETH/BTC', 'XRP/BTC', 'LTC/BTC'][i % 3], stake_amount=0.001, amount=1,
+            open_rate=0.1, fee_open=fee.return_value, fee_close=fee.return_value,
+            exchange='binance', is_open=True, open_date=start + timedelta(minutes=minutes - 30),
+        )
+        LocalTrade.add_bt_trade(trade)
+        trade.is_open = False
+        trade.close_date = start + timedelta(minutes=minutes)
+        trade.close_profit_abs = 0.0001
+        LocalTrade.close_bt_trade(trade)
+        trades.append(trade)
+    assert LocalTrade.trades_open == []
+    assert LocalTrade.trades == trades
+
+    for pair in [None, 'ETH/BTC', 'XRP/BTC', 'NEO/BTC']:
+        for minutes in [-60, 0, 5, 95, 100, 250, 400]:
+            close_date = start + timedelta(minutes=minutes)
+            expected = [t for t in trades if (not pair or t.pair == pair)
+                        and t.close_date > close_date]
+            res = Trade.get_trades_proxy(pair=pair, is_open=False, close_date=close_date)
+            assert sorted(res, key=id) == sorted(expected, key=id)
+            assert res == sorted(res, key=lambda t: t.close_date)
+
+            open_date = close_date - timedelta(minutes=100)
+            expected = [t for t in expected if t.open_date > open_date]
+            res = Trade.get_trades_proxy(pair=pair, is_open=False, close_date=close_date,
+                                         open_date=open_date)
+            assert sorted(res, key=id) == sorted(expected, key=id)
+
+        expected = [t for t in trades if not pair or t.pair == pair]
+        assert Trade.get_trades_proxy(pair=pair, is_open=False) == expected
+
+    # Modifying the result doesn't affect the index
+    close_date = start + timedelta(minutes=100)
+    expected = Trade.get_trades_proxy(is_open=False, close_date=close_date)
+    for kwargs in [{}, {'close_date': close_date}, {'pair': 'ETH/BTC'}]:
+        res = Trade.get_trades_proxy(is_open=False, **kwargs)
+        res.sort(key=lambda t: t.open_rate - t.close_date.timestamp())
+        res.append(res[0])
+        assert Trade.get_trades_proxy(is_open=False, close_date=close_date) == expected
+    assert LocalTrade.trades == trades
+
+    Trade.reset_trades()
+    assert Trade.get_trades_proxy(is_open=False) == []
+    assert Trade.get_trades_proxy(pair='ETH/BTC', is_open=False, close_date=start) == []
+    Trade.use_db = True
+
+
 def test_get_trades_backtest():
     Trade.use_db = False
     with pytest.raises(NotImplementedError, match=r"`Trade.get_trades\(\)` not .*"):
@@ -1251,6 +1307,7 @@ def test_Trade_object_idem():
     # Fails if only a column is added without corresponding parent field
     for item in localtrade:
         if (not item.startswith('__')
-                and item not in ('trades', 'trades_open', 'total_profit')
+                and item not in ('trades', 'trades_open', 'trades_closed', 'trades_closed_pair',
+                                 'total_profit')
                 and type(getattr(LocalTrade, item)) not in (property, FunctionType)):
             assert item in trade